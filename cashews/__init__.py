@@ -9,7 +9,7 @@ from .key import get_cache_key_template, noself
 from .key_context import context as key_context
 from .key_context import register as register_key_context
 from .validation import invalidate_further
-from .wrapper import Cache, TransactionMode, register_backend
+from .wrapper import Cache, TagsMode, TransactionMode, register_backend
 
 # pylint: disable=invalid-name
 cache = Cache(name="default")
@@ -73,6 +73,7 @@ __all__ = [
     "invalidate_further",
     "Cache",
     "TransactionMode",
+    "TagsMode",
     "register_backend",
     "key_context",
     "register_key_context",
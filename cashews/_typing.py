@@ -49,6 +49,22 @@ class Middleware(Protocol):
         ...
 
 
+class NowaitMiddleware(Protocol):
+    """
+    Sync variant of a middleware (the `nowait` attribute of a middleware) used by nowait commands
+    """
+
+    def __call__(
+        self,
+        call: Callable_T,
+        cmd: Command,
+        backend: Backend,
+        *args,
+        **kwargs,
+    ) -> Result_T | None:  # pragma: no cover
+        ...
+
+
 class OnRemoveCallback(Protocol):
     async def __call__(
         self,
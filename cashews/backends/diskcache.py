@@ -105,6 +105,29 @@ class DiskCache(Backend):
         for key, value in pairs.items():
             self._set(key, value, expire=expire)
 
+    async def set_with_tags(
+        self,
+        key: Key,
+        value: Value,
+        tags: Iterable[Key],
+        expire: float | None = None,
+        exist: bool | None = None,
+        tagged_key: Key | None = None,
+    ) -> bool:
+        # tags sets are read with one call and written with the value
+        pairs = {}
+        if exist is None:
+            pairs[key] = value
+        elif not await self.set(key, value, expire=expire, exist=exist):
+            return False
+        tags = list(tags)
+        for tag, members in zip(tags, await self.get_many(*tags)):
+            members = members or set()
+            members.add(tagged_key or key)
+            pairs[tag] = members
+        await self.set_many(pairs, expire=expire)
+        return True
+
     async def exists(self, key: Key) -> bool:
         return await self._run_in_executor(self._exists, key)
 
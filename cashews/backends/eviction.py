@@ -0,0 +1,349 @@
+"""
+Eviction policies for the in-memory backend
+
+A policy tracks keys of the store and decides which of them should be evicted:
+- lru - least recently used
+- lfu - least frequently used (ties are broken by insertion order)
+- tinylfu - W-TinyLFU: small LRU window + segmented LRU main area with frequency based admission
+  https://arxiv.org/abs/1512.00727
+- s3fifo - S3-FIFO: small and main FIFO queues with a ghost queue of recently evicted keys
+  https://blog.jasony.me/system/cache/2023/08/01/s3fifo
+"""
+
+from __future__ import annotations
+
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cashews._typing import Key
+
+__all__ = [
+    "EvictionPolicy",
+    "LRUPolicy",
+    "LFUPolicy",
+    "TinyLFUPolicy",
+    "S3FIFOPolicy",
+    "get_eviction_policy",
+]
+
+_NOTHING: tuple = ()
+
+
+class EvictionPolicy(metaclass=ABCMeta):
+    def __init__(self, size: int):
+        self.size = size
+
+    @abstractmethod
+    def access(self, key: Key) -> None:
+        """
+        Register a hit of a key that is already in the store
+        """
+        ...
+
+    @abstractmethod
+    def insert(self, key: Key) -> Iterable[Key]:
+        """
+        Register a new key and return keys that should be evicted from the store (it can be the given key itself)
+        """
+        ...
+
+    @abstractmethod
+    def remove(self, key: Key) -> None:
+        """
+        Forget a key removed from the store
+        """
+        ...
+
+    @abstractmethod
+    def evict(self) -> Key | None:
+        """
+        Forget and return the key that should be evicted first
+        """
+        ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class LRUPolicy(EvictionPolicy):
+    def __init__(self, size: int):
+        super().__init__(size)
+        self._keys: OrderedDict[Key, None] = OrderedDict()
+
+    def access(self, key: Key) -> None:
+        if key in self._keys:
+            self._keys.move_to_end(key)
+
+    def insert(self, key: Key) -> Iterable[Key]:
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        if len(self._keys) > self.size:
+            return (self._keys.popitem(last=False)[0],)
+        return _NOTHING
+
+    def remove(self, key: Key) -> None:
+        self._keys.pop(key, None)
+
+    def evict(self) -> Key | None:
+        if not self._keys:
+            return None
+        return self._keys.popitem(last=False)[0]
+
+    def clear(self) -> None:
+        self._keys = OrderedDict()
+
+
+class LFUPolicy(EvictionPolicy):
+    def __init__(self, size: int):
+        super().__init__(size)
+        self._freq: dict[Key, int] = {}
+        self._buckets: dict[int, OrderedDict[Key, None]] = {}
+        self._min_freq = 0
+
+    def access(self, key: Key) -> None:
+        freq = self._freq.get(key)
+        if freq is None:
+            return
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        self._freq[key] = freq + 1
+        self._buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def insert(self, key: Key) -> Iterable[Key]:
+        if key in self._freq:
+            self.access(key)
+            return _NOTHING
+        evicted = _NOTHING
+        if len(self._freq) >= self.size:
+            victim = self.evict()
+            evicted = (victim,) if victim is not None else _NOTHING
+        self._freq[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_freq = 1
+        return evicted
+
+    def remove(self, key: Key) -> None:
+        freq = self._freq.pop(key, None)
+        if freq is None:
+            return
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+
+    def evict(self) -> Key | None:
+        if not self._freq:
+            return None
+        if self._min_freq not in self._buckets:
+            self._min_freq = min(self._buckets)
+        bucket = self._buckets[self._min_freq]
+        key, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self._buckets[self._min_freq]
+        del self._freq[key]
+        return key
+
+    def clear(self) -> None:
+        self._freq = {}
+        self._buckets = {}
+        self._min_freq = 0
+
+
+class _CountMinSketch:
+    """
+    Approximate frequency counter with 4 bit counters, periodically halved (aging)
+    """
+
+    __slots__ = ("_rows", "_mask", "_additions", "_sample_size")
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x85EBCA77C2B2AE63)
+    _MAX = 15
+
+    def __init__(self, size: int):
+        width = 1 << max(size, 16).bit_length()
+        self._mask = width - 1
+        self._rows = [[0] * width for _ in self._SEEDS]
+        self._additions = 0
+        self._sample_size = 10 * max(size, 16)
+
+    def _indexes(self, key: Key) -> list[int]:
+        _hash = hash(key)
+        return [((_hash ^ seed) * seed >> 32) & self._mask for seed in self._SEEDS]
+
+    def frequency(self, key: Key) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def increment(self, key: Key) -> None:
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < self._MAX:
+                row[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._rows = [[counter >> 1 for counter in row] for row in self._rows]
+            self._additions //= 2
+
+
+class TinyLFUPolicy(EvictionPolicy):
+    _WINDOW = 0.01
+    _PROTECTED = 0.8
+
+    def __init__(self, size: int):
+        super().__init__(size)
+        self._window_size = max(1, int(size * self._WINDOW))
+        self._main_size = max(0, size - self._window_size)
+        self._protected_size = int(self._main_size * self._PROTECTED)
+        self._sketch = _CountMinSketch(size)
+        self._window: OrderedDict[Key, None] = OrderedDict()
+        self._probation: OrderedDict[Key, None] = OrderedDict()
+        self._protected: OrderedDict[Key, None] = OrderedDict()
+
+    def access(self, key: Key) -> None:
+        self._sketch.increment(key)
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._probation:
+            del self._probation[key]
+            self._protected[key] = None
+            if len(self._protected) > self._protected_size:
+                demoted, _ = self._protected.popitem(last=False)
+                self._probation[demoted] = None
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+
+    def insert(self, key: Key) -> Iterable[Key]:
+        self._sketch.increment(key)
+        self._window[key] = None
+        if len(self._window) <= self._window_size:
+            return _NOTHING
+        candidate, _ = self._window.popitem(last=False)
+        if len(self._probation) + len(self._protected) < self._main_size:
+            self._probation[candidate] = None
+            return _NOTHING
+        if not self._main_size:
+            return (candidate,)
+        segment = self._probation or self._protected
+        victim = next(iter(segment))
+        if self._sketch.frequency(candidate) > self._sketch.frequency(victim):
+            del segment[victim]
+            self._probation[candidate] = None
+            return (victim,)
+        return (candidate,)
+
+    def remove(self, key: Key) -> None:
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                del segment[key]
+                return
+
+    def evict(self) -> Key | None:
+        for segment in (self._probation, self._protected, self._window):
+            if segment:
+                return segment.popitem(last=False)[0]
+        return None
+
+    def clear(self) -> None:
+        self._sketch = _CountMinSketch(self.size)
+        self._window = OrderedDict()
+        self._probation = OrderedDict()
+        self._protected = OrderedDict()
+
+
+class S3FIFOPolicy(EvictionPolicy):
+    _SMALL = 0.1
+    _MAX_FREQ = 3
+
+    def __init__(self, size: int):
+        super().__init__(size)
+        self._small_size = max(1, int(size * self._SMALL))
+        self._ghost_size = max(1, size - self._small_size)
+        self._freq: dict[Key, int] = {}
+        self._small: OrderedDict[Key, None] = OrderedDict()
+        self._main: OrderedDict[Key, None] = OrderedDict()
+        self._ghost: OrderedDict[Key, None] = OrderedDict()
+
+    def access(self, key: Key) -> None:
+        freq = self._freq.get(key)
+        if freq is not None and freq < self._MAX_FREQ:
+            self._freq[key] = freq + 1
+
+    def insert(self, key: Key) -> Iterable[Key]:
+        if key in self._freq:
+            self.access(key)
+            return _NOTHING
+        evicted = []
+        while len(self._freq) >= self.size:
+            victim = self.evict()
+            if victim is None:
+                break
+            evicted.append(victim)
+        if key in self._ghost:
+            del self._ghost[key]
+            self._main[key] = None
+        else:
+            self._small[key] = None
+        self._freq[key] = 0
+        return evicted
+
+    def remove(self, key: Key) -> None:
+        if self._freq.pop(key, None) is None:
+            return
+        self._small.pop(key, None)
+        self._main.pop(key, None)
+
+    def evict(self) -> Key | None:
+        if len(self._small) >= self._small_size or not self._main:
+            return self._evict_small()
+        return self._evict_main()
+
+    def _evict_small(self) -> Key | None:
+        while self._small:
+            key, _ = self._small.popitem(last=False)
+            if self._freq[key] > 1:
+                self._freq[key] = 0
+                self._main[key] = None
+                continue
+            del self._freq[key]
+            self._ghost[key] = None
+            if len(self._ghost) > self._ghost_size:
+                self._ghost.popitem(last=False)
+            return key
+        return self._evict_main()
+
+    def _evict_main(self) -> Key | None:
+        while self._main:
+            key, _ = self._main.popitem(last=False)
+            freq = self._freq[key]
+            if freq > 0:
+                self._freq[key] = freq - 1
+                self._main[key] = None
+                continue
+            del self._freq[key]
+            return key
+        return None
+
+    def clear(self) -> None:
+        self._freq = {}
+        self._small = OrderedDict()
+        self._main = OrderedDict()
+        self._ghost = OrderedDict()
+
+
+_POLICIES: dict[str, type[EvictionPolicy]] = {
+    "lru": LRUPolicy,
+    "lfu": LFUPolicy,
+    "tinylfu": TinyLFUPolicy,
+    "s3fifo": S3FIFOPolicy,
+}
+
+
+def get_eviction_policy(policy: str | EvictionPolicy, size: int) -> EvictionPolicy:
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    if policy.lower() not in _POLICIES:
+        raise ValueError(f"Unknown eviction policy '{policy}', use one of: {', '.join(_POLICIES)}")
+    return _POLICIES[policy.lower()](size)
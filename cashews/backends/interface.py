@@ -236,6 +236,33 @@ class Backend(ControlMixin, _BackendInterface, metaclass=ABCMeta):
     def on_remove_callback(self, callback: OnRemoveCallback) -> None:
         self._on_remove_callbacks.append(callback)
 
+    async def set_with_tags(
+        self,
+        key: Key,
+        value: Value,
+        tags: Iterable[Key],
+        expire: float | None = None,
+        exist: bool | None = None,
+        tagged_key: Key | None = None,
+    ) -> bool:
+        """
+        Set a value and add the key (or `tagged_key`) to sets of tags (tags keys) if the value is set
+        """
+        if not await self.set(key, value, expire=expire, exist=exist):
+            return False
+        for tag in tags:
+            await self.set_add(tag, tagged_key or key, expire=expire)
+        return True
+
+    async def set_pop_delete(self, key: Key, count: int = 100, prefix: str = "") -> list[Key]:
+        """
+        Pop members of a set and delete keys named by them (with a prefix), return popped members
+        """
+        members = list(await self.set_pop(key, count=count))
+        if members:
+            await self.delete_many(*[prefix + member for member in members])
+        return members
+
     async def _call_on_remove_callbacks(self, *keys: Key) -> None:
         for callback in self._on_remove_callbacks:
             await callback(keys, backend=self)
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import pickle
 import re
+import sys
 import time
-from collections import OrderedDict
 from contextlib import suppress
-from copy import copy
+from copy import copy, deepcopy
 from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Mapping, overload
 
-from cashews.utils import Bitarray, get_obj_size
+from cashews.exceptions import AwaitRequiredError
+from cashews.utils import Bitarray, estimate_obj_size, get_obj_size
 
+from .eviction import EvictionPolicy, get_eviction_policy
 from .interface import NOT_EXIST, UNLIMITED, Backend
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -19,26 +23,113 @@ if TYPE_CHECKING:  # pragma: no cover
 __all__ = ["Memory"]
 
 _missed = object()
+_expired = object()
+_EXPIRE_BATCH = 1000  # max keys to expire before giving control back to the loop
+_HEAP_COMPACT_MIN = 1000
+_IMMUTABLE_TYPES = frozenset((int, float, bool, str, bytes, type(None)))
+
+
+class _Frozen(bytes):
+    """
+    Pickled value stored by the frozen-bytes isolation mode (distinguishes it from raw bytes values)
+    """
+
+    __slots__ = ()
+
+
+def _freeze(value: Value) -> Value:
+    if type(value) in _IMMUTABLE_TYPES:
+        return value
+    return _Frozen(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _unfreeze(value: Value) -> Value:
+    if type(value) is _Frozen:
+        return pickle.loads(value)
+    return value
+
+
+# isolation mode -> (function applied to a value on write, function applied to a value on read)
+# sets updated in place return a change of their size: sizes of added or removed members,
+# so a tracked size of a big set (tags) is not estimated again on every write
+
+
+def _set_add(values: set, members: Iterable[str]) -> int:
+    size = sys.getsizeof(values)
+    added = [member for member in set(members) if member not in values]
+    values.update(added)
+    return sys.getsizeof(values) - size + sum(map(estimate_obj_size, added))
+
+
+def _set_remove(values: set, members: Iterable[str]) -> int:
+    size = sys.getsizeof(values)
+    removed = [member for member in set(members) if member in values]
+    values.difference_update(removed)
+    return sys.getsizeof(values) - size - sum(map(estimate_obj_size, removed))
+
+
+def _set_pop(values: set, count: int) -> tuple[list[str], int]:
+    size = sys.getsizeof(values)
+    popped = [values.pop() for _ in range(min(count, len(values)))]
+    return popped, sys.getsizeof(values) - size - sum(map(estimate_obj_size, popped))
+
+
+_ISOLATION_MODES = {
+    "none": (None, None),
+    "shallow": (copy, None),
+    "deepcopy": (deepcopy, deepcopy),
+    "frozen-bytes": (_freeze, _unfreeze),
+}
 
 
 class Memory(Backend):
     """
-    Inmemory backend lru with ttl
+    Inmemory backend with ttl
+    Bounded by count of keys (size) and optionally by estimated size of stored values in bytes (max_bytes)
+    Keys to evict are chosen by an eviction policy: lru (default), lfu, tinylfu or s3fifo
+    Stored values are isolated from the caller according to the isolation mode:
+    none - store and return the same object,
+    shallow (default) - store a shallow copy,
+    deepcopy - store and return deep copies,
+    frozen-bytes - store a pickled value and unpickle it on every read
     """
 
     __slots__ = [
         "store",
         "_check_interval",
         "size",
+        "_policy",
+        "_on_write",
+        "_on_read",
+        "_max_bytes",
+        "_sizes",
+        "_bytes_used",
+        "_expirations",
         "__is_init",
         "__remove_expired_stop",
         "__remove_expired_task",
     ]
 
-    def __init__(self, size: int = 1000, check_interval: float = 1, **kwargs):
-        self.store: OrderedDict = OrderedDict()
+    def __init__(
+        self,
+        size: int = 1000,
+        check_interval: float = 1,
+        max_bytes: int | None = None,
+        policy: str | EvictionPolicy = "lru",
+        isolation: str = "shallow",
+        **kwargs,
+    ):
+        if isolation not in _ISOLATION_MODES:
+            raise ValueError(f"Unknown isolation mode '{isolation}', use one of: {', '.join(_ISOLATION_MODES)}")
+        self.store: dict[Key, tuple[float | None, Value]] = {}
         self._check_interval = check_interval
         self.size = size
+        self._policy = get_eviction_policy(policy, size)
+        self._on_write, self._on_read = _ISOLATION_MODES[isolation]
+        self._max_bytes = max_bytes
+        self._sizes: dict[Key, int] = {}
+        self._bytes_used = 0
+        self._expirations: list[tuple[float, Key]] = []  # heap of (expire_at, key)
         self.__is_init = False
         self.__remove_expired_stop = asyncio.Event()
         self.__remove_expired_task = None
@@ -56,13 +147,47 @@ class Memory(Backend):
 
     async def _remove_expired(self):
         while not self.__remove_expired_stop.is_set():
-            for key in dict(self.store):
-                await self.get(key)
+            await self._expire_keys()
             with suppress(asyncio.TimeoutError, TimeoutError):
                 await asyncio.wait_for(self.__remove_expired_stop.wait(), self._check_interval)
 
+    async def _expire_keys(self) -> int:
+        removed = 0
+        while True:
+            keys = self._pop_expired(_EXPIRE_BATCH)
+            if keys:
+                await self._call_on_remove_callbacks(*keys)
+            removed += len(keys)
+            if len(keys) < _EXPIRE_BATCH:
+                return removed
+            await asyncio.sleep(0)
+
+    def _pop_expired(self, limit: int) -> list[Key]:
+        """
+        Remove up to limit expired keys visiting only entries of the expiration heap that are already expired
+        Heap entries for deleted or rewritten keys are dropped lazily
+        """
+        removed: list[Key] = []
+        now = time.time()
+        heap = self._expirations
+        while heap and heap[0][0] < now and len(removed) < limit:
+            expire_at, key = heapq.heappop(heap)
+            entry = self.store.get(key)
+            if entry is None or entry[0] != expire_at:
+                continue
+            self._remove(key)
+            removed.append(key)
+        return removed
+
     async def clear(self):
-        self.store = OrderedDict()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.store = {}
+        self._policy.clear()
+        self._expirations = []
+        self._sizes = {}
+        self._bytes_used = 0
 
     async def set(
         self,
@@ -79,15 +204,41 @@ class Memory(Backend):
         return True
 
     async def set_raw(self, key: Key, value: Value, **kwargs: Any) -> None:
-        self.store[key] = (None, value)
+        self._put(key, None, value)
 
     async def get(self, key: Key, default: Value | None = None) -> Value:
         return await self._get(key, default=default)
 
+    def get_nowait(self, key: Key, default: Value | None = None) -> Value:
+        """
+        Sync version of get, raise AwaitRequiredError if the key is expired and on-remove callbacks should be called
+        """
+        entry = self.store.get(key)
+        if entry is None:
+            return default
+        expire_at, value = entry
+        if expire_at and expire_at < time.time():
+            if self._on_remove_callbacks:
+                raise AwaitRequiredError(f"expired key {key} should be removed with callbacks")
+            self._remove(key)
+            return default
+        self._policy.access(key)
+        if self._on_read is not None:
+            value = self._on_read(value)
+        if not self._serializer or not isinstance(value, bytes):
+            return value
+        return self._serializer.decode_nowait(self, key=key, value=value, default=default)
+
+    def _is_expired(self, key: Key) -> bool:
+        entry = self.store.get(key)
+        if entry is None or not entry[0]:
+            return False
+        return entry[0] < time.time()
+
     async def get_raw(self, key: Key) -> Value:
         val = self.store.get(key)
         if val:
-            return val[1]
+            return val[1] if self._on_read is None else self._on_read(val[1])
         return None
 
     async def get_many(self, *keys: Key, default: Value | None = None) -> tuple[Value | None, ...]:
@@ -125,15 +276,23 @@ class Memory(Backend):
         return await self._delete(key)
 
     async def _delete(self, key: Key) -> bool:
+        if self._remove(key):
+            await self._call_on_remove_callbacks(key)
+            return True
+        return False
+
+    def _remove(self, key: Key) -> bool:
         if key in self.store:
             del self.store[key]
-            await self._call_on_remove_callbacks(key)
+            self._policy.remove(key)
+            self._untrack_size(key)
             return True
         return False
 
     async def delete_many(self, *keys: Key):
-        for key in keys:
-            await self._delete(key)
+        deleted = [key for key in keys if self._remove(key)]
+        if deleted:
+            await self._call_on_remove_callbacks(*deleted)
 
     async def delete_match(self, pattern: Key):
         async for key in self.scan(pattern):
@@ -183,14 +342,70 @@ class Memory(Backend):
         self._set(key, array)
         return tuple(result)
 
-    def _set(self, key: Key, value: Value, expire: float | None = None):
-        expire = time.time() + expire if expire else None
-        if expire is None and key in self.store:
-            expire, _ = self.store[key]
-        self.store[key] = (expire, copy(value))
-        self.store.move_to_end(key)
-        if len(self.store) > self.size:
-            self.store.popitem(last=False)
+    def _set(
+        self,
+        key: Key,
+        value: Value,
+        expire: float | None = None,
+        isolate: bool = True,
+        size_delta: int | None = None,
+    ):
+        expire_at = time.time() + expire if expire else None
+        if expire_at is not None:
+            heapq.heappush(self._expirations, (expire_at, key))
+        elif key in self.store:
+            expire_at, _ = self.store[key]
+        if isolate and self._on_write is not None:
+            value = self._on_write(value)
+        self._put(key, expire_at, value, size_delta)
+        if len(self._expirations) > 2 * len(self.store) + _HEAP_COMPACT_MIN:
+            self._compact_expirations()
+
+    def _put(self, key: Key, expire_at: float | None, value: Value, size_delta: int | None = None) -> None:
+        is_new = key not in self.store
+        self.store[key] = (expire_at, value)
+        self._track_size(key, value, size_delta)
+        if is_new:
+            for evicted_key in self._policy.insert(key):
+                self._evict_key(evicted_key)
+        else:
+            self._policy.access(key)
+        if self._max_bytes is None:
+            return
+        while self._bytes_used > self._max_bytes and self.store:
+            victim = self._policy.evict()
+            if victim is None:
+                break
+            self._evict_key(victim)
+
+    def _evict_key(self, key: Key) -> None:
+        self.store.pop(key, None)
+        self._untrack_size(key)
+
+    def _track_size(self, key: Key, value: Value, size_delta: int | None = None) -> None:
+        # size_delta - a change of the size of a value updated in place, otherwise the value is estimated
+        if self._max_bytes is None:
+            return
+        if size_delta is not None and key in self._sizes:
+            self._bytes_used += size_delta
+            self._sizes[key] += size_delta
+            return
+        size = estimate_obj_size(key) + estimate_obj_size(value)
+        self._bytes_used += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+
+    def _untrack_size(self, key: Key) -> None:
+        if self._max_bytes is None:
+            return
+        self._bytes_used -= self._sizes.pop(key, 0)
+
+    def _compact_expirations(self) -> None:
+        # drop heap entries of rewritten, deleted or evicted keys
+        store = self.store
+        self._expirations = [
+            (expire_at, key) for expire_at, key in self._expirations if key in store and store[key][0] == expire_at
+        ]
+        heapq.heapify(self._expirations)
 
     @overload
     async def _get(self, key: Key, default: Default) -> Value | Default: ...
@@ -199,17 +414,33 @@ class Memory(Backend):
     async def _get(self, key: Key, default: None = None) -> Value | None: ...
 
     async def _get(self, key: Key, default: Default | None = None) -> Value | None:
-        if key not in self.store:
+        value = self._lookup(key)
+        if value is _missed:
             return default
-        self.store.move_to_end(key)
-        expire_at, value = self.store[key]
-        if expire_at and expire_at < time.time():
-            await self._delete(key)
+        if value is _expired:
+            await self._call_on_remove_callbacks(key)
             return default
-        if not self._serializer:
+        if not self._serializer or not isinstance(value, bytes):
             return value
         return await self._serializer.decode(self, key=key, value=value, default=default)
 
+    def _lookup(self, key: Key) -> Value:
+        """
+        Return a stored (not decoded) value, _missed if there is no such key
+        or _expired if the key has expired (it is removed from the store)
+        """
+        entry = self.store.get(key)
+        if entry is None:
+            return _missed
+        expire_at, value = entry
+        if expire_at and expire_at < time.time():
+            self._remove(key)
+            return _expired
+        self._policy.access(key)
+        if self._on_read is not None:
+            return self._on_read(value)
+        return value
+
     async def _key_exist(self, key: Key) -> bool:
         return (await self._get(key, default=_missed)) is not _missed
 
@@ -253,30 +484,33 @@ class Memory(Backend):
         self._set(key, new_val, expire=expire)
         return count
 
+    # sets are owned by the backend: they are not copied on write, so big sets (tags) are updated in place
+
     async def set_add(self, key: Key, *values: str, expire: float | None = None):
         val: set = await self._get(key, default=set())
-        val.update(values)
-        self._set(key, val, expire=expire)
+        self._set(key, val, expire=expire, isolate=False, size_delta=_set_add(val, values))
 
     async def set_remove(self, key: Key, *values: str):
         val: set = await self._get(key, default=set())
-        val.difference_update(values)
-        self._set(key, val)
+        self._set(key, val, isolate=False, size_delta=_set_remove(val, values))
 
     async def set_pop(self, key: Key, count: int = 100) -> Iterable[str]:
         values: set = await self._get(key, default=set())
-        _values = []
-        for _ in range(count):
-            if not values:
-                break
-            _values.append(values.pop())
-
-        self._set(key, values)
-        return _values
+        popped, size_delta = _set_pop(values, count)
+        self._set(key, values, isolate=False, size_delta=size_delta)
+        return popped
 
     async def get_keys_count(self) -> int:
         return len(self.store)
 
+    async def get_bytes_used(self) -> int:
+        """
+        Return estimated size in bytes of all stored keys and values
+        """
+        if self._max_bytes is not None:
+            return self._bytes_used
+        return sum(estimate_obj_size(key) + estimate_obj_size(value) for key, (_, value) in self.store.items())
+
     async def close(self):
         if self.__remove_expired_task:
             self.__remove_expired_stop.set()
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, AsyncIterator, Iterable, Mapping
+import logging
+from typing import Any, AsyncIterator, Iterable, Mapping, Sequence
 
 from redis.asyncio import BlockingConnectionPool
 from redis.asyncio.client import Pipeline
 
 from cashews._typing import Key, Value
 from cashews.backends.interface import Backend
+from cashews.batching import AutoPipeline, GetBatcher
+from cashews.exceptions import CacheBackendInteractionError
 from cashews.serialize import DEFAULT_SERIALIZER, Serializer
 
-from .client import Redis, SafePipeline, SafeRedis
+from .client import CONNECTION_ERRORS, Redis, SafePipeline, SafeRedis, safe_result
+
+logger = logging.getLogger(__name__)
 
 _UNLOCK = """
 if redis.call("GET", KEYS[1]) == ARGV[1] then
@@ -38,6 +43,38 @@ if current_count == 1 then
 end
 return current_count
 """
+_SET_WITH_TAGS = """
+local expire = tonumber(ARGV[2])
+local args = {"SET", KEYS[1], ARGV[1]}
+if expire > 0 then
+    table.insert(args, "PX")
+    table.insert(args, expire)
+end
+if ARGV[3] ~= "" then
+    table.insert(args, ARGV[3])
+end
+if not redis.call(unpack(args)) then
+    return 0
+end
+for i = 2, #KEYS do
+    redis.call("SADD", KEYS[i], ARGV[4])
+    if expire > 0 then
+        redis.call("PEXPIRE", KEYS[i], expire)
+    end
+end
+return 1
+"""
+_SET_POP_DELETE = """
+local members = redis.call("SPOP", KEYS[1], ARGV[1])
+for i = 1, #members, 1000 do
+    local keys = {}
+    for j = i, math.min(i + 999, #members) do
+        table.insert(keys, ARGV[2] .. members[j])
+    end
+    redis.call("UNLINK", unpack(keys))
+end
+return members
+"""
 _empty = object()
 # pylint: disable=arguments-differ
 # pylint: disable=abstract-method
@@ -51,8 +88,20 @@ class _Redis(Backend):
         self,
         address: str,
         suppress: bool = True,
+        auto_batch: bool = False,
+        auto_batch_size: int = 100,
+        auto_batch_delay: float = 0,
+        auto_pipeline: bool = False,
+        auto_pipeline_size: int = 100,
         **kwargs: Any,
     ) -> None:
+        """
+        :param auto_batch: merge concurrent gets issued in the same loop tick into one MGET
+        :param auto_batch_size: max number of keys in one MGET of auto batching
+        :param auto_batch_delay: duration in seconds to collect gets for auto batching, 0 - one loop tick
+        :param auto_pipeline: send concurrent writes issued in the same loop tick with one pipeline
+        :param auto_pipeline_size: max number of commands in one pipeline of auto pipelining
+        """
         kwargs.pop("local_cache", None)
         kwargs.pop("prefix", None)
         kwargs.setdefault("client_name", "cashews")
@@ -68,6 +117,7 @@ class _Redis(Backend):
         if self._pool_class == BlockingConnectionPool:
             kwargs["timeout"] = kwargs.pop("wait_for_connection_timeout", 10)
         self._sha: dict[str, Any] = {}
+        self._suppress = suppress
         if not suppress:
             self._client_class = Redis
             self._pipeline_class = Pipeline
@@ -76,6 +126,12 @@ class _Redis(Backend):
             self._client_class = SafeRedis
         self._kwargs = kwargs
         self._address = address
+        self._batcher: GetBatcher | None = None
+        if auto_batch:
+            self._batcher = GetBatcher(self._mget, max_size=auto_batch_size, delay=auto_batch_delay)
+        self._auto_pipeline: AutoPipeline | None = None
+        if auto_pipeline:
+            self._auto_pipeline = AutoPipeline(self._execute_pipeline, max_size=auto_pipeline_size)
         self.__is_init = False
         super().__init__(serializer=kwargs.pop("serializer", None))
         self._serializer: Serializer = self._serializer or DEFAULT_SERIALIZER
@@ -97,6 +153,35 @@ class _Redis(Backend):
     def _pipeline(self):
         return self._pipeline_class(self._client.connection_pool, self._client.response_callbacks, True, None)
 
+    async def _execute(self, command: str, *args: Any, **kwargs: Any) -> Any:
+        if self._auto_pipeline is not None:
+            return await self._auto_pipeline.execute(command, *args, **kwargs)
+        return await getattr(self._client, command)(*args, **kwargs)
+
+    async def _execute_pipeline(self, commands: Sequence[tuple[str, tuple, dict]]) -> list[Any]:
+        pipe: Pipeline = Pipeline(self._client.connection_pool, self._client.response_callbacks, False, None)
+        for command, args, kwargs in commands:
+            getattr(pipe, command)(*args, **kwargs)
+        try:
+            results = await pipe.execute(raise_on_error=False)
+        except CONNECTION_ERRORS as exp:
+            if not self._suppress:
+                raise CacheBackendInteractionError() from exp
+            logger.error("redis: can not execute pipeline", exc_info=True)
+            return [safe_result(command) for command, _, _ in commands]
+        # the same errors semantic as for commands executed by the client
+        for i, ((command, _, _), result) in enumerate(zip(commands, results)):
+            if not isinstance(result, CONNECTION_ERRORS):
+                continue
+            if not self._suppress:
+                error = CacheBackendInteractionError()
+                error.__cause__ = result
+                results[i] = error
+            else:
+                logger.error("redis: can not execute command: %s", command, exc_info=result)
+                results[i] = safe_result(command)
+        return results
+
     async def clear(self):
         return await self._client.flushdb()
 
@@ -114,9 +199,30 @@ class _Redis(Backend):
         elif exist is False:
             nx = True
         px = int(expire * 1000) if expire else None
-        _set = bool(await self._client.set(key, value, px=px, nx=nx, xx=xx))
+        _set = bool(await self._execute("set", key, value, px=px, nx=nx, xx=xx))
         return _set
 
+    async def set_with_tags(
+        self,
+        key: Key,
+        value: Value,
+        tags: Iterable[Key],
+        expire: float | None = None,
+        exist: bool | None = None,
+        tagged_key: Key | None = None,
+    ) -> bool:
+        value = await self._serializer.encode(self, key=key, value=value, expire=expire)
+        condition = "" if exist is None else {True: "XX", False: "NX"}[exist]
+        px = int(expire * 1000) if expire else 0
+        if "SET_WITH_TAGS" not in self._sha:
+            self._sha["SET_WITH_TAGS"] = await self._client.script_load(_SET_WITH_TAGS.replace("\n", " "))
+        tags = list(tags)
+        return bool(
+            await self._client.evalsha(
+                self._sha["SET_WITH_TAGS"], 1 + len(tags), key, *tags, value, px, condition, tagged_key or key
+            )
+        )
+
     async def set_many(self, pairs: Mapping[Key, Value], expire: float | None = None):
         px = int(expire * 1000) if expire else None
         async with self._pipeline as pipe:
@@ -129,7 +235,7 @@ class _Redis(Backend):
         return await self._client.ttl(key)
 
     async def expire(self, key: Key, timeout: float):
-        return await self._client.pexpire(key, int(timeout * 1000))
+        return await self._execute("pexpire", key, int(timeout * 1000))
 
     async def set_lock(self, key: Key, value: Value, expire: float) -> bool:
         pexpire = int(expire * 1000)
@@ -214,9 +320,15 @@ class _Redis(Backend):
         return int(size)
 
     async def get(self, key: Key, default: Value | None = None) -> Value:
-        value = await self._client.get(key)
+        if self._batcher is not None:
+            value = await self._batcher.get(key)
+        else:
+            value = await self._client.get(key)
         return await self._transform_value(key, value, default)
 
+    async def _mget(self, keys: Sequence[Key]) -> list[bytes | None] | None:
+        return await self._client.mget(*keys)
+
     async def get_many(self, *keys: Key, default: Value | None = None) -> tuple[Value | None, ...]:
         if not keys:
             return ()
@@ -236,7 +348,7 @@ class _Redis(Backend):
 
     async def incr(self, key: Key, value: int = 1, expire: float | None = None) -> int:
         if not expire:
-            return await self._client.incr(key, amount=value)
+            return await self._execute("incr", key, amount=value)
         if "INCR_EXPIRE" not in self._sha:
             self._sha["INCR_EXPIRE"] = await self._client.script_load(_INCR_EXPIRE.replace("\n", " "))
         expire = expire or 0
@@ -288,8 +400,11 @@ class _Redis(Backend):
 
     async def set_add(self, key: Key, *values: str, expire: float | None = None):
         if expire is None:
-            return await self._client.sadd(key, *values)
+            return await self._execute("sadd", key, *values)
         expire = int(expire * 1000)
+        if self._auto_pipeline is not None:
+            await asyncio.gather(self._execute("sadd", key, *values), self._execute("pexpire", key, expire))
+            return
         async with self._pipeline as pipe:
             await pipe.sadd(key, *values)
             await pipe.pexpire(key, expire)
@@ -308,6 +423,16 @@ class _Redis(Backend):
 
         return [value.decode() for value in values]  # type: ignore[union-attr]
 
+    async def set_pop_delete(self, key: Key, count: int = 100, prefix: str = "") -> list[Key]:
+        if "SET_POP_DELETE" not in self._sha:
+            self._sha["SET_POP_DELETE"] = await self._client.script_load(_SET_POP_DELETE.replace("\n", " "))
+        members = await self._client.evalsha(self._sha["SET_POP_DELETE"], 1, key, count, prefix)
+        if not members:
+            return []
+        members = [member.decode() for member in members]
+        await self._call_on_remove_callbacks(*[prefix + member for member in members])
+        return members
+
     async def get_keys_count(self) -> int:
         return await self._client.dbsize()
 
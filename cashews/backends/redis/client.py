@@ -10,18 +10,30 @@ from redis.exceptions import RedisError as RedisConnectionError
 from cashews.exceptions import CacheBackendInteractionError
 
 logger = logging.getLogger(__name__)
+CONNECTION_ERRORS = (
+    RedisConnectionError,
+    socket.gaierror,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+
+def safe_result(command: str) -> Any:
+    """
+    A result of a command that failed by a connection error with suppressed errors
+    """
+    if command.lower() in ["unlink", "del", "memory", "ttl"]:
+        return 0
+    if command.lower() == "scan":
+        return [0, []]
+    return None
 
 
 class Redis(_Redis):
     async def execute_command(self, command, *args: Any, **kwargs: Any):
         try:
             return await super().execute_command(command, *args, **kwargs)
-        except (
-            RedisConnectionError,
-            socket.gaierror,
-            OSError,
-            asyncio.TimeoutError,
-        ) as exp:
+        except CONNECTION_ERRORS as exp:
             raise CacheBackendInteractionError() from exp
 
 
@@ -29,25 +41,16 @@ class SafeRedis(_Redis):
     async def execute_command(self, command, *args: Any, **kwargs: Any):
         try:
             return await super().execute_command(command, *args, **kwargs)
-        except (
-            RedisConnectionError,
-            socket.gaierror,
-            OSError,
-            asyncio.TimeoutError,
-        ) as exp:
+        except CONNECTION_ERRORS as exp:
             if command.lower() == "ping":
                 raise CacheBackendInteractionError() from exp
             logger.error("redis: can not execute command: %s", command, exc_info=True)
-            if command.lower() in ["unlink", "del", "memory", "ttl"]:
-                return 0
-            if command.lower() == "scan":
-                return [0, []]
-            return None
+            return safe_result(command)
 
     async def initialize(self):
         try:
             return await super().initialize()
-        except (RedisConnectionError, socket.gaierror, OSError, asyncio.TimeoutError):
+        except CONNECTION_ERRORS:
             logger.error("redis: can not initialize cache", exc_info=True)
             return self
 
@@ -32,11 +32,12 @@ from __future__ import annotations
 import asyncio
 import logging
 from contextlib import suppress as error_suppress
-from typing import Any, AsyncIterator, Mapping
+from typing import Any, AsyncIterator, Iterable, Mapping
 
 from redis.exceptions import ConnectionError as RedisConnectionError
 
 from cashews._typing import Key, Value
+from cashews.backends.interface import Backend
 from cashews.backends.memory import Memory
 
 from . import Redis
@@ -193,6 +194,22 @@ class BcastClientSide(Redis):
             await self._recently_update.delete(key)
         return _set
 
+    async def set_with_tags(
+        self,
+        key: Key,
+        value: Value,
+        tags: Iterable[Key],
+        expire: float | None = None,
+        exist: bool | None = None,
+        tagged_key: Key | None = None,
+    ) -> bool:
+        # the local cache and prefixed keys are handled by set
+        return await Backend.set_with_tags(self, key, value, tags, expire=expire, exist=exist, tagged_key=tagged_key)
+
+    async def set_pop_delete(self, key: Key, count: int = 100, prefix: str = "") -> list[Key]:
+        # the local cache and prefixed keys are handled by delete_many
+        return await Backend.set_pop_delete(self, key, count=count, prefix=prefix)
+
     async def set_many(self, pairs: Mapping[Key, Value], expire: float | None = None):
         await self._local_cache.set_many(pairs, expire)
         for key in pairs:
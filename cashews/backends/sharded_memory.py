@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterable, Mapping, overload
+
+from cashews.exceptions import AwaitRequiredError
+from cashews.utils import Bitarray, get_obj_size
+
+from .interface import NOT_EXIST, UNLIMITED, Backend
+from .memory import _EXPIRE_BATCH, Memory, _expired, _missed, _set_add, _set_pop, _set_remove
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cashews._typing import Default, Key, Result_T, Value
+
+__all__ = ["ShardedMemory"]
+
+
+class ShardedMemory(Backend):
+    """
+    Inmemory backend with ttl that is safe to share between threads and event loops
+    Keys are distributed between shards, every shard is a Memory store (with its own eviction policy)
+    guarded by a lock, so commands for keys from different shards don't wait for each other
+    Size and max_bytes are limits for the whole backend and split evenly between shards
+    Expired keys are removed on access and by a sweep piggybacked on writes (no background task bound to a loop)
+    """
+
+    def __init__(
+        self,
+        size: int = 1000,
+        shards: int = 16,
+        check_interval: float = 1,
+        max_bytes: int | None = None,
+        policy: str = "lru",
+        isolation: str = "shallow",
+        **kwargs,
+    ):
+        if shards < 1:
+            raise ValueError("shards should be positive")
+        self.size = size
+        self._check_interval = check_interval
+        shard_size = -(-size // shards)
+        shard_max_bytes = -(-max_bytes // shards) if max_bytes is not None else None
+        self._shards = [
+            Memory(
+                size=shard_size,
+                check_interval=0,
+                max_bytes=shard_max_bytes,
+                policy=policy,
+                isolation=isolation,
+            )
+            for _ in range(shards)
+        ]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._next_sweep = [0.0] * shards
+        self.__is_init = False
+        super().__init__(**kwargs)
+
+    async def init(self):
+        self.__is_init = True
+
+    @property
+    def is_init(self) -> bool:
+        return self.__is_init
+
+    async def close(self):
+        self.__is_init = False
+
+    def _index(self, key: Key) -> int:
+        return hash(key) % len(self._shards)
+
+    def _sweep(self, index: int) -> list[Key]:
+        # should be called under the shard lock
+        if not self._check_interval:
+            return []
+        now = time.monotonic()
+        if now < self._next_sweep[index]:
+            return []
+        self._next_sweep[index] = now + self._check_interval
+        return self._shards[index]._pop_expired(_EXPIRE_BATCH)
+
+    async def _removed(self, *keys: Key) -> None:
+        if keys:
+            await self._call_on_remove_callbacks(*keys)
+
+    @overload
+    async def _get(self, key: Key, default: Default) -> Value | Default: ...
+
+    @overload
+    async def _get(self, key: Key, default: None = None) -> Value | None: ...
+
+    async def _get(self, key: Key, default: Default | None = None) -> Value | None:
+        index = self._index(key)
+        with self._locks[index]:
+            value = self._shards[index]._lookup(key)
+        if value is _missed:
+            return default
+        if value is _expired:
+            await self._removed(key)
+            return default
+        if not self._serializer or not isinstance(value, bytes):
+            return value
+        return await self._serializer.decode(self, key=key, value=value, default=default)
+
+    def _set(
+        self, key: Key, value: Value, expire: float | None = None, exist: bool | None = None
+    ) -> tuple[bool, list]:
+        index = self._index(key)
+        shard = self._shards[index]
+        with self._locks[index]:
+            removed = self._sweep(index)
+            if exist is not None:
+                current = shard._lookup(key)
+                if current is _expired:
+                    removed.append(key)
+                if (current is not _missed and current is not _expired) is not exist:
+                    return False, removed
+            shard._set(key, value, expire)
+        return True, removed
+
+    async def set(
+        self,
+        key: Key,
+        value: Value,
+        expire: float | None = None,
+        exist: bool | None = None,
+    ) -> bool:
+        if self._serializer:
+            value = await self._serializer.encode(self, key=key, value=value, expire=expire)
+        result, removed = self._set(key, value, expire, exist)
+        await self._removed(*removed)
+        return result
+
+    async def set_raw(self, key: Key, value: Value, **kwargs: Any) -> None:
+        index = self._index(key)
+        with self._locks[index]:
+            self._shards[index]._put(key, None, value)
+
+    async def get(self, key: Key, default: Value | None = None) -> Value:
+        return await self._get(key, default=default)
+
+    def get_nowait(self, key: Key, default: Value | None = None) -> Value:
+        """
+        Sync version of get, raise AwaitRequiredError if the key is expired and on-remove callbacks should be called
+        """
+        index = self._index(key)
+        shard = self._shards[index]
+        with self._locks[index]:
+            if self._on_remove_callbacks and shard._is_expired(key):
+                raise AwaitRequiredError(f"expired key {key} should be removed with callbacks")
+            value = shard._lookup(key)
+        if value is _missed or value is _expired:
+            return default
+        if not self._serializer or not isinstance(value, bytes):
+            return value
+        return self._serializer.decode_nowait(self, key=key, value=value, default=default)
+
+    async def get_raw(self, key: Key) -> Value:
+        index = self._index(key)
+        with self._locks[index]:
+            value = self._shards[index]._lookup(key)
+        if value is _missed or value is _expired:
+            return None
+        return value
+
+    async def get_many(self, *keys: Key, default: Value | None = None) -> tuple[Value | None, ...]:
+        values = []
+        for key in keys:
+            val = await self._get(key, default=default)
+            if isinstance(val, Bitarray):
+                continue
+            values.append(val)
+        return tuple(values)
+
+    async def set_many(self, pairs: Mapping[Key, Value], expire: float | None = None):
+        for key, value in pairs.items():
+            await self.set(key, value, expire=expire)
+
+    async def scan(self, pattern: str, batch_size: int = 100) -> AsyncIterator[Key]:  # type: ignore
+        pattern = pattern.replace("*", ".*")
+        regexp = re.compile(pattern)
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                keys = list(shard.store)
+            for key in keys:
+                if regexp.fullmatch(key):
+                    yield key
+
+    async def incr(self, key: Key, value: int = 1, expire: float | None = None) -> int:
+        index = self._index(key)
+        shard = self._shards[index]
+        with self._locks[index]:
+            current = shard._lookup(key)
+            if current is not _missed and current is not _expired:
+                value += int(current)
+            _expire = None if value != 1 else expire
+            shard._set(key, value, _expire)
+        if current is _expired:
+            await self._removed(key)
+        return value
+
+    async def exists(self, key: Key) -> bool:
+        return (await self._get(key, default=_missed)) is not _missed
+
+    async def delete(self, key: Key) -> bool:
+        index = self._index(key)
+        with self._locks[index]:
+            removed = self._shards[index]._remove(key)
+        if removed:
+            await self._removed(key)
+        return removed
+
+    async def delete_many(self, *keys: Key):
+        for key in keys:
+            await self.delete(key)
+
+    async def delete_match(self, pattern: Key):
+        async for key in self.scan(pattern):
+            await self.delete(key)
+
+    async def get_match(
+        self,
+        pattern: str,
+        batch_size: int = 100,
+    ) -> AsyncIterator[tuple[Key, Value]]:
+        async for key in self.scan(pattern):
+            value = await self._get(key, default=_missed)
+            if value is not _missed and not isinstance(value, Bitarray):
+                yield key, value
+
+    async def expire(self, key: Key, timeout: float):
+        index = self._index(key)
+        shard = self._shards[index]
+        with self._locks[index]:
+            value = shard._lookup(key)
+            if value is not _missed and value is not _expired:
+                shard._set(key, value, timeout)
+        if value is _expired:
+            await self._removed(key)
+
+    async def get_expire(self, key: Key) -> int:
+        index = self._index(key)
+        with self._locks[index]:
+            entry = self._shards[index].store.get(key)
+        if entry is None:
+            return NOT_EXIST
+        expire_at, _ = entry
+        if expire_at is not None:
+            return round(expire_at - time.time())
+        return UNLIMITED
+
+    async def ping(self, message: bytes | None = None) -> bytes:
+        if message is None or message == b"PING":
+            return b"PONG"
+        return message
+
+    async def _modify(
+        self,
+        key: Key,
+        default: Value,
+        modify: Callable[[Any], tuple[Result_T, int | None]],
+        expire: float | None = None,
+    ) -> Result_T:
+        # read-modify-write a value under the shard lock, the value is owned by the backend:
+        # it is updated in place, not copied on write (big sets of tags).
+        # modify returns a result and a change of the value size (None - estimate the value again)
+        index = self._index(key)
+        shard = self._shards[index]
+        with self._locks[index]:
+            value = current = shard._lookup(key)
+            if value is _missed or value is _expired:
+                value = default
+            result, size_delta = modify(value)
+            shard._set(key, value, expire, isolate=False, size_delta=size_delta)
+        if current is _expired:
+            await self._removed(key)
+        return result
+
+    async def get_bits(self, key: Key, *indexes: int, size: int = 1) -> tuple[int, ...]:
+        array: Bitarray = await self._get(key, default=Bitarray("0"))
+        return tuple(array.get(index, size) for index in indexes)
+
+    async def incr_bits(self, key: Key, *indexes: int, size: int = 1, by: int = 1) -> tuple[int, ...]:
+        def _incr(array: Bitarray) -> tuple[tuple[int, ...], None]:
+            result = []
+            for index in indexes:
+                array.incr(index, size, by)
+                result.append(array.get(index, size))
+            return tuple(result), None
+
+        return await self._modify(key, Bitarray("0"), _incr)
+
+    async def slice_incr(
+        self,
+        key: Key,
+        start: int | float,
+        end: int | float,
+        maxvalue: int,
+        expire: float | None = None,
+    ) -> int:
+        def _slice_incr(val_list: list) -> tuple[int, None]:
+            new_val = [val for val in val_list if start <= val < end]
+            val_list[:] = new_val
+            if len(val_list) < maxvalue:
+                val_list.append(end)
+            return len(val_list), None
+
+        return await self._modify(key, [], _slice_incr, expire=expire)
+
+    async def set_add(self, key: Key, *values: str, expire: float | None = None):
+        await self._modify(key, set(), lambda val: (None, _set_add(val, values)), expire=expire)
+
+    async def set_remove(self, key: Key, *values: str):
+        await self._modify(key, set(), lambda val: (None, _set_remove(val, values)))
+
+    async def set_pop(self, key: Key, count: int = 100) -> Iterable[str]:
+        return await self._modify(key, set(), lambda values: _set_pop(values, count))
+
+    async def is_locked(self, key: Key, wait: float | None = None, step: float = 0.1) -> bool:
+        if wait is None:
+            return await self.exists(key)
+        while wait > 0:
+            if not await self.exists(key):
+                return False
+            wait -= step
+            await asyncio.sleep(step)
+        return await self.exists(key)
+
+    async def unlock(self, key: Key, value: Value) -> bool:
+        return await self.delete(key)
+
+    async def get_size(self, key: Key) -> int:
+        index = self._index(key)
+        with self._locks[index]:
+            entry = self._shards[index].store.get(key)
+        if entry is not None:
+            return get_obj_size(entry)
+        return 0
+
+    async def get_keys_count(self) -> int:
+        return sum(len(shard.store) for shard in self._shards)
+
+    async def get_bytes_used(self) -> int:
+        """
+        Return estimated size in bytes of all stored keys and values
+        """
+        total = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                total += await shard.get_bytes_used()
+        return total
+
+    async def clear(self):
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard._reset()
@@ -0,0 +1,527 @@
+"""
+Backend that keeps a cache in a shared memory segment, so processes of one host (e.g. web server workers) share it
+
+The segment is a set-associative hash table: a key hash selects a bucket of `ways` fixed size slots,
+a new key takes an empty (or expired) slot of the bucket or replaces the least recently used one.
+Every slot keeps a key, a value (serialized bytes) and a header with an expiration and a last access time.
+Buckets are guarded by striped locks: fcntl record locks between processes and thread locks inside a process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from hashlib import blake2b
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterable, Iterator, Mapping, TypeVar
+
+from cashews.exceptions import ValueTooBigError
+from cashews.serialize import DEFAULT_SERIALIZER, Serializer
+from cashews.utils import Bitarray
+
+from .interface import NOT_EXIST, UNLIMITED, Backend
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cashews._typing import Key, Value
+
+__all__ = ["SharedMemory"]
+
+_MAGIC = b"CASHEWS1"
+# magic, buckets, ways, slot size
+_HEADER = struct.Struct("<8sIII")
+# state, key length, value length, key hash, expire at, last access
+_SLOT = struct.Struct("<BHIQdd")
+_EMPTY = 0
+_USED = 1
+_MAX_STRIPES = 64
+
+Result_T = TypeVar("Result_T")
+
+
+def _key_hash(key: bytes) -> int:
+    # the builtin hash is randomized per process
+    return int.from_bytes(blake2b(key, digest_size=8).digest(), "little")
+
+
+def _to_bytes(value: Value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, int):
+        return str(value).encode()
+    if isinstance(value, str):
+        return value.encode()
+    raise TypeError(f"Shared memory backend can store only bytes, got {type(value).__name__}")
+
+
+class SharedMemory(Backend):
+    def __init__(
+        self,
+        name: str = "cashews",
+        size: int = 1024,
+        slot_size: int = 1024,
+        ways: int = 8,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param name: name of the shared memory segment, processes with the same name share a cache
+        :param size: max number of keys (rounded up to the multiple of ways)
+        :param slot_size: max size in bytes of a key with a value (bigger values are not stored,
+            set and bits commands raise ValueTooBigError)
+        :param ways: number of slots in a bucket
+        """
+        serializer = kwargs.pop("serializer", DEFAULT_SERIALIZER)
+        if slot_size <= _SLOT.size:
+            raise ValueError(f"slot_size should be bigger than {_SLOT.size}")
+        self._name = name
+        self._ways = ways
+        self._buckets = max(1, -(-size // ways))
+        self._slot_size = slot_size
+        self._stripes = min(self._buckets, _MAX_STRIPES)
+        self._thread_locks = [threading.Lock() for _ in range(self._stripes)]
+        self._shm: shared_memory.SharedMemory | None = None
+        self._buf: memoryview | None = None
+        self._lock_fd: int | None = None
+        self.__is_init = False
+        super().__init__(serializer=serializer, **kwargs)
+        self._serializer: Serializer
+
+    @property
+    def is_init(self) -> bool:
+        return self.__is_init
+
+    @property
+    def _buffer(self) -> memoryview:
+        assert self._buf is not None, "shared memory backend is not initialized"
+        return self._buf
+
+    @property
+    def _lock_file(self) -> int:
+        assert self._lock_fd is not None, "shared memory backend is not initialized"
+        return self._lock_fd
+
+    async def init(self):
+        lock_fd = os.open(os.path.join(tempfile.gettempdir(), f"{self._name}.lock"), os.O_RDWR | os.O_CREAT)
+        self._lock_fd = lock_fd
+        # the lock after the stripes serializes creation of the segment
+        fcntl.lockf(lock_fd, fcntl.LOCK_EX, 1, self._stripes)
+        try:
+            shm = self._open_segment()
+        except ValueError:
+            fcntl.lockf(lock_fd, fcntl.LOCK_UN, 1, self._stripes)
+            await self.close()
+            raise
+        fcntl.lockf(lock_fd, fcntl.LOCK_UN, 1, self._stripes)
+        self._shm = shm
+        self._buf = shm.buf
+        self.__is_init = True
+
+    def _open_segment(self) -> shared_memory.SharedMemory:
+        total_size = _HEADER.size + self._buckets * self._ways * self._slot_size
+        try:
+            shm = _attach_segment(self._name, total_size, create=True)
+            created = True
+        except FileExistsError:
+            shm = _attach_segment(self._name, total_size, create=False)
+            created = False
+        buf = shm.buf
+        assert buf is not None  # None only for a closed segment
+        if created:
+            _HEADER.pack_into(buf, 0, _MAGIC, self._buckets, self._ways, self._slot_size)
+            return shm
+        magic, buckets, ways, slot_size = _HEADER.unpack_from(buf)
+        if (magic, buckets, ways, slot_size) != (_MAGIC, self._buckets, self._ways, self._slot_size):
+            shm.close()
+            raise ValueError(f"Shared memory segment {self._name} has a different layout")
+        return shm
+
+    async def close(self):
+        self.__is_init = False
+        self._buf = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def unlink(self) -> None:
+        """
+        Destroy the shared memory segment (the segment outlives processes until it is unlinked)
+        """
+        shm = self._shm or _attach_segment(self._name, 0, create=False)
+        if sys.version_info < (3, 13):
+            # unlink unregisters the segment from the resource tracker
+            resource_tracker.register(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        shm.unlink()
+
+    @contextmanager
+    def _locked(self, bucket: int) -> Iterator[None]:
+        stripe = bucket % self._stripes
+        with self._thread_locks[stripe]:
+            lock_fd = self._lock_file
+            fcntl.lockf(lock_fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(lock_fd, fcntl.LOCK_UN, 1, stripe)
+
+    def _slot_offsets(self, bucket: int) -> range:
+        start = _HEADER.size + bucket * self._ways * self._slot_size
+        return range(start, start + self._ways * self._slot_size, self._slot_size)
+
+    def _find(self, bucket: int, key_hash: int, key: bytes, now: float) -> int | None:
+        # should be called under the bucket lock, returns an offset of the slot with a given key
+        buf = self._buffer
+        for offset in self._slot_offsets(bucket):
+            state, key_len, _, slot_hash, expire_at, _ = _SLOT.unpack_from(buf, offset)
+            if state != _USED or slot_hash != key_hash:
+                continue
+            key_start = offset + _SLOT.size
+            if buf[key_start : key_start + key_len] != key:
+                continue
+            if expire_at and expire_at < now:
+                buf[offset] = _EMPTY
+                return None
+            return offset
+        return None
+
+    def _choose_slot(self, bucket: int, now: float) -> int:
+        # empty or expired slot first, otherwise the least recently used one
+        buf = self._buffer
+        victim, victim_access = 0, float("inf")
+        for offset in self._slot_offsets(bucket):
+            state, _, _, _, expire_at, access = _SLOT.unpack_from(buf, offset)
+            if state != _USED or (expire_at and expire_at < now):
+                return offset
+            if access < victim_access:
+                victim, victim_access = offset, access
+        return victim
+
+    def _read(self, offset: int, now: float) -> bytes:
+        # the value is copied out of the segment: a slot can be overwritten as soon as the bucket lock is released
+        buf = self._buffer
+        _, key_len, value_len, _, _, _ = _SLOT.unpack_from(buf, offset)
+        struct.pack_into("<d", buf, offset + _SLOT.size - 8, now)
+        value_start = offset + _SLOT.size + key_len
+        return bytes(buf[value_start : value_start + value_len])
+
+    def _write(self, offset: int, key_hash: int, key: bytes, value: bytes, expire_at: float, now: float) -> None:
+        buf = self._buffer
+        _SLOT.pack_into(buf, offset, _USED, len(key), len(value), key_hash, expire_at, now)
+        key_start = offset + _SLOT.size
+        buf[key_start : key_start + len(key)] = key
+        buf[key_start + len(key) : key_start + len(key) + len(value)] = value
+
+    def _locate(self, key: Key) -> tuple[bytes, int, int]:
+        _key = key.encode()
+        key_hash = _key_hash(_key)
+        return _key, key_hash, key_hash % self._buckets
+
+    def _set(self, key: Key, value: bytes, expire: float | None = None, exist: bool | None = None) -> bool:
+        _key, key_hash, bucket = self._locate(key)
+        now = time.time()
+        with self._locked(bucket):
+            offset = self._find(bucket, key_hash, _key, now)
+            if exist is not None and (offset is not None) is not exist:
+                return False
+            return self._store(bucket, offset, key_hash, _key, value, expire, now)
+
+    def _store(
+        self,
+        bucket: int,
+        offset: int | None,
+        key_hash: int,
+        key: bytes,
+        value: bytes,
+        expire: float | None,
+        now: float,
+    ) -> bool:
+        # should be called under the bucket lock, offset - a slot of the key if it exists
+        if not self._fits(key, value):
+            if offset is not None:
+                self._buffer[offset] = _EMPTY
+            return False
+        if expire:
+            expire_at = now + expire
+        elif offset is not None:
+            expire_at = _SLOT.unpack_from(self._buffer, offset)[4]
+        else:
+            expire_at = 0.0
+        if offset is None:
+            offset = self._choose_slot(bucket, now)
+        self._write(offset, key_hash, key, value, expire_at, now)
+        return True
+
+    def _modify(
+        self, key: Key, default: Value, modify: Callable[[Any], Result_T], expire: float | None = None
+    ) -> Result_T:
+        # read-modify-write a value under the bucket lock: atomic between processes as incr.
+        # The lock can't be held across awaits, so the value is decoded and encoded without suspending
+        _key, key_hash, bucket = self._locate(key)
+        now = time.time()
+        with self._locked(bucket):
+            offset = self._find(bucket, key_hash, _key, now)
+            value = default
+            if offset is not None:
+                value = self._serializer.decode_nowait(self, key=key, value=self._read(offset, now), default=default)
+            result = modify(value)
+            encoded = _to_bytes(self._serializer.encode_nowait(self, key=key, value=value, expire=expire))
+            if not self._fits(_key, encoded):
+                # unlike a set of a big value (a cache miss later), a lost update of a set or a counter is not safe
+                raise ValueTooBigError(
+                    f"value of {key} ({len(encoded)} bytes) doesn't fit a slot of {self._slot_size}"
+                )
+            self._store(bucket, offset, key_hash, _key, encoded, expire, now)
+        return result
+
+    def _fits(self, key: bytes, value: bytes) -> bool:
+        return _SLOT.size + len(key) + len(value) <= self._slot_size
+
+    def _get(self, key: Key) -> bytes | None:
+        _key, key_hash, bucket = self._locate(key)
+        now = time.time()
+        with self._locked(bucket):
+            offset = self._find(bucket, key_hash, _key, now)
+            if offset is None:
+                return None
+            return self._read(offset, now)
+
+    def _delete(self, key: Key) -> bool:
+        _key, key_hash, bucket = self._locate(key)
+        with self._locked(bucket):
+            offset = self._find(bucket, key_hash, _key, time.time())
+            if offset is None:
+                return False
+            self._buffer[offset] = _EMPTY
+        return True
+
+    def _incr(self, key: Key, value: int, expire: float | None) -> int:
+        _key, key_hash, bucket = self._locate(key)
+        now = time.time()
+        with self._locked(bucket):
+            offset = self._find(bucket, key_hash, _key, now)
+            expire_at = 0.0
+            if offset is not None:
+                expire_at = _SLOT.unpack_from(self._buffer, offset)[4]
+                value += int(self._read(offset, now))
+            else:
+                offset = self._choose_slot(bucket, now)
+            if value == 1 and expire:
+                expire_at = now + expire
+            self._write(offset, key_hash, _key, str(value).encode(), expire_at, now)
+        return value
+
+    def _expire(self, key: Key, timeout: float) -> None:
+        _key, key_hash, bucket = self._locate(key)
+        now = time.time()
+        with self._locked(bucket):
+            offset = self._find(bucket, key_hash, _key, now)
+            if offset is not None:
+                struct.pack_into("<d", self._buffer, offset + _SLOT.size - 16, now + timeout)
+
+    def _get_slot(self, key: Key) -> tuple[int, float] | None:
+        _key, key_hash, bucket = self._locate(key)
+        with self._locked(bucket):
+            offset = self._find(bucket, key_hash, _key, time.time())
+            if offset is None:
+                return None
+            _, key_len, value_len, _, expire_at, _ = _SLOT.unpack_from(self._buffer, offset)
+        return key_len + value_len, expire_at
+
+    def _keys(self) -> Iterator[Key]:
+        now = time.time()
+        for bucket in range(self._buckets):
+            keys = []
+            with self._locked(bucket):
+                for offset in self._slot_offsets(bucket):
+                    state, key_len, _, _, expire_at, _ = _SLOT.unpack_from(self._buffer, offset)
+                    if state == _USED and not (expire_at and expire_at < now):
+                        keys.append(bytes(self._buffer[offset + _SLOT.size : offset + _SLOT.size + key_len]).decode())
+            yield from keys
+
+    async def set(
+        self,
+        key: Key,
+        value: Value,
+        expire: float | None = None,
+        exist: bool | None = None,
+    ) -> bool:
+        value = await self._serializer.encode(self, key=key, value=value, expire=expire)
+        return self._set(key, _to_bytes(value), expire, exist)
+
+    async def set_raw(self, key: Key, value: Value, **kwargs: Any) -> None:
+        self._set(key, _to_bytes(value), kwargs.get("expire"))
+
+    async def get(self, key: Key, default: Value | None = None) -> Value:
+        value = self._get(key)
+        if value is None:
+            return default
+        return await self._serializer.decode(self, key=key, value=value, default=default)
+
+    async def get_raw(self, key: Key) -> Value:
+        return self._get(key)
+
+    async def get_many(self, *keys: Key, default: Value | None = None) -> tuple[Value | None, ...]:
+        values = []
+        for key in keys:
+            value = await self.get(key, default=default)
+            values.append(None if isinstance(value, Bitarray) else value)
+        return tuple(values)
+
+    async def set_many(self, pairs: Mapping[Key, Value], expire: float | None = None):
+        for key, value in pairs.items():
+            await self.set(key, value, expire=expire)
+
+    async def exists(self, key: Key) -> bool:
+        return self._get_slot(key) is not None
+
+    async def scan(self, pattern: str, batch_size: int = 100) -> AsyncIterator[Key]:  # type: ignore
+        pattern = pattern.replace("*", ".*")
+        regexp = re.compile(pattern)
+        for key in self._keys():
+            if regexp.fullmatch(key):
+                yield key
+
+    async def incr(self, key: Key, value: int = 1, expire: float | None = None) -> int:
+        return self._incr(key, value, expire)
+
+    async def delete(self, key: Key) -> bool:
+        deleted = self._delete(key)
+        if deleted:
+            await self._call_on_remove_callbacks(key)
+        return deleted
+
+    async def delete_many(self, *keys: Key):
+        deleted = [key for key in keys if self._delete(key)]
+        if deleted:
+            await self._call_on_remove_callbacks(*deleted)
+
+    async def delete_match(self, pattern: str):
+        keys = [key async for key in self.scan(pattern)]
+        await self.delete_many(*keys)
+
+    async def get_match(self, pattern: str, batch_size: int = 100) -> AsyncIterator[tuple[Key, Value]]:
+        async for key in self.scan(pattern):
+            value = await self.get(key)
+            if value is None or isinstance(value, Bitarray):
+                continue
+            yield key, value
+
+    async def expire(self, key: Key, timeout: float):
+        self._expire(key, timeout)
+
+    async def get_expire(self, key: Key) -> int:
+        slot = self._get_slot(key)
+        if slot is None:
+            return NOT_EXIST
+        _, expire_at = slot
+        if not expire_at:
+            return UNLIMITED
+        return round(expire_at - time.time())
+
+    async def get_size(self, key: Key) -> int:
+        slot = self._get_slot(key)
+        if slot is None:
+            return 0
+        return slot[0]
+
+    async def get_keys_count(self) -> int:
+        return sum(1 for _ in self._keys())
+
+    async def ping(self, message: bytes | None = None) -> bytes:
+        if message is None or message == b"PING":
+            return b"PONG"
+        return message
+
+    async def clear(self):
+        for bucket in range(self._buckets):
+            with self._locked(bucket):
+                for offset in self._slot_offsets(bucket):
+                    self._buffer[offset] = _EMPTY
+
+    async def is_locked(
+        self,
+        key: Key,
+        wait: float | None = None,
+        step: float = 0.1,
+    ) -> bool:
+        if wait is None:
+            return await self.exists(key)
+        while wait > 0:
+            if not await self.exists(key):
+                return False
+            wait -= step
+            await asyncio.sleep(step)
+        return await self.exists(key)
+
+    async def unlock(self, key: Key, value: Value) -> bool:
+        value = _to_bytes(await self._serializer.encode(self, key=key, value=value, expire=None))
+        _key, key_hash, bucket = self._locate(key)
+        now = time.time()
+        # compare and delete under the bucket lock: other process can take the lock after it is expired
+        with self._locked(bucket):
+            offset = self._find(bucket, key_hash, _key, now)
+            if offset is None or self._read(offset, now) != value:
+                return False
+            self._buffer[offset] = _EMPTY
+        await self._call_on_remove_callbacks(key)
+        return True
+
+    async def get_bits(self, key: Key, *indexes: int, size: int = 1) -> tuple[int, ...]:
+        array = await self.get(key, default=Bitarray("0"))
+        return tuple(array.get(index, size) for index in indexes)
+
+    async def incr_bits(self, key: Key, *indexes: int, size: int = 1, by: int = 1) -> tuple[int, ...]:
+        def _incr(array: Bitarray) -> tuple[int, ...]:
+            result = []
+            for index in indexes:
+                array.incr(index, size, by)
+                result.append(array.get(index, size))
+            return tuple(result)
+
+        return self._modify(key, Bitarray("0"), _incr)
+
+    async def slice_incr(
+        self,
+        key: Key,
+        start: int | float,
+        end: int | float,
+        maxvalue: int,
+        expire: float | None = None,
+    ) -> int:
+        def _slice_incr(val_list: list) -> int:
+            val_list[:] = [val for val in val_list if start <= val < end]
+            if len(val_list) < maxvalue:
+                val_list.append(end)
+            return len(val_list)
+
+        return self._modify(key, [], _slice_incr, expire=expire)
+
+    async def set_add(self, key: Key, *values: str, expire: float | None = None):
+        self._modify(key, set(), lambda val: val.update(values), expire=expire)
+
+    async def set_remove(self, key: Key, *values: str):
+        self._modify(key, set(), lambda val: val.difference_update(values))
+
+    async def set_pop(self, key: Key, count: int = 100) -> Iterable[str]:
+        def _pop(values: set) -> list[str]:
+            return [values.pop() for _ in range(min(count, len(values)))]
+
+        return self._modify(key, set(), _pop)
+
+
+def _attach_segment(name: str, size: int, create: bool) -> shared_memory.SharedMemory:
+    # the segment should live while any process uses it, so it is not tracked (unlinked on a process exit)
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+from abc import ABCMeta, abstractmethod
+from typing import Any, Awaitable, Callable, Generic, Hashable, Sequence, TypeVar
+
+from ._typing import Key
+
+__all__ = ("GetBatcher", "AutoPipeline")
+
+_PipelineCommand = tuple[str, tuple, dict]
+_K = TypeVar("_K", bound=Hashable)
+
+
+class _Batch(Generic[_K]):
+    __slots__ = ("loop", "waiters", "payloads", "handle")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.waiters: dict[_K, list[asyncio.Future]] = {}
+        self.payloads: dict[_K, Any] = {}
+        self.handle: asyncio.Handle | None = None
+
+    def set_exception(self, exc: Exception) -> None:
+        for futures in self.waiters.values():
+            for future in futures:
+                if not future.done():  # a waiter was cancelled
+                    future.set_exception(exc)
+
+    def cancel(self) -> None:
+        for futures in self.waiters.values():
+            for future in futures:
+                future.cancel()
+
+
+class _TickBatcher(Generic[_K], metaclass=ABCMeta):
+    """
+    Collect calls issued in the same loop tick (or within a delay) into a batch executed at once
+    """
+
+    def __init__(self, max_size: int = 100, delay: float = 0) -> None:
+        if max_size < 1:
+            raise ValueError("max_size should be positive")
+        self._max_size = max_size
+        self._delay = delay
+        self._batch: _Batch[_K] | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+
+    async def _add(self, key: _K, payload: Any = None) -> Any:
+        loop = asyncio.get_running_loop()
+        batch = self._batch
+        if batch is None or batch.loop is not loop:
+            batch = self._batch = _Batch(loop)
+            if self._delay:
+                batch.handle = loop.call_later(self._delay, self._flush, batch)
+            else:
+                batch.handle = loop.call_soon(self._flush, batch)
+        waiter = loop.create_future()
+        batch.waiters.setdefault(key, []).append(waiter)
+        batch.payloads[key] = payload
+        if len(batch.waiters) >= self._max_size:
+            self._flush(batch)
+        return await waiter
+
+    def _flush(self, batch: _Batch[_K]) -> None:
+        if self._batch is batch:
+            self._batch = None
+        if batch.handle is not None:
+            batch.handle.cancel()
+            batch.handle = None
+        if not batch.waiters:
+            return
+        self.batches += 1
+        task = batch.loop.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: _Batch[_K]) -> None:
+        try:
+            await self._execute(batch)
+        except asyncio.CancelledError:
+            batch.cancel()
+            raise
+        except Exception as exc:
+            batch.set_exception(exc)
+
+    @abstractmethod
+    async def _execute(self, batch: _Batch[_K]) -> None:
+        """
+        Execute a batch and set results or an exception of its waiters
+        """
+        ...
+
+
+class GetBatcher(_TickBatcher[Key]):
+    """
+    Auto batching (DataLoader): gets of single keys issued in the same loop tick (or within a delay)
+    are merged into one call of a bulk get with unique keys, every waiter gets a value of its key
+    A batch is flushed early when it reaches the max size
+    Counters: `batches` - number of bulk calls, `gets` - number of batched gets
+    """
+
+    def __init__(
+        self,
+        get_many: Callable[[Sequence[Key]], Awaitable[Sequence[Any] | None]],
+        max_size: int = 100,
+        delay: float = 0,
+    ) -> None:
+        """
+        :param get_many: bulk get of keys, returns values in order of keys or None for all missed
+        :param max_size: max number of unique keys in a batch
+        :param delay: duration in seconds to collect a batch, 0 - flush on the next loop iteration
+        """
+        super().__init__(max_size=max_size, delay=delay)
+        self._get_many = get_many
+        self.gets = 0
+
+    async def get(self, key: Key) -> Any:
+        self.gets += 1
+        return await self._add(key)
+
+    async def _execute(self, batch: _Batch[Key]) -> None:
+        keys = list(batch.waiters)
+        values = await self._get_many(keys)
+        if values is None:
+            values = [None] * len(keys)
+        for key, value in zip(keys, values):
+            for future in batch.waiters[key]:
+                if not future.done():
+                    future.set_result(value)
+
+
+class AutoPipeline(_TickBatcher[int]):
+    """
+    Auto pipelining: commands issued in the same loop tick are executed with one pipeline,
+    every waiter gets a result of its command or an exception of it
+    A pipeline is flushed early when it reaches the max size
+    Counters: `batches` - number of executed pipelines, `commands` - number of pipelined commands
+    """
+
+    def __init__(
+        self,
+        execute_many: Callable[[Sequence[_PipelineCommand]], Awaitable[Sequence[Any]]],
+        max_size: int = 100,
+    ) -> None:
+        """
+        :param execute_many: execute (command, args, kwargs) in a pipeline, returns results or exceptions in order
+        :param max_size: max number of commands in a pipeline
+        """
+        super().__init__(max_size=max_size)
+        self._execute_many = execute_many
+        self.commands = 0
+
+    async def execute(self, command: str, *args: Any, **kwargs: Any) -> Any:
+        self.commands += 1
+        return await self._add(self.commands, (command, args, kwargs))
+
+    async def _execute(self, batch: _Batch[int]) -> None:
+        indexes = list(batch.waiters)
+        results = await self._execute_many([batch.payloads[index] for index in indexes])
+        for index, result in zip(indexes, results):
+            for future in batch.waiters[index]:
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
@@ -2,6 +2,9 @@ from enum import Enum
 
 
 class Command(Enum):
+    # members are singletons compared by identity: identity hash is much cheaper than Enum.__hash__
+    __hash__ = object.__hash__
+
     GET = "get"
     GET_MANY = "get_many"
     GET_RAW = "get_raw"
@@ -33,6 +36,7 @@ class Command(Enum):
     SET_ADD = "set_add"
     SET_REMOVE = "set_remove"
     SET_POP = "set_pop"
+    SET_POP_DELETE = "set_pop_delete"
 
     PING = "ping"
     GET_SIZE = "get_size"
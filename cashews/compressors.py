@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import bz2
+import lzma
+import zlib
+from abc import ABCMeta, abstractmethod
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from .exceptions import UnsupportedCompressorError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .backends.interface import Backend
+
+_ZSTD = True
+try:
+    import zstandard
+except ImportError:
+    _ZSTD = False
+    zstandard = None  # type: ignore[assignment]
+
+_LZ4 = True
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    _LZ4 = False
+    lz4_frame = None
+
+# a compressed value: header byte, compressor id byte, compressed payload
+# pickled, json and custom type values never start with a zero byte, so compressed and plain values coexist
+HEADER = b"\x00"
+
+
+class Compressor(metaclass=ABCMeta):
+    id = 0
+    Error: tuple = ()
+
+    @staticmethod
+    @abstractmethod
+    def compress(value: bytes) -> bytes: ...
+
+    @staticmethod
+    @abstractmethod
+    def decompress(value: bytes) -> bytes: ...
+
+
+class ZlibCompressor(Compressor):
+    id = 1
+    Error = (zlib.error,)
+
+    @staticmethod
+    def compress(value: bytes) -> bytes:
+        return zlib.compress(value)
+
+    @staticmethod
+    def decompress(value: bytes) -> bytes:
+        return zlib.decompress(value)
+
+
+class LzmaCompressor(Compressor):
+    id = 2
+    Error = (lzma.LZMAError,)
+
+    @staticmethod
+    def compress(value: bytes) -> bytes:
+        return lzma.compress(value)
+
+    @staticmethod
+    def decompress(value: bytes) -> bytes:
+        return lzma.decompress(value)
+
+
+class Bz2Compressor(Compressor):
+    id = 3
+    Error = (OSError, ValueError)
+
+    @staticmethod
+    def compress(value: bytes) -> bytes:
+        return bz2.compress(value)
+
+    @staticmethod
+    def decompress(value: bytes) -> bytes:
+        return bz2.decompress(value)
+
+
+class ZstdCompressor(Compressor):
+    id = 4
+    Error = (zstandard.ZstdError,) if _ZSTD else ()
+
+    @staticmethod
+    def compress(value: bytes) -> bytes:
+        return zstandard.compress(value)
+
+    @staticmethod
+    def decompress(value: bytes) -> bytes:
+        return zstandard.decompress(value)
+
+
+class Lz4Compressor(Compressor):
+    id = 5
+    Error = (RuntimeError,)
+
+    @staticmethod
+    def compress(value: bytes) -> bytes:
+        return lz4_frame.compress(value)
+
+    @staticmethod
+    def decompress(value: bytes) -> bytes:
+        return lz4_frame.decompress(value)
+
+
+class CompressorType(Enum):
+    ZLIB = "zlib"
+    LZMA = "lzma"
+    BZ2 = "bz2"
+    ZSTD = "zstd"
+    LZ4 = "lz4"
+
+
+_compressors = {
+    CompressorType.ZLIB: ZlibCompressor,
+    CompressorType.LZMA: LzmaCompressor,
+    CompressorType.BZ2: Bz2Compressor,
+    CompressorType.ZSTD: ZstdCompressor,
+    CompressorType.LZ4: Lz4Compressor,
+}
+_compressor_types_by_id = {compressor.id: compressor_type for compressor_type, compressor in _compressors.items()}
+
+
+class DecompressError(Exception):
+    pass
+
+
+def get_compressor(compressor_type: CompressorType):
+    if compressor_type not in _compressors:
+        raise UnsupportedCompressorError()
+
+    if compressor_type == CompressorType.ZSTD and not _ZSTD:
+        raise UnsupportedCompressorError()
+
+    if compressor_type == CompressorType.LZ4 and not _LZ4:
+        raise UnsupportedCompressorError()
+
+    return _compressors[compressor_type]
+
+
+def compress(compressor: Compressor, value: bytes) -> bytes:
+    return HEADER + bytes((compressor.id,)) + compressor.compress(value)
+
+
+def is_compressed(value: bytes) -> bool:
+    return value[:1] == HEADER
+
+
+def decompress(value: bytes) -> bytes:
+    """
+    Decompress a value with a compressor from its header,
+    raise DecompressError for a broken value or an unknown or not installed compressor
+    """
+    if len(value) < 2 or value[1] not in _compressor_types_by_id:
+        raise DecompressError()
+    try:
+        compressor = get_compressor(_compressor_types_by_id[value[1]])
+    except UnsupportedCompressorError as exc:
+        raise DecompressError() from exc
+    try:
+        return compressor.decompress(value[2:])
+    except compressor.Error as exc:
+        raise DecompressError() from exc
+
+
+class MissingDictionaryError(Exception):
+    def __init__(self, dict_id: int):
+        super().__init__(f"compression dictionary {dict_id} is not loaded")
+        self.dict_id = dict_id
+
+
+# compressor ids of values compressed with a dictionary, the header has an id of the dictionary after it
+_DICT_COMPRESSOR_IDS = {CompressorType.ZLIB: 6, CompressorType.ZSTD: 7}
+_DICT_ID_SIZE = 4
+
+
+class CompressionDictionaries:
+    """
+    Compression of small similar values with a shared dictionary (zlib zdict or zstd dictionary):
+    the dictionary is trained from first `samples` values and stored in the cache itself,
+    a header of a compressed value has an id of its dictionary, so values compressed with dictionaries
+    of other processes (or of previous runs) are decompressed with dictionaries loaded from the cache
+    """
+
+    key_prefix = "_compress_dict:"
+
+    def __init__(self, samples: int = 1000, size: int = 16 * 1024):
+        self._samples_count = samples
+        self._size = size
+        self._compressor_type: CompressorType | None = None
+        self._samples: list[bytes] = []
+        self._current: int | None = None
+        self._compressed = 0  # values compressed with the current dictionary since it was stored
+        self._dicts: dict[int, bytes] = {}
+        self._zstd_compressors: dict[int, tuple] = {}
+
+    def enable_training(self, compressor_type: CompressorType) -> None:
+        if compressor_type not in _DICT_COMPRESSOR_IDS:
+            raise UnsupportedCompressorError(f"{compressor_type.value} doesn't support dictionaries")
+        get_compressor(compressor_type)
+        self._compressor_type = compressor_type
+
+    @property
+    def training(self) -> bool:
+        return self._compressor_type is not None
+
+    @staticmethod
+    def is_dict_compressed(value: bytes) -> bool:
+        return len(value) > 1 + _DICT_ID_SIZE and value[1] in _DICT_COMPRESSOR_IDS.values()
+
+    async def compress(self, backend: Backend, value: bytes) -> bytes | None:
+        """
+        Compress a value with the current dictionary, None if the dictionary is not trained yet
+        """
+        if self._current is None:
+            if len(value) <= self._size:
+                self._samples.append(value)
+            if len(self._samples) < self._samples_count:
+                return None
+            await self._train(backend)
+        dict_id, compressor_type = self._current, self._compressor_type
+        assert dict_id is not None and compressor_type is not None
+        self._compressed += 1
+        if self._compressed >= self._samples_count:
+            # the dictionary is stored again: other processes can't decompress values without it after a clear
+            await self._store(backend, dict_id)
+        compressor_id = _DICT_COMPRESSOR_IDS[compressor_type]
+        header = HEADER + bytes((compressor_id,)) + dict_id.to_bytes(_DICT_ID_SIZE, "big")
+        if compressor_type is CompressorType.ZSTD:
+            compressor, _ = self._get_zstd(dict_id)
+            return header + compressor.compress(value)
+        compressobj = zlib.compressobj(zdict=self._dicts[dict_id])
+        return header + compressobj.compress(value) + compressobj.flush()
+
+    def decompress(self, value: bytes) -> bytes:
+        """
+        Decompress a value with a dictionary from its header,
+        raise MissingDictionaryError if the dictionary should be loaded from the cache
+        """
+        dict_id = int.from_bytes(value[2 : 2 + _DICT_ID_SIZE], "big")
+        if dict_id not in self._dicts:
+            raise MissingDictionaryError(dict_id)
+        payload = value[2 + _DICT_ID_SIZE :]
+        try:
+            if value[1] == _DICT_COMPRESSOR_IDS[CompressorType.ZSTD]:
+                _, decompressor = self._get_zstd(dict_id)
+                return decompressor.decompress(payload)
+            decompressobj = zlib.decompressobj(zdict=self._dicts[dict_id])
+            result = decompressobj.decompress(payload)
+        except (*ZlibCompressor.Error, *ZstdCompressor.Error, UnsupportedCompressorError) as exc:
+            raise DecompressError() from exc
+        if not decompressobj.eof:
+            raise DecompressError()
+        return result
+
+    async def load(self, backend: Backend, dict_id: int) -> bool:
+        zdict = await backend.get_raw(self.key_prefix + str(dict_id))
+        if not isinstance(zdict, bytes) or _dict_id(zdict) != dict_id:
+            return False
+        self._dicts[dict_id] = zdict
+        return True
+
+    async def _train(self, backend: Backend) -> None:
+        if self._compressor_type is CompressorType.ZSTD:
+            zdict = _train_zstd(self._samples, self._size)
+        else:
+            # zlib has no training: the end of a window is the cheapest to reference, so the latest samples go there
+            zdict = b"".join(self._samples)[-self._size :]
+        self._samples = []
+        dict_id = _dict_id(zdict)
+        self._dicts[dict_id] = zdict
+        await self._store(backend, dict_id)
+        self._current = dict_id
+
+    async def _store(self, backend: Backend, dict_id: int) -> None:
+        await backend.set_raw(self.key_prefix + str(dict_id), self._dicts[dict_id])
+        self._compressed = 0
+
+    def _get_zstd(self, dict_id: int) -> tuple:
+        if not _ZSTD:
+            raise UnsupportedCompressorError()
+        if dict_id not in self._zstd_compressors:
+            zdict = zstandard.ZstdCompressionDict(self._dicts[dict_id])
+            self._zstd_compressors[dict_id] = (
+                zstandard.ZstdCompressor(dict_data=zdict),
+                zstandard.ZstdDecompressor(dict_data=zdict),
+            )
+        return self._zstd_compressors[dict_id]
+
+
+def _dict_id(zdict: bytes) -> int:
+    return zlib.crc32(zdict)
+
+
+def _train_zstd(samples: list[bytes], size: int) -> bytes:
+    try:
+        return zstandard.train_dictionary(size, list(samples)).as_bytes()
+    except zstandard.ZstdError:  # too few or too small samples to train: the raw content is a dictionary too
+        return b"".join(samples)[-size:]
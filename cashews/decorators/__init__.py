@@ -1,6 +1,7 @@
 from cashews.cache_condition import NOT_NONE
 
 from .bloom import bloom, dual_bloom
+from .cache.batch import batch
 from .cache.defaults import CacheDetect, context_cache_detect
 from .cache.early import early
 from .cache.fail import failover, fast_condition
@@ -15,6 +16,7 @@ from .rate_slide import slice_rate_limit
 
 __all__ = [
     "NOT_NONE",
+    "batch",
     "bloom",
     "dual_bloom",
     "CacheDetect",
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from functools import wraps
+from typing import TYPE_CHECKING, Callable, Mapping
+
+from cashews.key import _get_func_signature, get_cache_key, get_cache_key_template, get_call_values
+from cashews.ttl import ttl_to_seconds
+
+from ._exception import RaiseException, return_or_raise
+from .defaults import _empty, context_cache_detect
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cashews import Cache
+    from cashews._typing import TTL, CallableCacheCondition, DecoratedFunc, KeyOrTemplate
+
+__all__ = ("batch",)
+
+
+def batch(
+    backend: Cache,
+    ttl: TTL,
+    items: str,
+    key: KeyOrTemplate | None = None,
+    condition: CallableCacheCondition = lambda *args, **kwargs: True,
+    prefix: str = "",
+) -> Callable[[DecoratedFunc], DecoratedFunc]:
+    """
+    Cache strategy for bulk functions: a result is cached per item of a collection argument.
+    Cached items are got with one get_many, the function is called only with missed items
+    and results are stored with one set_many.
+    The function should return a mapping of items to results (items without result are not cached),
+    the decorated function returns a dict of results for found items
+    :param backend: cache backend
+    :param ttl: duration in seconds to store a result or a callable
+    :param items: name of the collection argument
+    :param key: custom cache key of an item, the items argument alias is a single item (e.g. "user:{ids}")
+    :param condition: callable object that determines whether the result of an item will be saved or not
+    :param prefix: custom prefix for key
+    """
+
+    ttl = ttl_to_seconds(ttl)
+
+    def _decor(func: DecoratedFunc) -> DecoratedFunc:
+        signature = _get_func_signature(func)
+        if items not in signature.parameters:
+            raise ValueError(f"{func.__name__} has no argument {items}")
+        _key_template = get_cache_key_template(func, key=key, prefix=prefix)
+
+        @wraps(func)
+        async def _wrap(*args, **kwargs):
+            call_values = get_call_values(func, args, kwargs)
+            _items = list(call_values[items])
+            keys = {item: get_cache_key(func, _key_template, kwargs={**call_values, items: item}) for item in _items}
+            _ttl = ttl_to_seconds(ttl, *args, **kwargs, with_callable=True)
+
+            results = {}
+            missed = []
+            cached_values = await backend.get_many(*keys.values(), default=_empty) if keys else ()
+            for item, cached in zip(keys, cached_values):
+                if cached is _empty:
+                    missed.append(item)
+                    continue
+                context_cache_detect._set(
+                    keys[item],
+                    ttl=_ttl,
+                    name="batch",
+                    template=_key_template,
+                    value=cached,
+                )
+                results[item] = return_or_raise(cached)
+            if not missed:
+                return results
+
+            bound = signature.bind(*args, **kwargs)
+            bound.arguments[items] = missed
+            result = await func(*bound.args, **bound.kwargs)
+            if not isinstance(result, Mapping):
+                raise TypeError(f"{func.__name__} should return a mapping of items to results to be cached per item")
+
+            to_cache = {}
+            for item, value in result.items():
+                if item not in keys:
+                    continue
+                cond_result = condition(value, args, kwargs, key=keys[item])
+                if isinstance(cond_result, bool) and cond_result and not isinstance(value, Exception):
+                    to_cache[keys[item]] = value
+                elif isinstance(cond_result, Exception):
+                    to_cache[keys[item]] = RaiseException(value)
+            if to_cache:
+                await backend.set_many(to_cache, expire=_ttl)
+            results.update(result)
+            return {item: results[item] for item in keys if item in results}
+
+        return _wrap  # type: ignore[return-value]
+
+    return _decor
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
+import random
+import time
 from datetime import datetime, timedelta, timezone
 from functools import wraps
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 from cashews.key import get_cache_key, get_cache_key_template
 from cashews.ttl import ttl_to_seconds
@@ -31,11 +34,16 @@ def early(
     prefix: str = "early",
     tags: Tags = (),
     background: bool = True,
+    xfetch: bool = False,
+    beta: float = 1.0,
 ) -> Callable[[DecoratedFunc], DecoratedFunc]:
     """
     Cache strategy that try to solve Cache stampede problem (https://en.wikipedia.org/wiki/Cache_stampede),
     With hot cache recalculate a result near expiration time
     Warning Not good at cold cache
+    In xfetch mode (probabilistic early expiration) a duration of a call is stored with a result and every read
+    decides to recalculate with a probability growing to the expiration time and the duration of the call,
+    so recalculations are spread across processes without a lock
 
     :param backend: cache backend
     :param ttl: duration in seconds to store a result
@@ -44,7 +52,9 @@ def early(
     :param condition: callable object that determines whether the result will be saved or not
     :param prefix: custom prefix for key, default 'early'
     :param tags: aliases for keys that used for cache (used for invalidation)
-    :param background: if true will run recalculation in background
+    :param background: if true will run recalculation in background (by the cache refresh scheduler)
+    :param xfetch: if true use probabilistic early expiration instead of early_ttl
+    :param beta: xfetch factor, greater than 1 favors earlier recalculation
     """
 
     background_tasks = set()
@@ -52,7 +62,7 @@ def early(
     early_ttl = ttl_to_seconds(early_ttl)
 
     def _decor(func: DecoratedFunc) -> DecoratedFunc:
-        _key_template = get_cache_key_template(func, key=key, prefix=prefix + ":v2")
+        _key_template = get_cache_key_template(func, key=key, prefix=prefix + (":xfetch" if xfetch else ":v2"))
         for tag in tags:
             backend.register_tag(tag, _key_template)
 
@@ -79,33 +89,58 @@ def early(
             ]
             cached = await backend.get(_cache_key, default=_empty)
             if cached is _empty:
-                return await _get_result_for_early(*args_to_call)
-
-            early_expire_at, result = cached
-            context_cache_detect._set(
-                _cache_key,
-                ttl=_ttl,
-                early_ttl=_early_ttl,
-                name="early",
-                template=_key_template,
-                value=result,
-                early_expire_at=early_expire_at,
-            )
-            if early_expire_at >= datetime.now(timezone.utc):
-                return return_or_raise(result)
-            lock_key = _cache_key + _LOCK_SUFFIX
-            if not await backend.set(lock_key, "1", expire=_early_ttl, exist=False):
+                return await _get_result_for_early(*args_to_call, xfetch=xfetch)
+
+            if xfetch:
+                expire_at, delta, result = cached
+                context_cache_detect._set(
+                    _cache_key,
+                    ttl=_ttl,
+                    name="early",
+                    template=_key_template,
+                    value=result,
+                    expire_at=expire_at,
+                    delta=delta,
+                )
+                if not _xfetch_expired(expire_at, delta, beta):
+                    return return_or_raise(result)
+                # a recalculation is decided locally and deduplicated by the refresh scheduler
+                unlock = False
+            else:
+                early_expire_at, result = cached
+                context_cache_detect._set(
+                    _cache_key,
+                    ttl=_ttl,
+                    early_ttl=_early_ttl,
+                    name="early",
+                    template=_key_template,
+                    value=result,
+                    early_expire_at=early_expire_at,
+                )
+                if early_expire_at >= datetime.now(timezone.utc):
+                    return return_or_raise(result)
+                if background and _cache_key in backend.refresher:
+                    return return_or_raise(result)
+                lock_key = _cache_key + _LOCK_SUFFIX
+                if not await backend.set(lock_key, "1", expire=_early_ttl, exist=False):
+                    return return_or_raise(result)
+                logger.info(
+                    "Recalculate cache for %s (exp_at %s)",
+                    _cache_key,
+                    early_expire_at,
+                )
+                unlock = True
+            if background:
+                scheduled = backend.refresher.schedule(
+                    _cache_key, _get_result_for_early, *args_to_call, unlock=unlock, xfetch=xfetch
+                )
+                if not scheduled and unlock:
+                    await backend.delete(_cache_key + _LOCK_SUFFIX)
                 return return_or_raise(result)
-            logger.info(
-                "Recalculate cache for %s (exp_at %s)",
-                _cache_key,
-                early_expire_at,
-            )
-            task = asyncio.create_task(_get_result_for_early(*args_to_call, unlock=True))
+            task = asyncio.create_task(_get_result_for_early(*args_to_call, unlock=unlock, xfetch=xfetch))
             background_tasks.add(task)
             task.add_done_callback(background_tasks.discard)
-            if not background:
-                await task
+            await task
             return return_or_raise(result)
 
         return _wrap  # type: ignore[return-value]
@@ -124,23 +159,33 @@ async def _get_result_for_early(
     condition,
     tags,
     unlock=False,
+    xfetch=False,
 ):
     try:
         _exc = None
+        start = time.monotonic()
         try:
             result = await func(*args, **kwargs)
         except Exception as exc:
             _exc = exc
             result = exc
         cond_result = condition(result, args, kwargs, key=key)
-        early_expire_at = datetime.now(timezone.utc) + timedelta(seconds=early_ttl)
+        if xfetch:
+            header: list[Any] = [time.time() + ttl, time.monotonic() - start]
+        else:
+            header = [datetime.now(timezone.utc) + timedelta(seconds=early_ttl)]
         if isinstance(cond_result, bool) and cond_result and not isinstance(result, Exception):
-            await backend.set(key, [early_expire_at, result], expire=ttl, tags=tags)
+            await backend.set(key, [*header, result], expire=ttl, tags=tags)
         elif isinstance(cond_result, Exception):
-            await backend.set(key, [early_expire_at, RaiseException(result)], expire=ttl, tags=tags)
+            await backend.set(key, [*header, RaiseException(result)], expire=ttl, tags=tags)
         if _exc:
             raise _exc
         return return_or_raise(result)
     finally:
         if unlock:
             asyncio.create_task(backend.delete(key + _LOCK_SUFFIX))
+
+
+def _xfetch_expired(expire_at: float, delta: float, beta: float) -> bool:
+    # XFetch: recalculate at now - delta * beta * ln(rand) >= expiry, rand in (0, 1]
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expire_at
@@ -38,7 +38,7 @@ def hit(
     :param condition: callable object that determines whether the result will be saved or not
     :param prefix: custom prefix for key, default 'hit'
     :param tags: aliases for keys that used for cache (used for invalidation)
-    :param background: if true will run recalculation in background
+    :param background: if true will run recalculation in background (by the cache refresh scheduler)
     """
     ttl = ttl_to_seconds(ttl)
     background_tasks = set()
@@ -72,10 +72,12 @@ def hit(
                     value=cached,
                 )
                 if update_after and hits == update_after:
-                    task = asyncio.create_task(_get_and_save(*call_args))
-                    background_tasks.add(task)
-                    task.add_done_callback(background_tasks.discard)
-                    if not background:
+                    if background:
+                        backend.refresher.schedule(_cache_key, _get_and_save, *call_args)
+                    else:
+                        task = asyncio.create_task(_get_and_save(*call_args))
+                        background_tasks.add(task)
+                        task.add_done_callback(background_tasks.discard)
                         await task
                 return return_or_raise(cached)
             return await _get_and_save(*call_args)
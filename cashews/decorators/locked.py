@@ -1,16 +1,16 @@
 from __future__ import annotations
 
-import asyncio
 import inspect
-from functools import partial, wraps
+from functools import wraps
 from typing import TYPE_CHECKING, Callable
 
 from cashews.backends.interface import _BackendInterface
 from cashews.key import get_cache_key, get_cache_key_template
+from cashews.singleflight import SingleFlight
 from cashews.ttl import ttl_to_seconds
 
 if TYPE_CHECKING:  # pragma: no cover
-    from cashews._typing import TTL, DecoratedFunc, Key, KeyOrTemplate
+    from cashews._typing import TTL, DecoratedFunc, KeyOrTemplate
 
 __all__ = ("locked",)
 
@@ -83,23 +83,15 @@ def _asyncgen_lock(
 def thunder_protection(
     key: KeyOrTemplate | None = None,
 ) -> Callable[[DecoratedFunc], DecoratedFunc]:
-    tasks: dict[str, asyncio.Task] = {}
+    singleflight = SingleFlight()
 
     def _decor(func: DecoratedFunc) -> DecoratedFunc:
         _key_template = get_cache_key_template(func, key=key)
 
-        def done_callback(_key: Key, _: asyncio.Task):
-            del tasks[_key]
-
         @wraps(func)
         async def _wrapper(*args, **kwargs):
             _key = get_cache_key(func, _key_template, args, kwargs)
-            if _key in tasks:
-                return await tasks[_key]
-            task = asyncio.create_task(func(*args, **kwargs))
-            tasks[_key] = task
-            task.add_done_callback(partial(done_callback, _key))
-            return await task
+            return await singleflight.do(_key, func, *args, **kwargs)
 
         return _wrapper  # type: ignore[return-value]
 
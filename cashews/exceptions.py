@@ -14,6 +14,10 @@ class UnsupportedPicklerError(CacheError):
     """Unknown or unsupported pickle type."""
 
 
+class UnsupportedCompressorError(CacheError):
+    """Unknown or unsupported compressor type."""
+
+
 class UnSecureDataError(CacheError):
     """Unsecure data in cache storage"""
 
@@ -33,6 +37,14 @@ class LockedError(CacheError):
     """Raised if a key already locked"""
 
 
+class AwaitRequiredError(CacheError):
+    """Raised by a nowait command if it can't be done without awaiting"""
+
+
+class ValueTooBigError(CacheError):
+    """Raised if a modified value doesn't fit a slot of the shared memory backend"""
+
+
 class CacheBackendInteractionError(CacheError):
     """Raised if redis not available and safe is set to false"""
 
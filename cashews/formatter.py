@@ -6,7 +6,7 @@ import re
 from contextlib import contextmanager
 from hashlib import md5, sha1, sha256
 from string import Formatter
-from typing import Any, Callable, Iterable, Pattern
+from typing import Any, Callable, Iterable, Pattern, Sequence
 
 from . import key_context
 from ._typing import KeyOrTemplate, KeyTemplate
@@ -148,6 +148,94 @@ class _FuncFormatter(_ReplaceFormatter):
         except (ValueError, TypeError, KeyError, AttributeError):
             return super().vformat(format_string, args, kwargs)
 
+    def compile(self, template: KeyTemplate) -> _CompiledTemplate | None:
+        """
+        Parse a template once to render it without the generic formatter
+        Return None if the template has placeholders that need it: attributes, indexes, conversions,
+        nested fields or unknown format specs
+        """
+        try:
+            parsed = list(self.parse(template))
+        except ValueError:
+            return None
+        fields: list[str] = []
+        literals: list[str] = []
+        specs: list[tuple[str, tuple[str, ...]] | None] = []
+        literal = ""
+        for text, field_name, format_spec, conversion in parsed:
+            literal += text
+            if field_name is None:
+                continue
+            if conversion or not field_name.isidentifier() or (format_spec and "{" in format_spec):
+                return None
+            spec = None
+            if format_spec:
+                alias, spec_args = self.parse_format_spec(format_spec)
+                if alias not in self._functions or _is_str_format_spec(format_spec):
+                    return None
+                spec = (alias, tuple(spec_args))
+            fields.append(field_name)
+            literals.append(literal)
+            specs.append(spec)
+            literal = ""
+        return _CompiledTemplate(self, tuple(fields), literals, specs, tail=literal)
+
+
+def _is_str_format_spec(format_spec: str) -> bool:
+    # such spec is applied to a value by str.format instead of a registered function
+    try:
+        format("", format_spec)
+    except ValueError:
+        return False
+    return True
+
+
+class _CompiledTemplate:
+    __slots__ = ("fields", "_formatter", "_literals", "_specs", "_tail", "_with_functions")
+
+    def __init__(
+        self,
+        formatter: _FuncFormatter,
+        fields: tuple[str, ...],
+        literals: list[str],
+        specs: list[tuple[str, tuple[str, ...]] | None],
+        tail: str,
+    ) -> None:
+        self.fields = fields
+        self._formatter = formatter
+        self._literals = literals
+        self._specs = specs
+        self._tail = tail
+        self._with_functions = any(specs)
+
+    def render(self, values: Sequence[Any]) -> TemplateValue | None:
+        """
+        Render the template with values of fields (in order of fields)
+        Return None if the result may differ from the generic formatter one, so it should be used instead
+        """
+        formatter = self._formatter
+        chunks = []
+        if not self._with_functions:
+            # str.format path of the formatter, it renders None as "None" but falls back on any error
+            for literal, value in zip(self._literals, values):
+                if value is None:
+                    return None
+                chunks.append(literal)
+                chunks.append(str(formatter._type_format(value)))
+        else:
+            for literal, value, spec in zip(self._literals, values, self._specs):
+                chunks.append(literal)
+                if spec is None:
+                    chunks.append(formatter._format_field(value))
+                    continue
+                alias, args = spec
+                func, preformat = formatter._functions[alias]
+                if preformat:
+                    value = formatter._format_field(value)
+                chunks.append(func(value, *args))
+        chunks.append(self._tail)
+        return "".join(chunks)
+
 
 default_formatter = _FuncFormatter(lambda name: "")
 
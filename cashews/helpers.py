@@ -1,57 +1,84 @@
 from __future__ import annotations
 
-from ._typing import AsyncCallable_T, Middleware, Result_T
+from typing import Any
+
+from ._typing import AsyncCallable_T, Callable_T, Middleware, Result_T
 from .backends.interface import Backend
 from .commands import PATTERN_CMDS, Command
 from .utils import get_obj_size
 
 
 def add_prefix(prefix: str) -> Middleware:
-    async def _middleware(call: AsyncCallable_T, cmd: Command, backend: Backend, *args, **kwargs) -> Result_T:
+    def _prefixed(cmd: Command, args: tuple, kwargs: dict[str, Any]) -> tuple[tuple, dict[str, Any]]:
         if cmd in (Command.GET_MANY, Command.DELETE_MANY):
-            return await call(*[prefix + key for key in args])
+            return tuple(prefix + key for key in args), {}
         if cmd == Command.SET_MANY:
             kwargs["pairs"] = {prefix + key: value for key, value in kwargs["pairs"].items()}
-            return await call(**kwargs)
+            return (), kwargs
+        if cmd == Command.SET and kwargs.get("tags"):
+            kwargs["tags"] = [prefix + tag for tag in kwargs["tags"]]
+        if cmd == Command.SET_POP_DELETE:
+            kwargs["prefix"] = prefix + kwargs.get("prefix", "")
 
         as_key = "pattern" if cmd in PATTERN_CMDS else "key"
         key = kwargs.get(as_key)
         if key:
             kwargs[as_key] = prefix + key
-            return await call(**kwargs)
+            return (), kwargs
         if args:
             key = args[0].lower()
-            return await call(key, *args[1:], **kwargs)
-        return await call(**kwargs)
+            return (key, *args[1:]), kwargs
+        return (), kwargs
+
+    async def _middleware(call: AsyncCallable_T, cmd: Command, backend: Backend, *args, **kwargs) -> Result_T:
+        args, kwargs = _prefixed(cmd, args, kwargs)
+        return await call(*args, **kwargs)
+
+    def _middleware_nowait(call: Callable_T[Result_T], cmd: Command, backend: Backend, *args, **kwargs) -> Result_T:
+        args, kwargs = _prefixed(cmd, args, kwargs)
+        return call(*args, **kwargs)
 
+    _middleware.nowait = _middleware_nowait  # type: ignore[attr-defined]
     return _middleware
 
 
 def all_keys_lower() -> Middleware:
-    async def _middleware(call: AsyncCallable_T, cmd: Command, backend: Backend, *args, **kwargs) -> Result_T:
+    def _lowered(cmd: Command, args: tuple, kwargs: dict[str, Any]) -> tuple[tuple, dict[str, Any]]:
         if cmd in (Command.GET_MANY, Command.DELETE_MANY):
-            return await call(*[key.lower() for key in args])
+            return tuple(key.lower() for key in args), {}
 
         if cmd == Command.SET_MANY:
             kwargs["pairs"] = {key.lower(): value for key, value in kwargs["pairs"].items()}
-            return await call(**kwargs)
+            return (), kwargs
+        if cmd == Command.SET and kwargs.get("tags"):
+            kwargs["tags"] = [tag.lower() for tag in kwargs["tags"]]
+            kwargs["tagged_key"] = kwargs["tagged_key"].lower()
 
         as_key = "pattern" if cmd in PATTERN_CMDS else "key"
 
         key = kwargs.get(as_key)
         if key:
             kwargs[as_key] = key.lower()
-            return await call(**kwargs)
+            return (), kwargs
         if args:
             key = args[0].lower()
-            return await call(key, *args[1:], **kwargs)
-        return await call(**kwargs)
+            return (key, *args[1:]), kwargs
+        return (), kwargs
 
+    async def _middleware(call: AsyncCallable_T, cmd: Command, backend: Backend, *args, **kwargs) -> Result_T:
+        args, kwargs = _lowered(cmd, args, kwargs)
+        return await call(*args, **kwargs)
+
+    def _middleware_nowait(call: Callable_T[Result_T], cmd: Command, backend: Backend, *args, **kwargs) -> Result_T:
+        args, kwargs = _lowered(cmd, args, kwargs)
+        return call(*args, **kwargs)
+
+    _middleware.nowait = _middleware_nowait  # type: ignore[attr-defined]
     return _middleware
 
 
 def memory_limit(min_bytes: int = 0, max_bytes: int | None = None) -> Middleware:
-    async def _middleware(call: AsyncCallable_T, cmd: Command, backend: Backend, *args, **kwargs) -> Result_T | None:
+    def _allowed(cmd: Command, kwargs: dict[str, Any]) -> bool:
         if cmd == Command.SET_MANY:
             pairs = {}
             for key, value in kwargs["pairs"].items():
@@ -60,12 +87,25 @@ def memory_limit(min_bytes: int = 0, max_bytes: int | None = None) -> Middleware
                     continue
                 pairs[key] = value
             if not pairs:
-                return None
+                return False
             kwargs["pairs"] = pairs
         elif cmd == Command.SET:
             value_size = get_obj_size(kwargs["value"])
             if max_bytes and value_size > max_bytes or value_size < min_bytes:
-                return None
+                return False
+        return True
+
+    async def _middleware(call: AsyncCallable_T, cmd: Command, backend: Backend, *args, **kwargs) -> Result_T | None:
+        if not _allowed(cmd, kwargs):
+            return None
         return await call(*args, **kwargs)
 
+    def _middleware_nowait(
+        call: Callable_T[Result_T], cmd: Command, backend: Backend, *args, **kwargs
+    ) -> Result_T | None:
+        if not _allowed(cmd, kwargs):
+            return None
+        return call(*args, **kwargs)
+
+    _middleware.nowait = _middleware_nowait  # type: ignore[attr-defined]
     return _middleware
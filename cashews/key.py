@@ -4,6 +4,7 @@ import inspect
 from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Callable, Container, Iterable
 
+from . import key_context
 from .exceptions import WrongKeyError
 from .formatter import default_format, default_formatter
 
@@ -34,6 +35,11 @@ def get_cache_key(
     :return: cache key for call
     """
     kwargs = kwargs or {}
+    if template:
+        build_key = _get_key_builder(func, template)
+        key = build_key(args, kwargs) if build_key is not None else None
+        if key is not None:
+            return key
     if not args and template and _KWARGS not in template and _ARGS not in template:
         key_values = kwargs
     else:
@@ -167,6 +173,94 @@ def _get_call_values(func: Callable, args: Args, kwargs: Kwargs):
     return result
 
 
+@lru_cache(maxsize=10000)
+def _get_key_builder(func: Callable, template: KeyTemplate) -> Callable[[Args, Kwargs], Key | None] | None:
+    """
+    Compile a key template for a function into a key builder that takes values of call arguments by position or name
+    instead of binding them to the signature. The builder returns None if a key should be built in a generic way:
+    the call doesn't match the signature, a field value is missing or the template context rewrites values
+    Return None if the template can't be compiled
+    """
+    if _ARGS in template or _KWARGS in template:
+        return None
+    compiled = default_formatter.compile(template)
+    if compiled is None:
+        return None
+
+    try:
+        parameters = _get_func_signature(func).parameters
+    except (ValueError, TypeError):
+        return None
+    positional: list[str] = []
+    keyword: set[str] = set()
+    required: list[tuple[str, int | None, bool]] = []
+    var_args = var_kwargs = False
+    for name, parameter in parameters.items():
+        if parameter.kind == inspect.Parameter.VAR_POSITIONAL:
+            var_args = True
+            continue
+        if parameter.kind == inspect.Parameter.VAR_KEYWORD:
+            var_kwargs = True
+            continue
+        index = None
+        if parameter.kind != inspect.Parameter.KEYWORD_ONLY:
+            index = len(positional)
+            positional.append(name)
+        if parameter.kind != inspect.Parameter.POSITIONAL_ONLY:
+            keyword.add(name)
+        if parameter.default is inspect.Parameter.empty:
+            required.append((name, index, name in keyword))
+    positional_keyword = tuple(name if name in keyword else None for name in positional)
+
+    fields: list[tuple[str, int | None, Any]] = []
+    for field in compiled.fields:
+        parameter = parameters.get(field)
+        if parameter is None or parameter.kind not in (
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            inspect.Parameter.KEYWORD_ONLY,
+        ):
+            return None
+        index = positional.index(field) if field in positional else None
+        fields.append((field, index, parameter.default))
+
+    def _build_key(args: Args, kwargs: Kwargs) -> Key | None:
+        if key_context.is_rewrite():
+            return None
+        if not args:
+            # as a generic way: only passed keyword arguments without defaults
+            values = []
+            for name, _, _ in fields:
+                if name not in kwargs:
+                    return None
+                values.append(kwargs[name])
+            return compiled.render(values)
+
+        args_count = len(args)
+        if args_count > len(positional) and not var_args:
+            return None
+        if kwargs:
+            if not var_kwargs and not kwargs.keys() <= keyword:
+                return None
+            for passed_name in positional_keyword[:args_count]:
+                if passed_name is not None and passed_name in kwargs:
+                    return None
+        for name, index, by_keyword in required:
+            if not ((index is not None and index < args_count) or (by_keyword and name in kwargs)):
+                return None
+
+        values = []
+        for name, index, default in fields:
+            if index is not None and index < args_count:
+                values.append(args[index])
+            elif name in kwargs:
+                values.append(kwargs[name])
+            else:
+                values.append(default)
+        return compiled.render(values)
+
+    return _build_key
+
+
 def noself(decor_func):
     def _decor(*args, **kwargs):
         def outer(method):
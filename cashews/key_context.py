@@ -34,6 +34,10 @@ def get() -> tuple[dict[str, Any], bool]:
     return _context, _context.pop(_REWRITE)
 
 
+def is_rewrite() -> bool:
+    return _template_context.get()[_REWRITE]
+
+
 def register(*names: str) -> None:
     warnings.warn(
         "`register_key_context` deprecated and will be removed in next release, use @ notation",
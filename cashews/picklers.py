@@ -1,6 +1,13 @@
+from __future__ import annotations
+
+import dataclasses
 import json
 import pickle
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 from enum import Enum
+from typing import Any, Callable
+from uuid import UUID
 
 from ._typing import Value
 from .exceptions import UnsupportedPicklerError
@@ -19,10 +26,28 @@ except ImportError:
     _DILL_PICKLE = False
     dill = pickle
 
+_ORJSON = True
+try:
+    import orjson
+except ImportError:
+    _ORJSON = False
+    orjson = None  # type: ignore[assignment]
+
+_MSGPACK = True
+try:
+    import msgpack
+except ImportError:
+    _MSGPACK = False
+    msgpack = None
+
 
 class Pickler:
     PickleError = pickle.PickleError
-    UnpicklingError = (pickle.UnpicklingError, TypeError)
+    UnpicklingError: tuple[type[Exception], ...] = (pickle.UnpicklingError, TypeError)
+    # str, bytes, float, bool and None are stored by a serializer with a type tag instead of pickling
+    tag_primitives = True
+    # values are decoded to the same python types (json like picklers decode named tuples as lists)
+    keeps_types = True
 
     @staticmethod
     def loads(value: bytes) -> Value:
@@ -56,6 +81,8 @@ class DillPickler(Pickler):
 
 
 class NonPickler(Pickler):
+    tag_primitives = False
+
     @staticmethod
     def loads(value: bytes) -> Value:
         return value
@@ -67,6 +94,8 @@ class NonPickler(Pickler):
 
 class JsonPickler(Pickler):
     json_serial = None
+    tag_primitives = False  # values are readable by any json client
+    keeps_types = False
 
     @staticmethod
     def loads(value: bytes):
@@ -77,12 +106,131 @@ class JsonPickler(Pickler):
         return json.dumps(value, default=cls.json_serial).encode()
 
 
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError
+
+
+class OrjsonPickler(Pickler):
+    """
+    Fast json: datetime, date, time, UUID and dataclasses (without fields starting with an underscore)
+    are encoded natively, Decimal as a string and sets as lists,
+    other types can be encoded with the `json_serial` hook.
+    Like json, values are decoded as basic types
+    """
+
+    json_serial: Callable[[Any], Any] | None = None
+    UnpicklingError = (ValueError, TypeError)
+    tag_primitives = False
+    keeps_types = False
+
+    @staticmethod
+    def loads(value: bytes) -> Value:
+        return orjson.loads(value)
+
+    @classmethod
+    def dumps(cls, value: Value) -> bytes:
+        return orjson.dumps(value, default=cls._default)
+
+    @classmethod
+    def _default(cls, value: Any) -> Any:
+        try:
+            return _orjson_default(value)
+        except TypeError:
+            json_serial = cls.json_serial
+            if json_serial is None:
+                raise
+        return json_serial(value)
+
+
+_ExtEncoder = Callable[[Any], bytes]
+_ExtDecoder = Callable[[bytes], Any]
+
+
+class MsgpackPickler(Pickler):
+    """
+    Msgpack with extension types: datetime, date, time, timedelta, Decimal, UUID and sets
+    are decoded to the same types, dataclasses are encoded as dicts, tuples as lists.
+    Other types can be added with `register_type`
+    """
+
+    UnpicklingError = (ValueError, TypeError)
+    tag_primitives = False
+    keeps_types = False
+    _ext_encoders: dict[type, tuple[int, _ExtEncoder]] = {}
+    _ext_decoders: dict[int, _ExtDecoder] = {}
+
+    @classmethod
+    def register_type(cls, klass: type, code: int, encoder: _ExtEncoder, decoder: _ExtDecoder) -> None:
+        if code in cls._ext_decoders:
+            raise ValueError(f"ext type code {code} is already registered")
+        cls._ext_encoders[klass] = (code, encoder)
+        cls._ext_decoders[code] = decoder
+
+    @classmethod
+    def loads(cls, value: bytes) -> Value:
+        return msgpack.unpackb(value, ext_hook=cls._ext_hook, strict_map_key=False)
+
+    @classmethod
+    def dumps(cls, value: Value) -> bytes:
+        return msgpack.packb(value, default=cls._default)
+
+    @classmethod
+    def _default(cls, value: Any) -> Any:
+        if type(value) in cls._ext_encoders:
+            code, encoder = cls._ext_encoders[type(value)]
+            return msgpack.ExtType(code, encoder(value))
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return dataclasses.asdict(value)
+        raise TypeError(f"can not serialize {type(value).__name__!r} object")
+
+    @classmethod
+    def _ext_hook(cls, code: int, data: bytes) -> Any:
+        if code not in cls._ext_decoders:
+            return msgpack.ExtType(code, data)
+        return cls._ext_decoders[code](data)
+
+
+def _iso_encoder(value: Any) -> bytes:
+    return value.isoformat().encode()
+
+
+MsgpackPickler.register_type(datetime, 1, _iso_encoder, lambda data: datetime.fromisoformat(data.decode()))
+MsgpackPickler.register_type(date, 2, _iso_encoder, lambda data: date.fromisoformat(data.decode()))
+MsgpackPickler.register_type(time, 3, _iso_encoder, lambda data: time.fromisoformat(data.decode()))
+MsgpackPickler.register_type(
+    timedelta,
+    4,
+    lambda value: msgpack.packb((value.days, value.seconds, value.microseconds)),
+    lambda data: timedelta(*msgpack.unpackb(data)),
+)
+MsgpackPickler.register_type(Decimal, 5, lambda value: str(value).encode(), lambda data: Decimal(data.decode()))
+MsgpackPickler.register_type(UUID, 6, lambda value: value.bytes, lambda data: UUID(bytes=data))
+MsgpackPickler.register_type(
+    set,
+    7,
+    lambda value: MsgpackPickler.dumps(list(value)),
+    lambda data: set(MsgpackPickler.loads(data)),
+)
+MsgpackPickler.register_type(
+    frozenset,
+    8,
+    lambda value: MsgpackPickler.dumps(list(value)),
+    lambda data: frozenset(MsgpackPickler.loads(data)),
+)
+
+
 class PicklerType(Enum):
     DEFAULT = "default"
     NULL = "null"
     JSON = "json"
     DILL = "dill"
     SQLALCHEMY = "sqlalchemy"
+    ORJSON = "orjson"
+    MSGPACK = "msgpack"
 
 
 _picklers = {
@@ -91,6 +239,8 @@ _picklers = {
     PicklerType.DILL: DillPickler,
     PicklerType.NULL: NonPickler,
     PicklerType.JSON: JsonPickler,
+    PicklerType.ORJSON: OrjsonPickler,
+    PicklerType.MSGPACK: MsgpackPickler,
 }
 
 
@@ -104,6 +254,12 @@ def get_pickler(pickler_type: PicklerType):
     if pickler_type == PicklerType.DILL and not _DILL_PICKLE:
         raise UnsupportedPicklerError()
 
+    if pickler_type == PicklerType.ORJSON and not _ORJSON:
+        raise UnsupportedPicklerError()
+
+    if pickler_type == PicklerType.MSGPACK and not _MSGPACK:
+        raise UnsupportedPicklerError()
+
     return _picklers[pickler_type]
 
 
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ._typing import Key
+
+__all__ = ("RefreshScheduler",)
+
+logger = logging.getLogger(__name__)
+
+
+class _Refresh:
+    __slots__ = ("func", "args", "kwargs", "hits")
+
+    def __init__(self, func: Callable[..., Awaitable[Any]], args: tuple, kwargs: dict) -> None:
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.hits = 1
+
+
+class RefreshScheduler:
+    """
+    Run background refreshes of cached results with a bounded number of workers
+    A refresh of a key is scheduled once until it is done, following requests to schedule it only raise its priority.
+    Pending refreshes are run from the most requested (hot) keys, new ones are dropped if too many are pending
+    Counters: `scheduled`, `deduplicated` and `dropped` refreshes
+    """
+
+    def __init__(self, workers: int = 8, max_pending: int = 1000) -> None:
+        """
+        :param workers: max number of concurrently running refreshes
+        :param max_pending: max number of refreshes waiting for a worker
+        """
+        if workers < 1:
+            raise ValueError("workers should be positive")
+        self._max_workers = workers
+        self._max_pending = max_pending
+        self._pending: dict[Key, _Refresh] = {}
+        self._running: set[Key] = set()
+        # (-hits, order, key), a key is pushed again when its hits reach a power of 2
+        self._queue: list[tuple[int, int, Key]] = []
+        self._order = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self.scheduled = 0
+        self.deduplicated = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._pending or key in self._running
+
+    def schedule(self, key: Key, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> bool:
+        """
+        Schedule a refresh call for a key, return False if the key is already scheduled or the refresh is dropped
+        """
+        if key in self._running:
+            self.deduplicated += 1
+            return False
+        refresh = self._pending.get(key)
+        if refresh is not None:
+            self.deduplicated += 1
+            refresh.hits += 1
+            if refresh.hits & (refresh.hits - 1) == 0:
+                heapq.heappush(self._queue, (-refresh.hits, next(self._order), key))
+            # the pending refresh may be left by a cancelled worker or a worker of a closed loop
+            self._start_worker(if_idle=True)
+            return False
+        if len(self._pending) >= self._max_pending:
+            self.dropped += 1
+            return False
+        self.scheduled += 1
+        self._pending[key] = _Refresh(func, args, kwargs)
+        heapq.heappush(self._queue, (-1, next(self._order), key))
+        self._start_worker()
+        return True
+
+    def _start_worker(self, if_idle: bool = False) -> None:
+        """
+        Start a worker if there are less than max workers, with `if_idle` only if there are no workers at all
+        """
+        loop = asyncio.get_running_loop()
+        if if_idle or len(self._workers) >= self._max_workers:
+            # workers of a closed loop will never finish
+            self._workers = [worker for worker in self._workers if not worker.done() and worker.get_loop() is loop]
+        if len(self._workers) >= self._max_workers or (if_idle and self._workers):
+            return
+        worker = loop.create_task(self._work())
+        self._workers.append(worker)
+
+    async def _work(self) -> None:
+        try:
+            while self._queue:
+                _, _, key = heapq.heappop(self._queue)
+                refresh = self._pending.pop(key, None)
+                if refresh is None:  # outdated queue item
+                    continue
+                self._running.add(key)
+                try:
+                    await refresh.func(*refresh.args, **refresh.kwargs)
+                except Exception:
+                    logger.exception("Refresh of %s failed", key)
+                finally:
+                    self._running.discard(key)
+        finally:
+            task = asyncio.current_task()
+            if task in self._workers:
+                self._workers.remove(task)
+
+    async def join(self) -> None:
+        """
+        Wait for all scheduled refreshes to finish
+        """
+        while self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            # a worker cancelled before it started doesn't remove itself
+            self._workers = [worker for worker in self._workers if not worker.done()]
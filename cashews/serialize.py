@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import hashlib
 import hmac
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
-from .exceptions import SignIsMissingError, UnSecureDataError
+from . import compressors
+from .compressors import Compressor, CompressorType, get_compressor
+from .exceptions import AwaitRequiredError, SignIsMissingError, UnSecureDataError
 from .picklers import Pickler, PicklerType, get_pickler
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -30,7 +32,54 @@ def _to_bytes(value: str | bytes) -> bytes:
     return value
 
 
+_Digest = Callable[[bytes, "bytes | memoryview"], bytes]
+
+
+def _hash_digest(base) -> _Digest:
+    # a copy of a keyed hash object skips processing the secret on every call
+    def digest(key: bytes, value: bytes | memoryview) -> bytes:
+        _hash = base.copy()
+        _hash.update(key)
+        _hash.update(value)
+        return _hash.digest()
+
+    return digest
+
+
+def _sum_digest(secret: bytes) -> _Digest:
+    secret_sum = sum(secret)
+
+    def digest(key: bytes, value: bytes | memoryview) -> bytes:
+        return ((secret_sum + sum(key) + sum(value)) & 0xFFFFFFFFFFFFFFFF).to_bytes(8, "big")
+
+    return digest
+
+
+def _blake2b_key(secret: bytes) -> bytes:
+    if len(secret) > hashlib.blake2b.MAX_KEY_SIZE:
+        return hashlib.blake2b(secret).digest()
+    return secret
+
+
+# a binary signed value: header byte, digestmod id byte, binary digest of a fixed size, value
+# values signed with a text sign ("md5:<hex sign>_<value>") never start with the header byte
+BINARY_SIGN_HEADER = b"\x01"
+_BINARY_DIGESTMODS: dict[bytes, tuple[int, int, Callable[[bytes], _Digest]]] = {
+    # digestmod: (id, digest size, digest factory of a secret)
+    b"md5": (1, 16, lambda secret: _hash_digest(hmac.new(secret, digestmod=hashlib.md5))),
+    b"sha1": (2, 20, lambda secret: _hash_digest(hmac.new(secret, digestmod=hashlib.sha1))),
+    b"sha256": (3, 32, lambda secret: _hash_digest(hmac.new(secret, digestmod=hashlib.sha256))),
+    b"sum": (4, 8, _sum_digest),
+    b"blake2b": (5, 16, lambda secret: _hash_digest(hashlib.blake2b(key=_blake2b_key(secret), digest_size=16))),
+}
+
+
 class HashSigner:
+    """
+    Sign values with a binary digest of a key and a value in a fixed size header,
+    values signed with a text sign (by previous versions) are checked too
+    """
+
     _digestmods = {
         b"sha1": _seal(hashlib.sha1),
         b"md5": _seal(hashlib.md5),
@@ -41,12 +90,22 @@ class HashSigner:
     def __init__(self, secret: str | bytes, digestmod: str | bytes = b"md5"):
         self._secret = _to_bytes(secret)
         self._digestmod = _to_bytes(digestmod)
+        if self._digestmod not in _BINARY_DIGESTMODS:
+            raise ValueError(f"unsupported digestmod {self._digestmod!r}")
+        # digestmod id -> (digest size, digest): any digestmod can be checked
+        self._binary_digests = {
+            digestmod_id: (size, factory(self._secret)) for digestmod_id, size, factory in _BINARY_DIGESTMODS.values()
+        }
+        digestmod_id, _, _ = _BINARY_DIGESTMODS[self._digestmod]
+        self._header = BINARY_SIGN_HEADER + bytes((digestmod_id,))
+        _, self._digest = self._binary_digests[digestmod_id]
 
     def sign(self, key: Key, value: bytes) -> bytes:
-        sign = self._gen_sign(key, value, self._digestmod)
-        return self._digestmod + b":" + sign + b"_" + value
+        return self._header + self._digest(key.encode(), value) + value
 
     def check_sign(self, key: Key, value: bytes) -> bytes:
+        if value[:1] == BINARY_SIGN_HEADER:
+            return self._check_binary_sign(key, value)
         try:
             sign, value = value.split(b"_", 1)
         except ValueError as exc:
@@ -58,6 +117,16 @@ class HashSigner:
             raise UnSecureDataError(f"{expected_sign!r} != {sign!r}")
         return value
 
+    def _check_binary_sign(self, key: Key, value: bytes) -> bytes:
+        if len(value) < 2 or value[1] not in self._binary_digests:
+            raise UnSecureDataError()
+        size, digest = self._binary_digests[value[1]]
+        start = 2 + size
+        view = memoryview(value)
+        if len(view) < start or not hmac.compare_digest(digest(key.encode(), view[start:]), view[2:start]):
+            raise UnSecureDataError(f"wrong sign of key: {key}")
+        return value[start:]
+
     def _gen_sign(self, key: Key, value: bytes, digestmod: bytes) -> bytes:
         value = key.encode() + value
         return self._digestmods[digestmod](self._secret, value)
@@ -71,6 +140,24 @@ class HashSigner:
         return sign, digestmod
 
 
+# a primitive value: a type tag byte and raw bytes of the value, pickled values never start with these bytes
+_PRIMITIVE_ENCODERS: dict[type, Callable[[Any], bytes]] = {
+    str: lambda value: b"\x02" + value.encode("utf8", "surrogatepass"),
+    bytes: lambda value: b"\x03" + value,
+    float: lambda value: b"\x04" + repr(value).encode(),
+    bool: lambda value: b"\x05" if value else b"\x06",
+    type(None): lambda value: b"\x07",
+}
+_PRIMITIVE_DECODERS: dict[int, Callable[[bytes], Any]] = {
+    2: lambda value: value[1:].decode("utf8", "surrogatepass"),
+    3: lambda value: value[1:],
+    4: lambda value: float(value[1:]),
+    5: lambda value: True,
+    6: lambda value: False,
+    7: lambda value: None,
+}
+
+
 class NullSigner:
     @staticmethod
     def sign(key: Key, value: bytes) -> bytes:
@@ -83,59 +170,152 @@ class NullSigner:
 
 class Serializer:
     _type_mapping: dict[bytes, tuple[ICustomEncoder, ICustomDecoder]] = {}
+    # type of a value -> name of its custom type or None: saves building the name on every encode
+    _custom_types: dict[type, bytes | None] = {}
 
     def __init__(self, check_repr=False):
         self._check_repr = check_repr
         self._pickler = get_pickler(PicklerType.NULL)
+        self._primitive_encoders: dict[type, Callable[[Any], bytes]] = {}
         self._signer = NullSigner()
+        self._compressor: Compressor | None = None
+        self._compress_min_size = 0
+        self._compress_dicts = compressors.CompressionDictionaries()
+
+    @property
+    def keeps_types(self) -> bool:
+        return self._pickler.keeps_types
 
     def set_signer(self, signer):
         self._signer = signer
 
     def set_pickler(self, pickler):
         self._pickler = pickler
+        self._primitive_encoders = _PRIMITIVE_ENCODERS if pickler.tag_primitives else {}
+
+    def set_compressor(self, compressor: Compressor | None, min_size: int = 0):
+        self._compressor = compressor
+        self._compress_min_size = min_size
+
+    def set_compress_dicts(self, compress_dicts: compressors.CompressionDictionaries):
+        self._compress_dicts = compress_dicts
 
     @classmethod
     def register_type(cls, klass: type, encoder, decoder):
         cls._type_mapping[bytes(klass.__name__, "utf8")] = (encoder, decoder)
+        cls._custom_types.clear()
 
     async def encode(self, backend: Backend, key: Key, value: Value, expire: float | None) -> bytes:  # on SET
         if isinstance(value, int) and not isinstance(value, bool):
             return value  # type: ignore[return-value]
-        _value = await self._custom_encode(backend, key, value, expire)
-        if _value is not None:
-            return self._signer.sign(key, _value)
-        return self._signer.sign(key, self._pickler.dumps(value))
+        klass = type(value)
+        if klass in self._primitive_encoders:
+            _value = self._primitive_encoders[klass](value)
+        else:
+            value_type = self._get_custom_type(klass)
+            if value_type is not None:
+                _value = await self._custom_encode(backend, key, value, expire, value_type)
+            else:
+                _value = self._pickler.dumps(value)
+        if self._compressor is not None:
+            _value = await self._compress(backend, self._compressor, _value)
+        return self._signer.sign(key, _value)
+
+    async def _compress(self, backend: Backend, compressor: Compressor, value: bytes) -> bytes:
+        if not isinstance(value, bytes) or len(value) < self._compress_min_size:
+            return value
+        compressed = None
+        if self._compress_dicts.training:
+            compressed = await self._compress_dicts.compress(backend, value)
+        if compressed is None:
+            compressed = compressors.compress(compressor, value)
+        if len(compressed) >= len(value):
+            return value
+        return compressed
 
-    async def _custom_encode(self, backend, key: Key, value: Value, expire: float | None) -> bytes | None:
-        value_type = bytes(type(value).__name__, "utf8")
+    def _get_custom_type(self, klass: type) -> bytes | None:
+        try:
+            return self._custom_types[klass]
+        except KeyError:
+            pass
+        value_type: bytes | None = bytes(klass.__name__, "utf8")
         if value_type not in self._type_mapping:
-            return None
+            value_type = None
+        self._custom_types[klass] = value_type
+        return value_type
+
+    async def _custom_encode(self, backend, key: Key, value: Value, expire: float | None, value_type: bytes) -> bytes:
         encoder, _ = self._type_mapping[value_type]
         encoded_value = await encoder(value, backend, key, expire)
         return value_type + b":" + encoded_value
 
+    def encode_nowait(self, backend: Backend, key: Key, value: Value, expire: float | None) -> bytes:
+        """
+        Sync version of encode: custom encoders are run only if they complete without suspending
+        """
+        return _run_nowait(self.encode(backend, key, value, expire))
+
     async def decode(self, backend: Backend, key: Key, value: bytes, default: Value) -> Value:  # on GET
+        try:
+            value, custom = self._decode_value(key, value, default)
+        except compressors.MissingDictionaryError as exc:
+            if not await self._compress_dicts.load(backend, exc.dict_id):
+                return default
+            value, custom = self._decode_value(key, value, default)
+        if custom:
+            return await self._custom_decode(backend, key, value, default)
+        return value
+
+    def decode_nowait(self, backend: Backend, key: Key, value: bytes, default: Value) -> Value:
+        """
+        Sync version of decode: custom decoders are run only if they complete without suspending
+        and compression dictionaries are not loaded
+        """
+        try:
+            value, custom = self._decode_value(key, value, default)
+        except compressors.MissingDictionaryError as exc:
+            raise AwaitRequiredError("compression dictionary should be loaded") from exc
+        if custom:
+            return _run_nowait(self._custom_decode(backend, key, value, default))
+        return value
+
+    def _decode_value(self, key: Key, value: bytes, default: Value) -> tuple[Value, bool]:
+        # return a decoded value and a flag that the value should be decoded by a custom decoder
         if value is default:
-            return default
+            return default, False
         if not isinstance(value, bytes):
-            return value
-        if value.isdigit():
-            return int(value)
+            return value, False
+        if value and value[0] in _PRIMITIVE_DECODERS and isinstance(self._signer, NullSigner):
+            return _PRIMITIVE_DECODERS[value[0]](value), False
+        if b"0" <= value[:1] <= b"9" and value.isdigit():  # untagged values: counters of incr
+            return int(value), False
         try:
             value = self._signer.check_sign(key, value)
         except SignIsMissingError:
-            return default
+            return default, False
+
+        # compressed values are decoded regardless of a compressor of the serializer
+        if compressors.is_compressed(value):
+            try:
+                value = self._decompress(value)
+            except compressors.DecompressError:
+                return default, False
+
+        if value and value[0] in _PRIMITIVE_DECODERS:  # tagged values are decoded regardless of a pickler
+            return _PRIMITIVE_DECODERS[value[0]](value), False
 
         try:
             value = self._decode(value)
         except self._pickler.UnpicklingError:
             pass
         except AttributeError:
-            return default
-        if isinstance(value, bytes):
-            return await self._custom_decode(backend, key, value, default)
-        return value
+            return default, False
+        return value, isinstance(value, bytes)
+
+    def _decompress(self, value: bytes) -> bytes:
+        if self._compress_dicts.is_dict_compressed(value):
+            return self._compress_dicts.decompress(value)
+        return compressors.decompress(value)
 
     def _decode(self, value: bytes) -> Value:
         value = self._pickler.loads(value)
@@ -161,6 +341,15 @@ class DecodeError(Exception):
     pass
 
 
+def _run_nowait(coro: Coroutine[Any, Any, Value]) -> Value:
+    try:
+        coro.send(None)
+    except StopIteration as exc:
+        return exc.value
+    coro.close()
+    raise AwaitRequiredError("custom encoder or decoder requires awaiting")
+
+
 register_type = Serializer.register_type
 
 
@@ -180,16 +369,29 @@ def get_serializer(
     digestmod: str | bytes = b"md5",
     check_repr: bool = True,
     pickle_type: PicklerType | None = None,
+    compress: CompressorType | None = None,
+    compress_min_size: int | None = None,
+    compress_dict: bool = False,
+    compress_dict_samples: int = 1000,
 ) -> Serializer:
     _serializer = Serializer(check_repr=check_repr)
     if secret:
         _serializer.set_signer(HashSigner(secret, digestmod))
-    _serializer.set_pickler(_get_pickler(pickle_type or PicklerType.NULL, bool(secret)))
+    _serializer.set_pickler(_get_pickler(pickle_type or PicklerType.NULL, bool(secret) or bool(compress)))
+    if compress:
+        if compress_min_size is None:
+            # values compressed with a dictionary are small
+            compress_min_size = 0 if compress_dict else 1024
+        _serializer.set_compressor(get_compressor(compress), compress_min_size)
+    if compress and compress_dict:
+        compress_dicts = compressors.CompressionDictionaries(samples=compress_dict_samples)
+        compress_dicts.enable_training(compress)
+        _serializer.set_compress_dicts(compress_dicts)
     return _serializer
 
 
-def _get_pickler(pickle_type: PicklerType, hash_key: bool) -> Pickler:
-    if pickle_type is PicklerType.NULL and hash_key:
+def _get_pickler(pickle_type: PicklerType, to_bytes: bool) -> Pickler:
+    if pickle_type is PicklerType.NULL and to_bytes:
         pickle_type = PicklerType.DEFAULT
     return get_pickler(pickle_type)
 
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager, suppress
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterator
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ._typing import Key, Result_T
+
+__all__ = ("SingleFlight",)
+
+_retry = object()
+
+
+class _Flight:
+    __slots__ = ("loop", "waiters", "result", "exception")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.waiters: list[asyncio.Future] = []
+        self.result: Any = _retry
+        self.exception: Exception | None = None
+
+    def finish(self) -> None:
+        for waiter in self.waiters:
+            if waiter.done():  # a waiter was cancelled
+                continue
+            if self.exception is not None:
+                waiter.set_exception(self.exception)
+            else:
+                waiter.set_result(self.result)
+
+
+class SingleFlight:
+    """
+    Request coalescing: concurrent calls with the same key share one execution -
+    the first call is executed and following ones wait for it and get the same result or exception.
+    If the executed call is cancelled one of waiting calls is executed instead
+    Counters: `calls` - number of executed calls, `coalesced` - number of calls that waited for an executed one
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Key, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def _join(self, key: Key, loop: asyncio.AbstractEventLoop) -> asyncio.Future | None:
+        flight = self._flights.get(key)
+        if flight is None or flight.loop is not loop:
+            return None
+        self.coalesced += 1
+        waiter = loop.create_future()
+        flight.waiters.append(waiter)
+        return waiter
+
+    async def do(self, key: Key, func: Callable[..., Awaitable[Result_T]], *args: Any, **kwargs: Any) -> Result_T:
+        """
+        Execute a call or wait for an executing call with the same key and return its result
+        """
+        loop = asyncio.get_running_loop()
+        waiter = self._join(key, loop)
+        while waiter is not None:
+            result = await waiter
+            if result is not _retry:
+                return result
+            waiter = self._join(key, loop)
+        with self.flight(key) as flight:
+            flight.result = await func(*args, **kwargs)
+        return flight.result
+
+    async def wait(self, key: Key) -> bool:
+        """
+        Wait for an executing call with the key to finish, return False if there is no such call
+        """
+        waiter = self._join(key, asyncio.get_running_loop())
+        if waiter is None:
+            return False
+        with suppress(Exception):
+            await waiter
+        return True
+
+    @contextmanager
+    def flight(self, key: Key) -> Iterator[_Flight]:
+        """
+        Mark a call with the key as executing while in the context
+        """
+        flight = _Flight(asyncio.get_running_loop())
+        self._flights[key] = flight
+        self.calls += 1
+        try:
+            yield flight
+        except Exception as exc:
+            flight.exception = exc
+            raise
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.finish()
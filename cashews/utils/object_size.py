@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import gc
 import sys
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
 from typing import Iterable
 
 
@@ -28,3 +29,38 @@ def get_obj_size(obj) -> int:
         marked.update(new_refr.keys())
 
     return size
+
+
+_CONTAINERS = (list, tuple, set, frozenset)
+_NOT_VALUES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+_ATOMIC = frozenset((str, bytes, int, float, bool, type(None)))
+
+
+def estimate_obj_size(obj) -> int:
+    """
+    Estimation of an object size: the object with items of builtin containers and attributes of objects, recursively.
+    Unlike get_obj_size only values are followed (not classes, modules or functions), an object is counted once
+    """
+    if type(obj) in _ATOMIC:
+        return sys.getsizeof(obj)
+    marked: set[int] = set()
+    obj_q = [obj]
+    size = 0
+    while obj_q:
+        obj = obj_q.pop()
+        if id(obj) in marked:
+            continue
+        marked.add(id(obj))
+        size += sys.getsizeof(obj)
+        if type(obj) in _ATOMIC:
+            continue
+        if isinstance(obj, dict):
+            obj_q.extend(obj.keys())
+            obj_q.extend(obj.values())
+        elif isinstance(obj, _CONTAINERS):
+            obj_q.extend(obj)
+        elif not isinstance(obj, _NOT_VALUES):
+            attrs = getattr(obj, "__dict__", None)
+            if isinstance(attrs, dict):
+                obj_q.append(attrs)
+    return size
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Generic, Iterator, TypeVar
+
+_T = TypeVar("_T")
+
+
+class _Node(Generic[_T]):
+    __slots__ = ("edges", "value", "has_value")
+
+    def __init__(self) -> None:
+        # first char of an edge label -> (label, child)
+        self.edges: dict[str, tuple[str, _Node[_T]]] = {}
+        self.value: _T | None = None
+        self.has_value = False
+
+
+class RadixTree(Generic[_T]):
+    """
+    Compressed prefix tree: finds values of all inserted prefixes of a string in O(len(string))
+    """
+
+    def __init__(self) -> None:
+        self._root: _Node[_T] = _Node()
+
+    def insert(self, prefix: str, value: _T) -> None:
+        node = self._root
+        rest = prefix
+        while rest:
+            edge = node.edges.get(rest[0])
+            if edge is None:
+                child: _Node[_T] = _Node()
+                node.edges[rest[0]] = (rest, child)
+                node = child
+                break
+            label, child = edge
+            common = _common_prefix_len(label, rest)
+            if common < len(label):
+                # split the edge
+                middle: _Node[_T] = _Node()
+                middle.edges[label[common]] = (label[common:], child)
+                node.edges[rest[0]] = (label[:common], middle)
+                child = middle
+            node = child
+            rest = rest[common:]
+        node.value = value
+        node.has_value = True
+
+    def iter_prefixes(self, string: str) -> Iterator[_T]:
+        """
+        Yield values of inserted prefixes of the string from the shortest to the longest
+        """
+        node = self._root
+        if node.has_value:
+            yield node.value  # type: ignore[misc]
+        pos = 0
+        while pos < len(string):
+            edge = node.edges.get(string[pos])
+            if edge is None:
+                return
+            label, node = edge
+            if not string.startswith(label, pos):
+                return
+            pos += len(label)
+            if node.has_value:
+                yield node.value  # type: ignore[misc]
+
+    def longest_prefix(self, string: str, default: _T | None = None) -> _T | None:
+        """
+        Return value of the longest inserted prefix of the string
+        """
+        found = default
+        node = self._root
+        if node.has_value:
+            found = node.value
+        pos = 0
+        while pos < len(string):
+            edge = node.edges.get(string[pos])
+            if edge is None:
+                break
+            label, node = edge
+            if not string.startswith(label, pos):
+                break
+            pos += len(label)
+            if node.has_value:
+                found = node.value
+        return found
+
+
+def _common_prefix_len(first: str, second: str) -> int:
+    size = min(len(first), len(second))
+    for index in range(size):
+        if first[index] != second[index]:
+            return index
+    return size
@@ -8,6 +8,7 @@ from typing import Any, Iterator
 from ._typing import AsyncCallable_T
 from .backends.interface import _BackendInterface
 from .commands import RETRIEVE_CMDS, Command
+from .exceptions import AwaitRequiredError
 from .formatter import default_format
 from .key import get_call_values
 from .key_context import context as template_context
@@ -71,3 +72,12 @@ async def _invalidate_middleware(call, cmd: Command, backend: _BackendInterface,
             await backend.delete_many(*args)
             return ()
     return await call(*args, **kwargs)
+
+
+def _invalidate_middleware_nowait(call, cmd: Command, backend: _BackendInterface, *args, **kwargs):
+    if _INVALIDATE_FURTHER.get() and cmd in RETRIEVE_CMDS:
+        raise AwaitRequiredError("invalidation requires awaiting")
+    return call(*args, **kwargs)
+
+
+_invalidate_middleware.nowait = _invalidate_middleware_nowait  # type: ignore[attr-defined]
@@ -5,12 +5,13 @@ from .backend_settings import register_backend  # noqa
 from .callback import CallbackWrapper
 from .decorators import DecoratorsWrapper
 from .disable_control import ControlWrapper
-from .tags import CommandsTagsWrapper
+from .tags import CommandsTagsWrapper, TagsMode
 from .transaction import TransactionMode, TransactionWrapper
 
 __all__ = [
     "Cache",
     "TransactionMode",
+    "TagsMode",
     "register_backend",
 ]
 
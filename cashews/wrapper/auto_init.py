@@ -1,8 +1,9 @@
 import asyncio
 
-from cashews._typing import AsyncCallable_T, Middleware, Result_T
+from cashews._typing import AsyncCallable_T, Callable_T, Middleware, Result_T
 from cashews.backends.interface import Backend
 from cashews.commands import Command
+from cashews.exceptions import AwaitRequiredError
 
 
 def create_auto_init() -> Middleware:
@@ -17,4 +18,10 @@ def create_auto_init() -> Middleware:
 
         return await call(*args, **kwargs)
 
+    def _auto_init_nowait(call: Callable_T[Result_T], cmd: Command, backend: Backend, *args, **kwargs) -> Result_T:
+        if not backend.is_init:
+            raise AwaitRequiredError("backend is not initialized")
+        return call(*args, **kwargs)
+
+    _auto_init.nowait = _auto_init_nowait  # type: ignore[attr-defined]
     return _auto_init
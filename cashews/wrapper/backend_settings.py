@@ -5,6 +5,7 @@ from urllib.parse import parse_qsl, urlparse
 
 from cashews.backends.interface import Backend
 from cashews.backends.memory import Memory
+from cashews.backends.sharded_memory import ShardedMemory
 from cashews.exceptions import BackendNotAvailableError
 from cashews.picklers import PicklerType
 
@@ -16,6 +17,7 @@ _CUSTOM_ERRORS = {
     "redis": _NO_REDIS_ERROR,
     "rediss": _NO_REDIS_ERROR,
     "disk": "Disk backend requires `diskcache` to be installed.",
+    "shm": "Shared memory backend is not available on this platform.",
 }
 _BACKENDS: dict[str, tuple[BackendOrFabric, bool, PicklerType]] = {}
 
@@ -30,6 +32,17 @@ def register_backend(
 
 
 register_backend("mem", Memory)
+register_backend("sharded-mem", ShardedMemory)
+
+try:
+    import fcntl  # noqa: F401
+    from multiprocessing import shared_memory  # noqa: F401
+except ImportError:
+    pass
+else:
+    from cashews.backends.shared_memory import SharedMemory
+
+    register_backend("shm", SharedMemory, pickler=PicklerType.DEFAULT)
 
 
 try:
@@ -79,7 +92,16 @@ def settings_url_parse(url: str) -> tuple[BackendOrFabric, dict[str, Any], Pickl
 
 def _serialize_params(params: dict[str, str]) -> dict[str, str | int | bool | float]:
     new_params = {}
-    bool_keys = ("safe", "suppress", "enable", "disable", "client_side")
+    bool_keys = (
+        "safe",
+        "suppress",
+        "enable",
+        "disable",
+        "client_side",
+        "auto_batch",
+        "auto_pipeline",
+        "compress_dict",
+    )
     true_values = (
         "1",
         "true",
@@ -5,11 +5,12 @@ import uuid
 from typing import TYPE_CHECKING, Any, Iterator
 
 from cashews.commands import PATTERN_CMDS, Command
+from cashews.exceptions import AwaitRequiredError
 
 from .wrapper import Wrapper
 
 if TYPE_CHECKING:  # pragma: no cover
-    from cashews._typing import AsyncCallable_T, Callback, Key, Result_T, ShortCallback
+    from cashews._typing import AsyncCallable_T, Callable_T, Callback, Key, Result_T, ShortCallback
     from cashews.backends.interface import Backend
 
 
@@ -29,6 +30,11 @@ class CallbackMiddleware:
             await callback(cmd, key=key, result=result, backend=backend)
         return result
 
+    def nowait(self, call: Callable_T[Result_T], cmd: Command, backend: Backend, *args, **kwargs) -> Result_T:
+        if self._callbacks:
+            raise AwaitRequiredError("callbacks require awaiting")
+        return call(*args, **kwargs)
+
     def add_callback(self, callback: Callback, name: str) -> None:
         self._callbacks[name] = callback
 
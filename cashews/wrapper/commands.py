@@ -43,8 +43,24 @@ class CommandWrapper(Wrapper):
     async def get(self, key: Key, default: Default | None = None) -> Value | Default | None:
         return await self._with_middlewares(Command.GET, key)(key=key, default=default)
 
+    def get_nowait(self, key: Key, default: Default | None = None) -> Value | Default | None:
+        """
+        Get a value without awaiting: supported by in-memory backends only.
+        Raise AwaitRequiredError if the backend or a middleware requires awaiting - use `await cache.get(...)` then
+        """
+        return self._with_middlewares_nowait(Command.GET, key)(key=key, default=default)
+
     async def get_or_set(
         self, key: Key, default: Default | AsyncCallable_T | Callable_T, expire: TTL = None
+    ) -> Value | Default | Result_T:
+        try:
+            return await self.singleflight.do(key, self._get_or_set, key, default, expire)
+        finally:
+            if inspect.iscoroutine(default):
+                default.close()  # not awaited by a coalesced call
+
+    async def _get_or_set(
+        self, key: Key, default: Default | AsyncCallable_T | Callable_T, expire: TTL = None
     ) -> Value | Default | Result_T:
         value = await self.get(key, default=_empty)
         if value is not _empty:
@@ -182,6 +198,9 @@ class CommandWrapper(Wrapper):
         message = b"PING" if message is None else message
         return await self._with_middlewares(Command.PING, message.decode())(message=message)
 
+    async def set_pop_delete(self, key: Key, count: int = 100) -> list[Key]:
+        return await self._with_middlewares(Command.SET_POP_DELETE, key)(key=key, count=count)
+
     async def get_keys_count(self) -> int:
         result = 0
         for backend in self._backends.values():
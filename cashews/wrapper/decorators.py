@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, Callable
 
 from cashews import decorators, validation
 from cashews.cache_condition import get_cache_condition
+from cashews.key import get_cache_key, get_cache_key_template
 from cashews.ttl import ttl_to_seconds
 
 from .time_condition import create_time_condition
@@ -15,10 +16,6 @@ if TYPE_CHECKING:  # pragma: no cover
     from cashews.decorators.bloom import IntOrPair
 
 
-def _skip_thunder_protection(func: DecoratedFunc) -> DecoratedFunc:
-    return func
-
-
 class DecoratorsWrapper(Wrapper):
     _default_fail_exceptions: tuple[type[Exception], ...] = (Exception,)
 
@@ -30,9 +27,19 @@ class DecoratorsWrapper(Wrapper):
             raise ValueError("ttl can't be None with lock")
 
         if upper:
-            return self._wrap_with_condition(decorator_fabric, **decor_kwargs)
+            return self._wrap_with_condition(decorator_fabric, protected=protected, **decor_kwargs)
         return self._wrap(decorator_fabric, protected=protected, **decor_kwargs)
 
+    def _protect(self, func: DecoratedFunc, call: DecoratedFunc, key: KeyOrTemplate | None, prefix: str):
+        # coalesce concurrent calls by a cache key
+        _key_template = get_cache_key_template(func, key=key, prefix=prefix)
+
+        async def _protected(*args, **kwargs):
+            _cache_key = get_cache_key(func, _key_template, args, kwargs)
+            return await self.singleflight.do(_cache_key, call, *args, **kwargs)
+
+        return _protected
+
     def _wrap(
         self,
         decorator_fabric,
@@ -48,25 +55,23 @@ class DecoratorsWrapper(Wrapper):
                 decor_kwargs["condition"] = condition
 
             decorator = decorator_fabric(self, **decor_kwargs)(func)
-            thunder_protection: Callable[[DecoratedFunc], DecoratedFunc] = _skip_thunder_protection
+            if lock:
+                _locked = decorators.locked(
+                    backend=self,  # type: ignore[arg-type]
+                    key=decor_kwargs.get("key"),
+                    ttl=decor_kwargs["ttl"],
+                    wait=True,
+                )
+                decorator = _locked(decorator)
             if protected:
-                thunder_protection = decorators.thunder_protection(key=decor_kwargs.get("key"))
+                decorator = self._protect(func, decorator, decor_kwargs.get("key"), decor_kwargs.get("prefix", ""))
 
             @wraps(func)
             async def _call(*args, **kwargs):
                 self._check_setup()
                 if self.is_full_disable:
                     return await func(*args, **kwargs)
-                if lock:
-                    _locked = decorators.locked(
-                        backend=self,
-                        key=decor_kwargs.get("key"),
-                        ttl=decor_kwargs["ttl"],
-                        wait=True,
-                    )
-                    return await thunder_protection(_locked(decorator))(*args, **kwargs)
-                else:
-                    return await thunder_protection(decorator)(*args, **kwargs)
+                return await decorator(*args, **kwargs)
 
             return _call  # type: ignore[return-value]
 
@@ -78,6 +83,7 @@ class DecoratorsWrapper(Wrapper):
         condition,
         lock=False,
         time_condition=None,
+        protected=False,
         **decor_kwargs,
     ):
         def _decorator(func: AsyncCallable_T) -> AsyncCallable_T:
@@ -87,11 +93,7 @@ class DecoratorsWrapper(Wrapper):
                 func = _decor(func)
             decorator_fabric(self, **decor_kwargs)(func)  # to register cache templates
 
-            @wraps(func)
-            async def _call(*args, **kwargs):
-                self._check_setup()
-                if self.is_full_disable:
-                    return await func(*args, **kwargs)
+            async def _call_with_condition(*args, **kwargs):
                 with decorators.context_cache_detect as detect:
 
                     def new_condition(result, _args, _kwargs, key):
@@ -113,6 +115,17 @@ class DecoratorsWrapper(Wrapper):
 
                 return _result
 
+            call = _call_with_condition
+            if protected:
+                call = self._protect(func, call, decor_kwargs.get("key"), decor_kwargs.get("prefix", ""))
+
+            @wraps(func)
+            async def _call(*args, **kwargs):
+                self._check_setup()
+                if self.is_full_disable:
+                    return await func(*args, **kwargs)
+                return await call(*args, **kwargs)
+
             return _call
 
         return _decorator
@@ -152,6 +165,7 @@ class DecoratorsWrapper(Wrapper):
         condition: CacheCondition = None,
         time_condition: TTL | None = None,
         prefix: str = "fail",
+        protected: bool = True,
     ) -> Callable[[DecoratedFunc], DecoratedFunc]:
         exceptions = exceptions or self._default_fail_exceptions
         return self._wrap_with_condition(
@@ -162,6 +176,7 @@ class DecoratorsWrapper(Wrapper):
             condition=get_cache_condition(condition),
             time_condition=ttl_to_seconds(time_condition),
             prefix=prefix,
+            protected=protected,
         )
 
     def early(
@@ -176,6 +191,8 @@ class DecoratorsWrapper(Wrapper):
         tags: Tags = (),
         background: bool = True,
         protected: bool = True,
+        xfetch: bool = False,
+        beta: float = 1.0,
     ) -> Callable[[DecoratedFunc], DecoratedFunc]:
         return self._wrap_on(
             decorators.early,
@@ -189,6 +206,8 @@ class DecoratorsWrapper(Wrapper):
             tags=tags,
             background=background,
             protected=protected,
+            xfetch=xfetch,
+            beta=beta,
         )
 
     def soft(
@@ -230,6 +249,7 @@ class DecoratorsWrapper(Wrapper):
         upper: bool = False,
         tags: Tags = (),
         background: bool = True,
+        protected: bool = False,
     ) -> Callable[[DecoratedFunc], DecoratedFunc]:
         return self._wrap_on(
             decorators.hit,
@@ -243,6 +263,7 @@ class DecoratorsWrapper(Wrapper):
             prefix=prefix,
             tags=tags,
             background=background,
+            protected=protected,
         )
 
     def dynamic(
@@ -254,6 +275,7 @@ class DecoratorsWrapper(Wrapper):
         prefix: str = "dynamic",
         upper: bool = False,
         tags: Tags = (),
+        protected: bool = False,
     ) -> Callable[[DecoratedFunc], DecoratedFunc]:
         return self._wrap_on(
             decorators.hit,
@@ -266,6 +288,27 @@ class DecoratorsWrapper(Wrapper):
             time_condition=ttl_to_seconds(time_condition),
             prefix=prefix,
             tags=tags,
+            protected=protected,
+        )
+
+    def batch(
+        self,
+        ttl: TTL,
+        items: str,
+        key: KeyOrTemplate | None = None,
+        condition: CacheCondition = None,
+        prefix: str = "",
+        protected: bool = True,
+    ) -> Callable[[DecoratedFunc], DecoratedFunc]:
+        return self._wrap_on(
+            decorators.batch,
+            upper=False,
+            ttl=ttl,
+            items=items,
+            key=key,
+            condition=get_cache_condition(condition),
+            prefix=prefix,
+            protected=protected,
         )
 
     def iterator(
@@ -273,13 +316,36 @@ class DecoratorsWrapper(Wrapper):
         ttl: TTL,
         key: KeyOrTemplate | None = None,
         condition: CacheCondition = None,
+        protected: bool = True,
     ) -> Callable[[DecoratedFunc], DecoratedFunc]:
-        return decorators.iterator(
+        _iterator = decorators.iterator(
             self,  # type: ignore[arg-type]
             ttl=ttl,
             key=key,
             condition=get_cache_condition(condition),
         )
+        if not protected:
+            return _iterator
+
+        def _decorator(async_iterator: DecoratedFunc) -> DecoratedFunc:
+            decorator = _iterator(async_iterator)
+            _key_template = get_cache_key_template(async_iterator, key=key)
+
+            @wraps(async_iterator)
+            async def _call(*args, **kwargs):
+                # chunks can't be shared, so concurrent calls wait for an executing one to read them from the cache
+                _cache_key = get_cache_key(async_iterator, _key_template, args, kwargs)
+                if await self.singleflight.wait(_cache_key):
+                    async for chunk in decorator(*args, **kwargs):
+                        yield chunk
+                    return
+                with self.singleflight.flight(_cache_key):
+                    async for chunk in decorator(*args, **kwargs):
+                        yield chunk
+
+            return _call  # type: ignore[return-value]
+
+        return _decorator
 
     def invalidate(
         self,
@@ -9,7 +9,7 @@ from cashews.exceptions import NotConfiguredError
 from .wrapper import Wrapper
 
 if TYPE_CHECKING:  # pragma: no cover
-    from cashews._typing import AsyncCallable_T
+    from cashews._typing import AsyncCallable_T, Callable_T
     from cashews.backends.interface import Backend
 
 
@@ -21,6 +21,17 @@ async def _is_disable_middleware(call: AsyncCallable_T, cmd: Command, backend: B
     return await call(*args, **kwargs)
 
 
+def _is_disable_middleware_nowait(call: Callable_T, cmd: Command, backend: Backend, *args, **kwargs):
+    if backend.is_disable(cmd):
+        if cmd in (Command.GET, Command.GET_MANY):
+            return kwargs.get("default", None)
+        return None
+    return call(*args, **kwargs)
+
+
+_is_disable_middleware.nowait = _is_disable_middleware_nowait  # type: ignore[attr-defined]
+
+
 class ControlWrapper(Wrapper):
     def __init__(self, name: str = ""):
         super().__init__(name)
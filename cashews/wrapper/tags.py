@@ -1,48 +1,111 @@
 from __future__ import annotations
 
+import asyncio
+from enum import Enum
 from functools import lru_cache
-from typing import Iterable, Match, Pattern
+from itertools import chain
+from typing import Any, AsyncIterator, Callable, Iterable, NamedTuple, Pattern
 
-from cashews._typing import TTL, Key, KeyOrTemplate, OnRemoveCallback, Tag, Tags, Value
+from cashews._typing import TTL, Default, Key, KeyOrTemplate, OnRemoveCallback, Tag, Tags, Value
 from cashews.backends.interface import Backend
+from cashews.commands import Command
+from cashews.exceptions import AwaitRequiredError, UnsupportedPicklerError
 from cashews.formatter import default_format, template_to_re_pattern
+from cashews.ttl import ttl_to_seconds
+from cashews.utils.radix_tree import RadixTree
 
 from .commands import CommandWrapper
 
+_MATCHES_CACHE_SIZE = 1024
+_missed = object()
+_KeyMatcher = Callable[[Key], "tuple[tuple[Tag, dict[str, str | None]], ...]"]
+
+
+class TagsMode(Enum):
+    SETS = "sets"  # keys of a tag are stored in a set and deleted on invalidation
+    VERSIONS = "versions"  # a value is stored with versions of its tags and invalid if a version is changed
+
+
+class TaggedValue(NamedTuple):
+    value: Any
+    versions: tuple[tuple[Tag, int], ...]
+
 
 class TagsRegistry:
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self._registry_template: dict[Tag, list[Pattern]] = {}
+        self._registry_prefixes: dict[Tag, list[str]] = {}
+        self._match_key: _KeyMatcher | None = None
 
     def register_tag(self, tag: Tag, key_template: KeyOrTemplate):
         self._registry_template.setdefault(tag, [])
         self._registry_template[tag].append(template_to_re_pattern(key_template))
+        self._registry_prefixes.setdefault(tag, []).append(_literal_prefix(key_template))
+        self._match_key = None
 
     def get_key_tags(self, key: Key) -> Tags:
+        match_key = self._match_key
+        if match_key is None:
+            match_key = self._match_key = self._build_matcher()
         tags = []
-        for tag, patterns in self._registry_template.items():
-            match = self._match_patterns(key, patterns)
-            if match:
-                group_dict = {k: v if v is not None else "" for k, v in match.groupdict().items()}
-                tag = default_format(tag, **group_dict)
-                tags.append(tag)
+        for tag, groups in match_key(key):
+            group_dict = {k: v if v is not None else "" for k, v in groups.items()}
+            tags.append(default_format(tag, **group_dict))
         return tags
 
-    @staticmethod
-    def _match_patterns(key: Key, patterns: list[Pattern]) -> Match | None:
-        for pattern in patterns:
-            match = pattern.fullmatch(key)
-            if match:
-                return match
-        return None
+    def _build_matcher(self) -> _KeyMatcher:
+        # patterns are indexed by literal prefixes of templates: a key is matched only with patterns
+        # of its prefixes. Patterns can't be joined in one alternation regex: templates share group names
+        # and all matching tags are needed, not the first one. Recently matched keys are cached
+        tree: RadixTree[list[tuple[int, int, Tag, Pattern]]] = RadixTree()
+        by_prefix: dict[str, list[tuple[int, int, Tag, Pattern]]] = {}
+        for order, (tag, patterns) in enumerate(self._registry_template.items()):
+            for index, (pattern, prefix) in enumerate(zip(patterns, self._registry_prefixes[tag])):
+                by_prefix.setdefault(prefix, []).append((order, index, tag, pattern))
+        for prefix, candidates in by_prefix.items():
+            tree.insert(prefix, candidates)
+
+        def _match_key(key: Key) -> tuple[tuple[Tag, dict[str, str | None]], ...]:
+            matched = []
+            seen = set()
+            # the first matched pattern of a tag in order of registration
+            for order, _, tag, pattern in sorted(chain.from_iterable(tree.iter_prefixes(key))):
+                if order in seen:
+                    continue
+                match = pattern.fullmatch(key)
+                if match:
+                    seen.add(order)
+                    matched.append((tag, match.groupdict()))
+            return tuple(matched)
+
+        return lru_cache(maxsize=_MATCHES_CACHE_SIZE)(_match_key)
+
+
+def _check_versions_serializer(backend: Backend) -> None:
+    # a tagged value is a named tuple: json like picklers decode it as a list without versions
+    serializer = backend._serializer
+    if serializer is not None and not serializer.keeps_types:
+        raise UnsupportedPicklerError("VERSIONS tags mode requires a pickle type that keeps python types")
+
+
+def _literal_prefix(key_template: KeyOrTemplate) -> str:
+    # a template part before the first field or regex wildcard ("." is not escaped)
+    for index, char in enumerate(key_template):
+        if char in "{}.":
+            return key_template[:index]
+    return key_template
 
 
 class CommandsTagsWrapper(CommandWrapper):
+    tags_mode = TagsMode.SETS
+
     def __init__(self, name: str = ""):
         super().__init__(name)
         self._tags_registry = TagsRegistry()
         self._tags_key_prefix = "_tag:"
+        self._tags_version_prefix = self._tags_key_prefix + "v:"
+        self.tags_batch_size = 1000
         self._on_remove_cb = self._on_remove_callback()
 
     def setup_tags_backend(self, settings_url: str, middlewares: tuple = (), **kwargs) -> Backend:
@@ -53,6 +116,17 @@ class CommandsTagsWrapper(CommandWrapper):
             **kwargs,
         )
 
+    def set_tags_mode(self, mode: TagsMode) -> None:
+        """
+        SETS mode - keys of a tag are stored in a set: a write costs a set update and invalidation deletes all keys,
+        VERSIONS mode - a tag has a version: a write gets versions of tags of the value, a read gets the value
+        with versions of tags of its key (one get_many) and invalidation only increments versions
+        """
+        if mode is TagsMode.VERSIONS:
+            for backend in self._backends.values():
+                _check_versions_serializer(backend)
+        self.tags_mode = mode
+
     @lru_cache(maxsize=1)  # noqa: B019
     def _get_tags_backend(self):
         return self._get_backend(self._tags_key_prefix)
@@ -65,11 +139,15 @@ class CommandsTagsWrapper(CommandWrapper):
         self._tags_registry.register_tag(tag, key_template)
 
     def _add_backend(self, backend: Backend, *args, **kwargs):
+        if self.tags_mode is TagsMode.VERSIONS:
+            _check_versions_serializer(backend)
         super()._add_backend(backend, *args, **kwargs)
         backend.on_remove_callback(self._on_remove_cb)
 
     def _on_remove_callback(self) -> OnRemoveCallback:
         async def _callback(keys: Iterable[Key], backend: Backend) -> None:
+            if self.tags_mode is TagsMode.VERSIONS:
+                return
             for tag, _keys in self._group_by_tags(keys).items():
                 await self.tags_backend.set_remove(self._tags_key_prefix + tag, *_keys)
 
@@ -85,18 +163,32 @@ class CommandsTagsWrapper(CommandWrapper):
     def get_key_tags(self, key: Key) -> Tags:
         return self._tags_registry.get_key_tags(key)
 
-    async def delete_tags(self, *tags: Tag):
+    async def delete_tags(self, *tags: Tag, batch_size: int | None = None):
+        """
+        Delete keys with given tags, keys of a tag are popped and deleted by batches of `batch_size` keys
+        """
+        batch_size = batch_size or self.tags_batch_size
+        if self.tags_mode is TagsMode.VERSIONS:
+            await asyncio.gather(*[self.incr(self._tags_version_prefix + tag) for tag in tags])
         for tag in tags:
-            await self._delete_tag(tag)
+            await self._delete_tag(tag, batch_size)
 
-    async def _delete_tag(self, tag: Tag):
+    async def _delete_tag(self, tag: Tag, batch_size: int):
+        tag_key = self._tags_key_prefix + tag
+        if len(self._backends) == 1:
+            # tagged keys are in the backend of the tag: pop and delete them with one command
+            while True:
+                members = await self.set_pop_delete(key=tag_key, count=batch_size)
+                if not members or len(members) < batch_size:  # None if the command is disabled
+                    break
+            return
         while True:
-            keys = await self.set_pop(key=self._tags_key_prefix + tag, count=100)
+            keys = await self.set_pop(key=tag_key, count=batch_size)
             if not keys:
                 break
             keys = list(keys)
             await self.delete_many(*keys)
-            if len(keys) != 100:
+            if len(keys) != batch_size:
                 break
 
     async def set(
@@ -107,15 +199,112 @@ class CommandsTagsWrapper(CommandWrapper):
         exist: bool | None = None,
         tags: Tags = (),
     ) -> bool:
+        if not tags:
+            return await super().set(key=key, value=value, expire=expire, exist=exist)
+        if self.tags_mode is TagsMode.VERSIONS:
+            versions = await self.get_many(*[self._tags_version_prefix + tag for tag in tags], default=0)
+            value = TaggedValue(value, tuple(zip(tags, map(_version, versions))))
+            return await super().set(key=key, value=value, expire=expire, exist=exist)
+        tags_keys = [self._tags_key_prefix + tag for tag in tags]
+        backend = self._get_backend(key)
+        if all(self._get_backend(tag_key) is backend for tag_key in tags_keys):
+            # one atomic operation: middlewares see the SET command with tags keys
+            return await self._with_middlewares(Command.SET, key, method="set_with_tags")(
+                key=key,
+                value=value,
+                expire=ttl_to_seconds(expire),
+                exist=exist,
+                tags=tags_keys,
+                tagged_key=key,
+            )
         _set = await super().set(key=key, value=value, expire=expire, exist=exist)
-        if _set and tags:
-            for tag in tags:
-                await self.set_add(self._tags_key_prefix + tag, key, expire=expire)
+        if _set:
+            await self._add_to_tags(key, tags, expire=expire)
         return _set
 
+    async def _add_to_tags(self, key: Key, tags: Tags, expire: TTL = None) -> None:
+        # concurrent calls can be sent with one pipeline (auto pipelining)
+        await asyncio.gather(*[self.set_add(self._tags_key_prefix + tag, key, expire=expire) for tag in tags])
+
     async def incr(self, key: Key, value: int = 1, expire: float | None = None, tags: Tags = ()) -> int:
         _set = await super().incr(key=key, value=value, expire=expire)
-        if _set and tags:
-            for tag in tags:
-                await self.set_add(self._tags_key_prefix + tag, key, expire=expire)
+        # a counter can't hold versions of tags: in VERSIONS mode counters are not invalidated by tags
+        if _set and tags and self.tags_mode is TagsMode.SETS:
+            await self._add_to_tags(key, tags, expire=expire)
         return _set
+
+    async def get(self, key: Key, default: Default | None = None) -> Value | Default | None:
+        if self.tags_mode is TagsMode.VERSIONS and self.get_key_tags(key):
+            return (await self.get_many(key, default=default))[0]
+        value = await super().get(key, default=default)
+        if isinstance(value, TaggedValue):
+            return (await self._check_versions((value,), default))[0]
+        return value
+
+    def get_nowait(self, key: Key, default: Default | None = None) -> Value | Default | None:
+        value = super().get_nowait(key, default=default)
+        if isinstance(value, TaggedValue):
+            raise AwaitRequiredError("versions of tags of the value should be checked")
+        return value
+
+    async def get_many(self, *keys: Key, default: Value | None = None) -> tuple[Value | None, ...]:
+        versions: dict[Tag, int] = {}
+        if self.tags_mode is TagsMode.VERSIONS:
+            # values and versions of their tags (derived from keys) are got with one get_many
+            tags = list(dict.fromkeys(tag for key in keys for tag in self.get_key_tags(key)))
+            if tags:
+                values = await super().get_many(
+                    *keys, *[self._tags_version_prefix + tag for tag in tags], default=_missed
+                )
+                versions = {tag: _version(version) for tag, version in zip(tags, values[len(keys) :])}
+                values = tuple(default if value is _missed else value for value in values[: len(keys)])
+                return await self._check_versions(values, default, versions)
+        values = await super().get_many(*keys, default=default)
+        if not any(isinstance(value, TaggedValue) for value in values):
+            return values
+        return await self._check_versions(values, default)
+
+    async def get_raw(self, key: Key) -> Value:
+        """
+        A tagged value is unwrapped (and checked) if a backend stores objects, serialized values are returned as is
+        """
+        value = await super().get_raw(key)
+        if isinstance(value, TaggedValue):
+            return (await self._check_versions((value,), None))[0]
+        return value
+
+    async def get_match(self, pattern: str, batch_size: int = 100) -> AsyncIterator[tuple[Key, Value]]:
+        async for key, value in super().get_match(pattern, batch_size=batch_size):
+            if isinstance(value, TaggedValue):
+                value = (await self._check_versions((value,), _missed))[0]
+                if value is _missed:
+                    continue
+            yield key, value
+
+    async def _check_versions(
+        self, values: Iterable[Value], default: Value | None, versions: dict[Tag, int] | None = None
+    ) -> tuple[Value | None, ...]:
+        # versions of tags of values which are not got yet are got with one get_many
+        values = tuple(values)
+        versions = dict(versions or {})
+        tags = {
+            tag
+            for value in values
+            if isinstance(value, TaggedValue)
+            for tag, _ in value.versions
+            if tag not in versions
+        }
+        if tags:
+            _tags = list(tags)
+            _versions = await super().get_many(*[self._tags_version_prefix + tag for tag in _tags], default=0)
+            versions.update(zip(_tags, map(_version, _versions)))
+        return tuple(
+            (value.value if all(versions[tag] == version for tag, version in value.versions) else default)
+            if isinstance(value, TaggedValue)
+            else value
+            for value in values
+        )
+
+
+def _version(version: Any) -> int:
+    return 0 if version is _missed or version is None else version
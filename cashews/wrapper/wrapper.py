@@ -1,20 +1,27 @@
 from __future__ import annotations
 
-from functools import partial
+from functools import lru_cache, partial
 from typing import TYPE_CHECKING
 
 from cashews import validation
 from cashews.backends.interface import Backend
+from cashews.backends.transaction import TransactionBackend
 from cashews.commands import Command
-from cashews.exceptions import NotConfiguredError
+from cashews.compressors import CompressorType
+from cashews.exceptions import AwaitRequiredError, NotConfiguredError
 from cashews.picklers import PicklerType
+from cashews.refresh import RefreshScheduler
 from cashews.serialize import get_serializer
+from cashews.singleflight import SingleFlight
+from cashews.utils.radix_tree import RadixTree
 
 from .auto_init import create_auto_init
 from .backend_settings import settings_url_parse
 
 if TYPE_CHECKING:  # pragma: no cover
-    from cashews._typing import Key, Middleware
+    from cashews._typing import AsyncCallable_T, Callable_T, Key, Middleware
+
+_ROUTES_CACHE_SIZE = 1024
 
 
 class Wrapper:
@@ -23,35 +30,82 @@ class Wrapper:
     def __init__(self, name: str = ""):
         self._backends: dict[str, Backend] = {}
         self._middlewares: dict[str, tuple[Middleware, ...]] = {}
-        self._sorted_prefixes: tuple[str, ...] = ()
+        self._route = self._build_router()
+        # compiled middleware chains: (backend id, command) -> (backend, chain)
+        self._chains: dict[tuple[str, Command, str], tuple[Backend, AsyncCallable_T]] = {}
+        self._nowait_chains: dict[tuple[str, Command], tuple[Backend, Callable_T]] = {}
         self._default_middlewares: list[Middleware] = [
             create_auto_init(),
             validation._invalidate_middleware,
         ]
+        # coalesce concurrent decorated calls and get_or_set with the same key
+        self.singleflight = SingleFlight()
+        # background refreshes of decorated calls (early, hit)
+        self.refresher = RefreshScheduler()
         self.name = name
         super().__init__()
 
     def add_middleware(self, middleware: Middleware) -> None:
         self._default_middlewares.append(middleware)
+        self._reset_chains()
+
+    def _reset_chains(self) -> None:
+        self._chains = {}
+        self._nowait_chains = {}
 
     def _get_backend(self, key: Key) -> Backend:
-        for prefix in self._sorted_prefixes:
-            if key.startswith(prefix):
-                return self._backends[prefix]
+        prefix = self._route(key)
+        if prefix is not None:
+            return self._backends[prefix]
         self._check_setup()
         raise NotConfiguredError("Backend for given key not configured")
 
-    def _with_middlewares(self, cmd: Command, key: Key):
+    def _build_router(self):
+        # the longest configured prefix of a key, recently resolved keys are cached
+        tree: RadixTree[str] = RadixTree()
+        for prefix in self._backends:
+            tree.insert(prefix, prefix)
+        return lru_cache(maxsize=_ROUTES_CACHE_SIZE)(tree.longest_prefix)
+
+    def _with_middlewares(self, cmd: Command, key: Key, method: str = ""):
+        """
+        A call of the backend command through middlewares,
+        `method` - a backend method to call instead of the command one (middlewares get the command)
+        """
         backend = self._get_backend(key)
+        chain = self._chains.get((backend._id, cmd, method))
+        if chain is not None and chain[0] is backend:
+            return chain[1]
         middlewares = [*self._default_middlewares, *self._middlewares[backend._id]]
-        return self._with_middlewares_for_backend(cmd, backend, middlewares)
+        call = self._with_middlewares_for_backend(cmd, backend, middlewares, method=method)
+        # a transaction backend has the same id as a wrapped one and lives only for its transaction: not cached
+        if not isinstance(backend, TransactionBackend):
+            self._chains[(backend._id, cmd, method)] = (backend, call)
+        return call
 
-    def _with_middlewares_for_backend(self, cmd: Command, backend, middlewares):
-        call = getattr(backend, cmd.value)
+    def _with_middlewares_for_backend(self, cmd: Command, backend, middlewares, method: str = ""):
+        call = getattr(backend, method or cmd.value)
         for middleware in middlewares:
             call = partial(middleware, call, cmd, backend)
         return call
 
+    def _with_middlewares_nowait(self, cmd: Command, key: Key):
+        backend = self._get_backend(key)
+        chain = self._nowait_chains.get((backend._id, cmd))
+        if chain is not None and chain[0] is backend:
+            return chain[1]
+        call = getattr(backend, f"{cmd.value}_nowait", None)
+        if call is None:
+            raise AwaitRequiredError(f"{type(backend).__name__} doesn't support nowait {cmd.value}")
+        for middleware in (*self._default_middlewares, *self._middlewares[backend._id]):
+            nowait = getattr(middleware, "nowait", None)
+            if nowait is None:
+                raise AwaitRequiredError(f"middleware {middleware} doesn't support nowait commands")
+            call = partial(nowait, call, cmd, backend)
+        if not isinstance(backend, TransactionBackend):
+            self._nowait_chains[(backend._id, cmd)] = (backend, call)
+        return call
+
     def setup(
         self,
         settings_url: str,
@@ -63,12 +117,17 @@ class Wrapper:
         params.update(kwargs)
 
         disable = params.pop("disable") if "disable" in params else not params.pop("enable", True)
+        compress = params.pop("compress", None)
 
         serializer = get_serializer(
             secret=params.pop("secret", None),
             digestmod=params.pop("digestmod", b"md5"),
             check_repr=params.pop("check_repr", True),
             pickle_type=PicklerType(params.pop("pickle_type", pickle_type)),
+            compress=CompressorType(compress) if compress else None,
+            compress_min_size=params.pop("compress_min_size", None),
+            compress_dict=params.pop("compress_dict", False),
+            compress_dict_samples=params.pop("compress_dict_samples", 1000),
         )
         backend = backend_class(**params, serializer=serializer)
         if disable:
@@ -86,7 +145,8 @@ class Wrapper:
     def _add_backend(self, backend: Backend, middlewares=(), prefix: str = default_prefix) -> None:
         self._backends[prefix] = backend
         self._middlewares[backend._id] = middlewares
-        self._sorted_prefixes = tuple(sorted(self._backends.keys(), reverse=True))
+        self._route = self._build_router()
+        self._reset_chains()
 
     async def init(self, *args, **kwargs) -> None:
         if args or kwargs:
@@ -0,0 +1,79 @@
+"""
+Throughput of concurrent single-key gets with and without auto batching into one MGET
+
+Without an argument a round trip is simulated: a pool of 10 connections and 0.5ms latency per command.
+With a redis url as an argument (e.g. redis://localhost:6379/0) the Redis backend is measured
+"""
+
+import asyncio
+import sys
+import time
+
+from cashews.batching import GetBatcher
+
+CONCURRENCY = (1, 10, 100, 1000)
+GETS = 5_000
+LATENCY = 0.0005
+CONNECTIONS = 10
+
+
+class _SimulatedRedis:
+    def __init__(self):
+        self._pool = asyncio.Semaphore(CONNECTIONS)
+
+    async def get(self, key):
+        async with self._pool:
+            await asyncio.sleep(LATENCY)
+            return b"value"
+
+    async def mget(self, keys):
+        async with self._pool:
+            await asyncio.sleep(LATENCY)
+            return [b"value"] * len(keys)
+
+
+async def _run(get, concurrency: int) -> float:
+    async def worker(count):
+        for i in range(count):
+            await get(f"key:{i % 100}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker(GETS // concurrency) for _ in range(concurrency)])
+    return GETS / (time.perf_counter() - start)
+
+
+async def _simulated():
+    client = _SimulatedRedis()
+    batcher = GetBatcher(client.mget)
+    for concurrency in CONCURRENCY:
+        plain = await _run(client.get, concurrency)
+        batched = await _run(batcher.get, concurrency)
+        print(f"{concurrency:>12} {plain:>12.0f} {batched:>12.0f} {batched / plain:>8.1f}x")
+
+
+async def _redis(url: str):
+    from cashews.backends.redis import Redis
+
+    plain = Redis(url, suppress=False)
+    batched = Redis(url, suppress=False, auto_batch=True)
+    await plain.init()
+    await batched.init()
+    await plain.set_many({f"key:{i}": i for i in range(100)})
+    for concurrency in CONCURRENCY:
+        plain_rate = await _run(plain.get, concurrency)
+        batched_rate = await _run(batched.get, concurrency)
+        print(f"{concurrency:>12} {plain_rate:>12.0f} {batched_rate:>12.0f} {batched_rate / plain_rate:>8.1f}x")
+    await plain.close()
+    await batched.close()
+
+
+async def main():
+    print(f"{'concurrency':>12} {'get/s':>12} {'batched/s':>12} {'speedup':>9}")
+    if len(sys.argv) > 1:
+        await _redis(sys.argv[1])
+    else:
+        await _simulated()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+Bytes on wire and CPU time per set/get of a ~40KB pickled value for every compressor,
+and average bytes of small similar values compressed with and without a trained dictionary
+Compressors with missing dependencies are skipped
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from cashews.backends.memory import Memory
+from cashews.compressors import CompressorType
+from cashews.exceptions import UnsupportedCompressorError
+from cashews.picklers import PicklerType
+from cashews.serialize import get_serializer
+
+ITERATIONS = 500
+VALUE = {
+    "items": [
+        {"id": i, "name": f"item {i}", "price": i * 1.5, "tags": ["new", "sale"], "description": "lorem ipsum " * 5}
+        for i in range(900)
+    ]
+}
+
+
+async def _measure(compress: CompressorType | None) -> tuple[int, float, float]:
+    serializer = get_serializer(secret="secret", pickle_type=PicklerType.DEFAULT, compress=compress)
+    backend = Memory()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        encoded = await serializer.encode(backend, "key", VALUE, None)
+    encode = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await serializer.decode(backend, "key", encoded, None)
+    decode = time.perf_counter() - start
+    return len(encoded), encode / ITERATIONS * 1e6, decode / ITERATIONS * 1e6
+
+
+def _user(i: int) -> dict:
+    return {"id": i, "name": f"user {i}", "email": f"user{i}@example.com", "is_active": True, "roles": ["admin"]}
+
+
+async def _measure_small(compress: CompressorType | None, compress_dict: bool) -> float:
+    serializer = get_serializer(
+        secret="secret",
+        pickle_type=PicklerType.DEFAULT,
+        compress=compress,
+        compress_min_size=0,
+        compress_dict=compress_dict,
+    )
+    backend = Memory()
+    for i in range(1000):  # samples to train a dictionary
+        await serializer.encode(backend, "key", _user(i), None)
+    sizes = [len(await serializer.encode(backend, "key", _user(i), None)) for i in range(1000, 2000)]
+    return sum(sizes) / len(sizes)
+
+
+async def main():
+    print(f"{'compress':>8} {'bytes':>8} {'set us':>8} {'get us':>8}")
+    for compress in (None, *CompressorType):
+        try:
+            size, encode, decode = await _measure(compress)
+        except UnsupportedCompressorError:
+            continue
+        print(f"{compress.value if compress else '-':>8} {size:>8} {encode:>8.1f} {decode:>8.1f}")
+
+    print()
+    print(f"{'compress':>8} {'dict':>5} {'avg bytes of a small value':>27}")
+    for compress in (None, CompressorType.ZLIB, CompressorType.ZSTD):
+        for compress_dict in (False, True) if compress else (False,):
+            try:
+                size = await _measure_small(compress, compress_dict)
+            except UnsupportedCompressorError:
+                continue
+            print(f"{compress.value if compress else '-':>8} {str(compress_dict):>5} {size:>27.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
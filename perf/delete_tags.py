@@ -0,0 +1,42 @@
+"""
+Invalidation of a tag with many keys: tags in the backend of keys (pop and delete with one command)
+vs tags in a separate backend (pop, then delete), for different batch sizes
+
+With a redis url as an argument (e.g. redis://localhost:6379/0) the Redis backend is measured
+"""
+
+import asyncio
+import sys
+import time
+
+from cashews import Cache
+
+KEYS = 100_000
+
+
+async def _measure(cache: Cache, batch_size: int) -> float:
+    cache.register_tag("tag", "key:{i}")
+    for start in range(0, KEYS, 1000):
+        await asyncio.gather(*[cache.set(f"key:{i}", i, tags=["tag"]) for i in range(start, start + 1000)])
+    begin = time.perf_counter()
+    await cache.delete_tags("tag", batch_size=batch_size)
+    return time.perf_counter() - begin
+
+
+async def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else "mem://?size=1000000"
+    print(f"{'tags':>10} {'batch':>6} {'seconds':>8}")
+    for separate in (False, True):
+        for batch_size in (100, 1000, 10_000):
+            cache = Cache()
+            cache.setup(url)
+            if separate:
+                cache.setup_tags_backend("mem://?size=1000000")
+            await cache.clear()
+            spent = await _measure(cache, batch_size)
+            print(f"{'separate' if separate else 'same':>10} {batch_size:>6} {spent:>8.2f}")
+            await cache.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""
+Latency of a cache hit in the in-memory backend: async get vs sync get_nowait
+"""
+
+import asyncio
+import time
+
+from cashews import Cache
+
+ITERATIONS = 200_000
+
+
+def _report(name: str, spent: float) -> None:
+    print(f"{name:>24} {spent / ITERATIONS * 1e9:>10.0f}")
+
+
+async def main():
+    cache = Cache()
+    await cache.init("mem://")
+    backend = cache._backends[""]
+    await cache.set("key", {"value": 1})
+
+    print(f"{'call':>24} {'ns per hit':>10}")
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await cache.get("key")
+    _report("await cache.get", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        cache.get_nowait("key")
+    _report("cache.get_nowait", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await backend.get("key")
+    _report("await backend.get", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        backend.get_nowait("key")
+    _report("backend.get_nowait", time.perf_counter() - start)
+    await cache.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
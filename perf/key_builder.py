@@ -0,0 +1,52 @@
+"""
+Cost of building a cache key for a decorated function call: generic formatting (signature binding and
+string.Formatter) vs a compiled key template
+"""
+
+import time
+
+from cashews.formatter import default_format
+from cashews.key import _get_call_values, get_cache_key, get_cache_key_template
+
+ITERATIONS = 100_000
+
+
+class Service:
+    async def get_user(self, user_id: int, fields=("name", "email"), *, locale="en"): ...
+
+
+async def search(query, page=1, limit=20): ...
+
+
+CASES = (
+    ("default template", Service.get_user, None, (Service(), 10), {"locale": "de"}),
+    ("positional args", search, "search:{query}:{page}:{limit}", ("cashews", 2), {}),
+    ("keyword args", search, "search:{query}:{page}", (), {"query": "cashews", "page": 2}),
+    ("format functions", search, "search:{query:hash}:{page}:{query:lower}", ("Cashews",), {"limit": 5}),
+)
+
+
+def _generic(func, template, args, kwargs):
+    key_values = _get_call_values(func, args, kwargs) if args else kwargs
+    return default_format(template, **key_values)
+
+
+def _measure(build, func, template, args, kwargs) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        build(func, template, args, kwargs)
+    return (time.perf_counter() - start) / ITERATIONS * 1e9
+
+
+def main():
+    print(f"{'case':>17} {'generic, ns':>12} {'compiled, ns':>13} {'speedup':>8}")
+    for name, func, key, args, kwargs in CASES:
+        template = get_cache_key_template(func, key=key)
+        assert get_cache_key(func, template, args, kwargs) == _generic(func, template, args, kwargs)
+        generic = _measure(_generic, func, template, args, kwargs)
+        compiled = _measure(get_cache_key, func, template, args, kwargs)
+        print(f"{name:>17} {generic:>12.0f} {compiled:>13.0f} {generic / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
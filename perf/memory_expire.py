@@ -0,0 +1,45 @@
+"""
+Cost of one sweep of expired keys in the Memory backend depending on a store size
+(1% of keys are expired, the rest have a long ttl)
+"""
+
+import asyncio
+import time
+
+from cashews.backends.memory import Memory
+
+
+async def _fill(size: int) -> Memory:
+    backend = Memory(size=size * 2, check_interval=0)
+    expired = size // 100
+    for i in range(size - expired):
+        await backend.set(f"key:{i}", i, expire=3600)
+    for i in range(expired):
+        await backend.set(f"expired:{i}", i, expire=0.001)
+    await asyncio.sleep(0.01)
+    return backend
+
+
+async def _full_scan(backend: Memory) -> None:
+    # the previous implementation: touch every key of the store
+    for key in dict(backend.store):
+        await backend.get(key)
+
+
+async def main():
+    print(f"{'store size':>12} {'index sweep, ms':>16} {'full scan, ms':>16}")
+    for size in (10_000, 100_000, 1_000_000):
+        backend = await _fill(size)
+        start = time.perf_counter()
+        await backend._expire_keys()
+        index_sweep = time.perf_counter() - start
+
+        backend = await _fill(size)
+        start = time.perf_counter()
+        await _full_scan(backend)
+        full_scan = time.perf_counter() - start
+        print(f"{size:>12} {index_sweep * 1000:>16.2f} {full_scan * 1000:>16.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+"""
+Cost of set/get in the Memory backend for each value isolation mode
+"""
+
+import asyncio
+import time
+
+from cashews.backends.memory import Memory
+
+MODES = ("none", "shallow", "deepcopy", "frozen-bytes")
+VALUES = {
+    "int": 42,
+    "str": "x" * 100,
+    "list[100]": list(range(100)),
+    "nested dict": {f"field_{i}": {"id": i, "tags": ["a", "b"], "name": f"name {i}"} for i in range(20)},
+}
+ITERATIONS = 20_000
+
+
+async def _measure(mode: str, value) -> tuple[float, float]:
+    backend = Memory(size=ITERATIONS, check_interval=0, isolation=mode)
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        await backend.set(f"key:{i}", value)
+    set_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        await backend.get(f"key:{i}")
+    get_time = time.perf_counter() - start
+    return set_time / ITERATIONS * 1e6, get_time / ITERATIONS * 1e6
+
+
+async def main():
+    print(f"{'value':>12} {'isolation':>13} {'set, us':>9} {'get, us':>9}")
+    for value_name, value in VALUES.items():
+        for mode in MODES:
+            set_us, get_us = await _measure(mode, value)
+            print(f"{value_name:>12} {mode:>13} {set_us:>9.2f} {get_us:>9.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""
+Hit ratio of the Memory backend eviction policies on synthetic traces
+"""
+
+import itertools
+import random
+import time
+
+from cashews.backends.eviction import get_eviction_policy
+
+POLICIES = ("lru", "lfu", "tinylfu", "s3fifo")
+UNIVERSE = 100_000
+REQUESTS = 1_000_000
+CACHE_SIZE = 1_000
+
+
+def zipf_trace(alpha: float = 0.99, seed: int = 1):
+    rnd = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1 / (rank**alpha) for rank in range(1, UNIVERSE + 1)))
+    return rnd.choices(range(UNIVERSE), cum_weights=cum_weights, k=REQUESTS)
+
+
+def scan_trace(scan_every: int = 10_000, scan_length: int = 5_000):
+    # zipfian workload mixed with sequential scans of keys that will never be requested again
+    trace = []
+    scan_key = UNIVERSE
+    for i, key in enumerate(zipf_trace(seed=2)):
+        trace.append(key)
+        if i % scan_every == 0:
+            trace.extend(range(scan_key, scan_key + scan_length))
+            scan_key += scan_length
+    return trace
+
+
+def replay(policy_name: str, trace) -> tuple[float, float]:
+    policy = get_eviction_policy(policy_name, CACHE_SIZE)
+    cached = set()
+    hits = 0
+    start = time.perf_counter()
+    for key in trace:
+        if key in cached:
+            hits += 1
+            policy.access(key)
+        else:
+            cached.add(key)
+            cached.difference_update(policy.insert(key))
+    return hits / len(trace), time.perf_counter() - start
+
+
+def main():
+    traces = {"zipf 0.99": zipf_trace(), "zipf + scans": scan_trace()}
+    print(f"{'trace':>14} {'policy':>8} {'hit ratio':>10} {'time, s':>8}")
+    for trace_name, trace in traces.items():
+        for policy in POLICIES:
+            ratio, spent = replay(policy, trace)
+            print(f"{trace_name:>14} {policy:>8} {ratio:>10.4f} {spent:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Overhead of the cache wrapper (middleware chain) per command depending on a number of custom middlewares
+"""
+
+import asyncio
+import time
+
+from cashews import Cache
+
+ITERATIONS = 100_000
+
+
+async def _pass_through(call, cmd, backend, *args, **kwargs):
+    return await call(*args, **kwargs)
+
+
+async def _measure(call) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await call("key")
+    return (time.perf_counter() - start) / ITERATIONS * 1e9
+
+
+async def main():
+    print(f"{'middlewares':>12} {'cache.get, ns':>14} {'backend.get, ns':>16} {'overhead, ns':>13}")
+    for count in (0, 3, 6):
+        cache = Cache()
+        backend = cache.setup("mem://", middlewares=(_pass_through,) * count)
+        await cache.init()
+        await cache.set("key", "value")
+        wrapped = await _measure(cache.get)
+        raw = await _measure(backend.get)
+        print(f"{count:>12} {wrapped:>14.0f} {raw:>16.0f} {wrapped - raw:>13.0f}")
+        await cache.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""
+Cost of routing a key to a backend depending on a number of configured prefixes:
+linear scan of prefixes vs radix tree vs radix tree with a cache of resolved keys
+"""
+
+import time
+
+from cashews import Cache
+from cashews.utils.radix_tree import RadixTree
+
+ITERATIONS = 100_000
+KEYS = 100
+
+
+def _linear(prefixes):
+    sorted_prefixes = tuple(sorted(prefixes, reverse=True))
+
+    def route(key):
+        for prefix in sorted_prefixes:
+            if key.startswith(prefix):
+                return prefix
+        return None
+
+    return route
+
+
+def _tree(prefixes):
+    tree = RadixTree()
+    for prefix in prefixes:
+        tree.insert(prefix, prefix)
+    return tree.longest_prefix
+
+
+def _measure(route, keys) -> float:
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        route(keys[i % KEYS])
+    return (time.perf_counter() - start) / ITERATIONS * 1e9
+
+
+def main():
+    print(f"{'prefixes':>9} {'linear, ns':>11} {'tree, ns':>9} {'tree+lru, ns':>13}")
+    for count in (1, 10, 100):
+        cache = Cache()
+        cache.setup("mem://")
+        for i in range(1, count):
+            cache.setup("mem://", prefix=f"service{i}:")
+        prefixes = list(cache._backends)
+        # keys of the default backend walk through all prefixes in a linear scan
+        keys = [f"user:{i}" for i in range(KEYS)]
+        linear = _measure(_linear(prefixes), keys)
+        tree = _measure(_tree(prefixes), keys)
+        cached = _measure(cache._route, keys)
+        print(f"{count:>9} {linear:>11.0f} {tree:>9.0f} {cached:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
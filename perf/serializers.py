@@ -0,0 +1,88 @@
+"""
+Size and encode/decode time of typical API payloads (a user profile, a page of orders) for every pickle type,
+and of primitive values (str, float, bool, None) stored with a type tag vs pickled (without a sign)
+Pickle types with missing dependencies are skipped
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from cashews.backends.memory import Memory
+from cashews.exceptions import UnsupportedPicklerError
+from cashews.picklers import Pickler, PicklerType
+from cashews.serialize import get_serializer
+
+ITERATIONS = 2_000
+
+
+def _user(i: int) -> dict:
+    return {
+        "id": i,
+        "uuid": str(uuid.UUID(int=i)),
+        "name": f"user {i}",
+        "email": f"user{i}@example.com",
+        "is_active": True,
+        "rating": 4.5,
+        "roles": ["admin", "editor"],
+        "created_at": (datetime(2024, 1, 1) + timedelta(minutes=i)).isoformat(),
+        "address": {"city": "Amsterdam", "street": "Main st", "zip": "1000AA"},
+    }
+
+
+def _orders() -> dict:
+    return {
+        "page": 1,
+        "total": 100,
+        "items": [
+            {"id": i, "user": _user(i), "amount": 10.5 * i, "items": list(range(10)), "status": "paid"}
+            for i in range(50)
+        ],
+    }
+
+
+PAYLOADS = {"user": _user(1), "orders": _orders()}
+PRIMITIVES = {"str": "user@example.com", "float": 4.5, "flag": True, "none": None}
+
+
+class _UntaggedPickler(Pickler):
+    tag_primitives = False
+
+
+async def _measure(pickle_type: PicklerType, payload, pickler=None, secret="secret") -> tuple[int, float, float]:
+    serializer = get_serializer(secret=secret, pickle_type=pickle_type)
+    if pickler is not None:
+        serializer.set_pickler(pickler)
+    backend = Memory()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        encoded = await serializer.encode(backend, "key", payload, None)
+    encode = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await serializer.decode(backend, "key", encoded, None)
+    decode = time.perf_counter() - start
+    return len(encoded), encode / ITERATIONS * 1e6, decode / ITERATIONS * 1e6
+
+
+async def main():
+    print(f"{'payload':>8} {'pickle type':>12} {'bytes':>8} {'encode us':>10} {'decode us':>10}")
+    for name, payload in PAYLOADS.items():
+        for pickle_type in (PicklerType.DEFAULT, PicklerType.JSON, PicklerType.ORJSON, PicklerType.MSGPACK):
+            try:
+                size, encode, decode = await _measure(pickle_type, payload)
+            except UnsupportedPicklerError:
+                continue
+            print(f"{name:>8} {pickle_type.value:>12} {size:>8} {encode:>10.1f} {decode:>10.1f}")
+
+    print()
+    print(f"{'value':>8} {'':>12} {'bytes':>8} {'encode us':>10} {'decode us':>10}")
+    for name, value in PRIMITIVES.items():
+        for title, pickler in (("pickled", _UntaggedPickler), ("tagged", None)):
+            size, encode, decode = await _measure(PicklerType.DEFAULT, value, pickler, secret=None)
+            print(f"{name:>8} {title:>12} {size:>8} {encode:>10.1f} {decode:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+"""
+Throughput of get commands from several threads (every thread runs its own event loop)
+sharing one ShardedMemory backend: a single shard (one lock) vs lock striping
+"""
+
+import asyncio
+import threading
+import time
+
+from cashews.backends.sharded_memory import ShardedMemory
+
+KEYS = 10_000
+OPERATIONS = 50_000
+
+
+def _bench(shards: int, threads: int) -> float:
+    backend = ShardedMemory(size=KEYS, shards=shards)
+
+    async def _fill():
+        for i in range(KEYS):
+            await backend.set(f"key:{i}", i)
+
+    asyncio.run(_fill())
+
+    def worker(num: int):
+        async def _get():
+            for i in range(OPERATIONS):
+                await backend.get(f"key:{(i * 7 + num) % KEYS}")
+
+        asyncio.run(_get())
+
+    workers = [threading.Thread(target=worker, args=(num,)) for num in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * OPERATIONS / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'threads':>8} {'shards':>7} {'ops/s':>10}")
+    for threads in (1, 2, 4, 8):
+        for shards in (1, 16):
+            print(f"{threads:>8} {shards:>7} {_bench(shards, threads):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Latency of get/set commands of the shared memory backend compared with the in-memory backend
+(both with the default pickle serializer)
+"""
+
+import asyncio
+import os
+import time
+
+from cashews.backends.memory import Memory
+from cashews.backends.shared_memory import SharedMemory
+from cashews.serialize import DEFAULT_SERIALIZER
+
+KEYS = 10_000
+VALUE = {"id": 1, "name": "name", "tags": ["a", "b", "c"]}
+
+
+async def _measure(backend) -> tuple[float, float]:
+    start = time.perf_counter()
+    for i in range(KEYS):
+        await backend.set(f"key:{i}", VALUE)
+    set_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(KEYS):
+        await backend.get(f"key:{i}")
+    get_time = time.perf_counter() - start
+    return set_time / KEYS * 1e6, get_time / KEYS * 1e6
+
+
+async def main():
+    shm = SharedMemory(name=f"cashews-perf-{os.getpid()}", size=KEYS * 2)
+    await shm.init()
+    backends = {
+        "mem": Memory(size=KEYS * 2, check_interval=0, serializer=DEFAULT_SERIALIZER),
+        "shm": shm,
+    }
+    print(f"{'backend':>8} {'set, us':>9} {'get, us':>9}")
+    try:
+        for name, backend in backends.items():
+            set_us, get_us = await _measure(backend)
+            print(f"{name:>8} {set_us:>9.2f} {get_us:>9.2f}")
+    finally:
+        await shm.close()
+        shm.unlink()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+"""
+Time to sign and to check a sign of 1KB - 1MB values: the text sign ("md5:<hex sign>_<value>")
+vs the binary sign for every digestmod
+"""
+
+import time
+
+from cashews.serialize import HashSigner
+
+SIZES = (1024, 10 * 1024, 100 * 1024, 1024 * 1024)
+SECRET = b"secret"
+
+
+def _text_sign(signer: HashSigner, key: str, value: bytes) -> bytes:
+    return b"md5:" + signer._gen_sign(key, value, b"md5") + b"_" + value
+
+
+def _time(iterations: int, call, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call(*args)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    print(f"{'size':>8} {'sign':>10} {'sign us':>10} {'check us':>10}")
+    for size in SIZES:
+        value = b"v" * size
+        iterations = max(10, 10_000_000 // size)
+        signer = HashSigner(SECRET, b"md5")
+        signed = _text_sign(signer, "key", value)
+        sign = _time(iterations, _text_sign, signer, "key", value)
+        check = _time(iterations, signer.check_sign, "key", signed)
+        print(f"{size:>8} {'md5 text':>10} {sign:>10.1f} {check:>10.1f}")
+        for digestmod in (b"md5", b"sha256", b"blake2b"):
+            signer = HashSigner(SECRET, digestmod)
+            signed = signer.sign("key", value)
+            sign = _time(iterations, signer.sign, "key", value)
+            check = _time(iterations, signer.check_sign, "key", signed)
+            print(f"{size:>8} {digestmod.decode():>10} {sign:>10.1f} {check:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
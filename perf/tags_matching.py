@@ -0,0 +1,49 @@
+"""
+Latency of get_key_tags with 500 registered templates: a scan of all patterns vs the prefix-indexed matcher,
+for unique keys (no memoization) and for repeated (hot) keys
+"""
+
+import time
+
+from cashews import Cache
+from cashews.wrapper.tags import TagsRegistry
+
+TEMPLATES = 500
+ITERATIONS = 20_000
+
+
+def _scan_all(registry: TagsRegistry, key: str) -> list:
+    tags = []
+    for tag, patterns in registry._registry_template.items():
+        for pattern in patterns:
+            if pattern.fullmatch(key):
+                tags.append(tag)
+                break
+    return tags
+
+
+def _report(name: str, call, keys) -> None:
+    start = time.perf_counter()
+    for key in keys:
+        call(key)
+    spent = time.perf_counter() - start
+    print(f"{name:>28} {spent / len(keys) * 1e6:>10.2f}")
+
+
+def main():
+    cache = Cache()
+    for i in range(TEMPLATES):
+        cache.register_tag(f"tag{i}:{{id}}", f"service{i}:user:{{id}}")
+    registry = cache._tags_registry
+    unique_keys = [f"service{i % TEMPLATES}:user:{i}" for i in range(ITERATIONS)]
+    hot_keys = [f"service{i % 10}:user:{i % 10}" for i in range(ITERATIONS)]
+
+    print(f"{'':>28} {'us per key':>10}")
+    _report("scan all patterns, unique", lambda key: _scan_all(registry, key), unique_keys)
+    _report("get_key_tags, unique", cache.get_key_tags, unique_keys)
+    _report("scan all patterns, hot", lambda key: _scan_all(registry, key), hot_keys)
+    _report("get_key_tags, hot", cache.get_key_tags, hot_keys)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ import pytest
 
 from cashews import Cache
 from cashews.backends.memory import Memory
+from cashews.backends.sharded_memory import ShardedMemory
 from cashews.backends.transaction import TransactionBackend
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -49,6 +50,8 @@ def backend_factory():
     # scope="session",
     params=[
         "memory",
+        "sharded_memory",
+        "shared_memory",
         "transactional",
         pytest.param("redis", marks=pytest.mark.redis),
         pytest.param("redis_cs", marks=pytest.mark.redis),
@@ -84,6 +87,13 @@ async def _backend(request, redis_dsn, backend_factory):
         backend._expire_for_recently_update = 0.1
     elif request.param == "transactional":
         backend = TransactionBackend(backend_factory(Memory))
+    elif request.param == "shared_memory":
+        from cashews.backends.shared_memory import SharedMemory
+
+        # tag sets of tests are bigger than the default slot
+        backend = backend_factory(SharedMemory, name=f"cashews-test-{os.getpid()}", slot_size=8192)
+    elif request.param == "sharded_memory":
+        backend = backend_factory(ShardedMemory, shards=4, check_interval=0.01)
     else:
         backend = backend_factory(Memory, check_interval=0.01)
     try:
@@ -91,6 +101,8 @@ async def _backend(request, redis_dsn, backend_factory):
         yield backend, request.param
     finally:
         await backend.close()
+        if request.param == "shared_memory":
+            backend.unlink()
 
 
 @pytest.fixture(name="target")
@@ -6,6 +6,7 @@ import pytest
 from cashews import Cache
 from cashews.backends.interface import NOT_EXIST, UNLIMITED
 from cashews.backends.memory import Memory
+from cashews.utils import estimate_obj_size, get_obj_size
 
 VALUE = Decimal("100.2")
 
@@ -332,3 +333,156 @@ async def test_lru2(backend_factory):
         assert await cache.get(f"key:{i}") == i
 
     await cache.close()
+
+
+async def test_remove_expired(backend_factory):
+    cache = backend_factory(Memory, check_interval=0.01)
+    await cache.init()
+    await cache.set("key", "value", expire=0.01)
+    await cache.set("key:rewrite", "value", expire=0.01)
+    await cache.set("key:rewrite", "value", expire=10)
+    await cache.set("key:forever", "value")
+
+    await asyncio.sleep(0.05)
+    assert set(cache.store) == {"key:rewrite", "key:forever"}
+
+    await cache.close()
+
+
+async def test_expirations_heap_compaction(backend_factory):
+    cache = backend_factory(Memory, check_interval=0)
+    for _ in range(2000):
+        await cache.set("key", "value", expire=10)
+
+    assert len(cache._expirations) <= 2 * len(cache.store) + 1000
+    assert await cache.get_expire("key") == 10
+
+
+async def test_max_bytes(backend_factory):
+    cache = backend_factory(Memory, size=1000, max_bytes=10_000)
+    for i in range(20):
+        await cache.set(f"key:{i}", b"x" * 1000)
+        assert await cache.get_bytes_used() <= 10_000
+
+    assert 0 < len(cache.store) < 10
+    assert await cache.get("key:0") is None
+    assert await cache.get("key:19") == b"x" * 1000
+
+    await cache.delete("key:19")
+    await cache.clear()
+    assert await cache.get_bytes_used() == 0
+
+
+async def test_max_bytes_lru(backend_factory):
+    cache = backend_factory(Memory, size=1000, max_bytes=5000)
+    await cache.set("key:0", b"x" * 1000)
+    await cache.set("key:1", b"x" * 1000)
+    await cache.get("key:0")
+    for i in range(2, 5):
+        await cache.set(f"key:{i}", b"x" * 1000)
+
+    assert await cache.get("key:0") == b"x" * 1000
+    assert await cache.get("key:1") is None
+
+
+async def test_max_bytes_big_value(backend_factory):
+    cache = backend_factory(Memory, size=1000, max_bytes=500)
+    await cache.set("key", b"x" * 1000)
+    assert await cache.get("key") is None
+    assert await cache.get_bytes_used() == 0
+
+
+def test_estimate_nested_obj_size():
+    value = {"items": [{"id": i, "payload": [b"x" * 100] * 3} for i in range(100)]}
+    # items are followed recursively and shared objects are counted once, like by get_obj_size
+    assert estimate_obj_size(value) == pytest.approx(get_obj_size(value), rel=0.05)
+
+
+async def test_max_bytes_nested_values(backend_factory):
+    cache = backend_factory(Memory, size=1000, max_bytes=50_000)
+    for i in range(20):
+        await cache.set(f"key:{i}", {"items": [{"id": j, "name": f"name:{i}:{j}" * 10} for j in range(20)]})
+        assert await cache.get_bytes_used() <= 50_000
+    assert len(cache.store) < 20
+
+
+async def test_max_bytes_set_updated_in_place(backend_factory, monkeypatch):
+    cache = backend_factory(Memory, size=1000, max_bytes=10_000_000)
+    await cache.set_add("set", *[f"member:{i}" for i in range(1000)])
+
+    estimated = []
+
+    def _estimate(obj):
+        estimated.append(obj)
+        return estimate_obj_size(obj)
+
+    monkeypatch.setattr("cashews.backends.memory.estimate_obj_size", _estimate)
+    await cache.set_add("set", "member:0", "new")
+    assert estimated == ["new"]  # the set is not estimated again
+    monkeypatch.undo()
+    await cache.set_remove("set", "member:1", "missing")
+    await cache.set_pop("set", count=10)
+    assert await cache.get_bytes_used() == estimate_obj_size("set") + estimate_obj_size(cache.store["set"][1])
+
+    await cache.delete("set")
+    assert await cache.get_bytes_used() == 0
+
+
+async def test_isolation_none(backend_factory):
+    cache = backend_factory(Memory, isolation="none")
+    obj = [1, 2, 3]
+    await cache.set("key", obj)
+    assert await cache.get("key") is obj
+
+
+async def test_isolation_shallow(backend_factory):
+    cache = backend_factory(Memory, isolation="shallow")
+    obj = [[1], 2, 3]
+    await cache.set("key", obj)
+    obj.append(4)
+    obj[0].append(2)
+    assert await cache.get("key") == [[1, 2], 2, 3]
+
+
+@pytest.mark.parametrize("isolation", ("deepcopy", "frozen-bytes"))
+async def test_isolation_nested_mutation(backend_factory, isolation):
+    cache = backend_factory(Memory, isolation=isolation)
+    obj = {"list": [1, 2, 3]}
+    await cache.set("key", obj)
+    obj["list"].append(4)
+    value = await cache.get("key")
+    assert value == {"list": [1, 2, 3]}
+
+    value["list"].append(5)
+    assert await cache.get("key") == {"list": [1, 2, 3]}
+
+
+async def test_isolation_frozen_bytes_commands(backend_factory):
+    cache = backend_factory(Memory, isolation="frozen-bytes")
+    await cache.set("bytes", b"value")
+    await cache.set_raw("raw", b"raw")
+    await cache.set_add("set", "a", "b")
+    await cache.incr("counter")
+
+    assert await cache.get("bytes") == b"value"
+    assert await cache.get_raw("raw") == b"raw"
+    assert await cache.get("set") == {"a", "b"}
+    assert await cache.get("counter") == 1
+    assert await cache.incr_bits("bits", 3) == (1,)
+    assert await cache.get_bits("bits", 3) == (1,)
+
+
+async def test_isolation_unknown(backend_factory):
+    with pytest.raises(ValueError):
+        backend_factory(Memory, isolation="unknown")
+
+
+async def test_set_pop_delete(cache: Cache):
+    await cache.set_many({"key1": "value", "key2": "value", "key3": "value"})
+    await cache.set_add("set", "key1", "key2", "key3")
+
+    popped = await cache.set_pop_delete("set", count=2)
+    assert len(popped) == 2
+    assert await cache.get_many(*popped) == (None, None)
+    assert await cache.set_pop_delete("set") == list({"key1", "key2", "key3"} - set(popped))
+    assert await cache.set_pop_delete("set") == []
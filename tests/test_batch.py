@@ -0,0 +1,62 @@
+from unittest.mock import Mock
+
+import pytest
+
+from cashews import Cache, Command
+
+
+async def test_batch(cache: Cache):
+    mock = Mock()
+
+    @cache.batch(ttl=10, items="ids", key="user:{ids}")
+    async def get_users(ids, lang="en"):
+        mock(list(ids))
+        return {_id: f"user{_id}:{lang}" for _id in ids if _id != 0}
+
+    assert await get_users([1, 2]) == {1: "user1:en", 2: "user2:en"}
+    mock.assert_called_once_with([1, 2])
+
+    assert await get_users([3, 2, 1, 0]) == {3: "user3:en", 2: "user2:en", 1: "user1:en"}
+    mock.assert_called_with([3, 0])
+
+    assert await get_users(ids=(1, 3), lang="de") == {1: "user1:en", 3: "user3:en"}
+    assert mock.call_count == 2
+    assert await cache.get("user:2") == "user2:en"
+    assert await cache.get("user:0") is None
+
+    assert await get_users([]) == {}
+    assert mock.call_count == 2
+
+
+async def test_batch_round_trips(cache: Cache):
+    commands = Mock()
+
+    async def _middleware(call, cmd: Command, backend, *args, **kwargs):
+        commands(cmd)
+        return await call(*args, **kwargs)
+
+    cache.add_middleware(_middleware)
+
+    @cache.batch(ttl=10, items="ids", condition="not_none")
+    async def get_users(ids):
+        return {_id: _id * 10 if _id else None for _id in ids}
+
+    assert await get_users(list(range(10))) == {0: None, **{i: i * 10 for i in range(1, 10)}}
+    assert await get_users(list(range(5, 15))) == {i: i * 10 for i in range(5, 15)}
+    assert [call.args[0] for call in commands.call_args_list] == [Command.GET_MANY, Command.SET_MANY] * 2
+
+
+async def test_batch_wrong_result(cache: Cache):
+    @cache.batch(ttl=10, items="ids")
+    async def get_users(ids):
+        return [1]
+
+    with pytest.raises(TypeError):
+        await get_users([1])
+
+
+def test_batch_wrong_items(cache: Cache):
+    with pytest.raises(ValueError):
+
+        @cache.batch(ttl=10, items="wrong")
+        async def get_users(ids): ...
@@ -0,0 +1,209 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from cashews.batching import AutoPipeline, GetBatcher, _TickBatcher
+
+
+def _get_many(mock: Mock):
+    async def get_many(keys):
+        mock(list(keys))
+        await asyncio.sleep(0)
+        return [f"value:{key}" if key != "missed" else None for key in keys]
+
+    return get_many
+
+
+async def test_batcher_merges_gets():
+    mock = Mock()
+    batcher = GetBatcher(_get_many(mock))
+
+    results = await asyncio.gather(*[batcher.get(f"key{i}") for i in range(10)], batcher.get("missed"))
+
+    assert results == [f"value:key{i}" for i in range(10)] + [None]
+    mock.assert_called_once_with([f"key{i}" for i in range(10)] + ["missed"])
+    assert batcher.batches == 1
+    assert batcher.gets == 11
+
+
+async def test_batcher_unique_keys():
+    mock = Mock()
+    batcher = GetBatcher(_get_many(mock))
+
+    results = await asyncio.gather(batcher.get("a"), batcher.get("b"), batcher.get("a"))
+
+    assert results == ["value:a", "value:b", "value:a"]
+    mock.assert_called_once_with(["a", "b"])
+
+
+async def test_batcher_max_size():
+    mock = Mock()
+    batcher = GetBatcher(_get_many(mock), max_size=4)
+
+    results = await asyncio.gather(*[batcher.get(str(i)) for i in range(10)])
+
+    assert results == [f"value:{i}" for i in range(10)]
+    assert [call.args[0] for call in mock.call_args_list] == [["0", "1", "2", "3"], ["4", "5", "6", "7"], ["8", "9"]]
+
+
+async def test_batcher_sequential_gets():
+    mock = Mock()
+    batcher = GetBatcher(_get_many(mock))
+
+    assert await batcher.get("a") == "value:a"
+    assert await batcher.get("b") == "value:b"
+    assert mock.call_count == 2
+
+
+async def test_batcher_delay():
+    mock = Mock()
+    batcher = GetBatcher(_get_many(mock), delay=0.01)
+
+    async def get_later(key):
+        await asyncio.sleep(0.001)
+        return await batcher.get(key)
+
+    results = await asyncio.gather(batcher.get("a"), get_later("b"))
+
+    assert results == ["value:a", "value:b"]
+    mock.assert_called_once_with(["a", "b"])
+
+
+async def test_batcher_none_result():
+    async def get_many(keys):
+        return None
+
+    batcher = GetBatcher(get_many)
+
+    assert await asyncio.gather(batcher.get("a"), batcher.get("b")) == [None, None]
+
+
+async def test_batcher_exception():
+    async def get_many(keys):
+        raise ValueError()
+
+    batcher = GetBatcher(get_many)
+
+    results = await asyncio.gather(batcher.get("a"), batcher.get("b"), return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_batcher_cancelled_waiter():
+    mock = Mock()
+    batcher = GetBatcher(_get_many(mock))
+
+    task = asyncio.create_task(batcher.get("a"))
+    await asyncio.sleep(0)
+    get_b = asyncio.create_task(batcher.get("b"))
+    task.cancel()
+
+    assert await get_b == "value:b"
+
+
+def test_batcher_wrong_size():
+    with pytest.raises(ValueError):
+        GetBatcher(_get_many(Mock()), max_size=0)
+
+
+def test_batcher_without_execute():
+    class Batcher(_TickBatcher):
+        pass
+
+    with pytest.raises(TypeError):
+        Batcher()
+
+
+async def test_auto_pipeline():
+    mock = Mock()
+
+    async def execute_many(commands):
+        mock(commands)
+        return [ValueError() if command == "fail" else (command, args) for command, args, _ in commands]
+
+    pipeline = AutoPipeline(execute_many)
+
+    results = await asyncio.gather(
+        pipeline.execute("set", "a", 1),
+        pipeline.execute("set", "a", 1),
+        pipeline.execute("fail"),
+        pipeline.execute("incr", "b", amount=2),
+        return_exceptions=True,
+    )
+
+    assert results[:2] == [("set", ("a", 1)), ("set", ("a", 1))]
+    assert isinstance(results[2], ValueError)
+    assert results[3] == ("incr", ("b",))
+    mock.assert_called_once_with(
+        [("set", ("a", 1), {}), ("set", ("a", 1), {}), ("fail", (), {}), ("incr", ("b",), {"amount": 2})]
+    )
+    assert pipeline.batches == 1
+    assert pipeline.commands == 4
+
+
+async def test_auto_pipeline_max_size():
+    mock = Mock()
+
+    async def execute_many(commands):
+        mock(len(commands))
+        return [None] * len(commands)
+
+    pipeline = AutoPipeline(execute_many, max_size=3)
+
+    await asyncio.gather(*[pipeline.execute("set", i, i) for i in range(7)])
+    assert [call.args[0] for call in mock.call_args_list] == [3, 3, 1]
+
+
+async def test_auto_pipeline_exception():
+    async def execute_many(commands):
+        raise ConnectionError()
+
+    pipeline = AutoPipeline(execute_many)
+
+    results = await asyncio.gather(
+        pipeline.execute("set", "a", 1), pipeline.execute("get", "a"), return_exceptions=True
+    )
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+@pytest.mark.redis
+async def test_redis_auto_pipeline(redis_dsn, backend_factory):
+    from cashews.backends.redis import Redis
+
+    backend = backend_factory(Redis, redis_dsn, suppress=False, auto_pipeline=True)
+    await backend.init()
+    try:
+        results = await asyncio.gather(
+            backend.set("key", "value", expire=10),
+            backend.set("key", "other", exist=False),
+            backend.incr("counter", 2),
+            backend.set_add("set", "a", "b", expire=10),
+        )
+
+        assert results[:3] == [True, False, 2]
+        assert backend._auto_pipeline.commands == 5
+        assert backend._auto_pipeline.batches < 5
+        assert await backend.get("key") == "value"
+        assert set(await backend.set_pop("set")) == {"a", "b"}
+    finally:
+        await backend.close()
+
+
+@pytest.mark.redis
+async def test_redis_auto_batch(redis_dsn, backend_factory):
+    from cashews.backends.redis import Redis
+
+    backend = backend_factory(Redis, redis_dsn, suppress=False, auto_batch=True)
+    await backend.init()
+    try:
+        await backend.set_many({f"key{i}": i for i in range(10)})
+        await backend.set("obj", {"a": 1})
+
+        results = await asyncio.gather(
+            *[backend.get(f"key{i}") for i in range(10)], backend.get("obj"), backend.get("no")
+        )
+
+        assert results == [*range(10), {"a": 1}, None]
+        assert backend._batcher.batches == 1
+    finally:
+        await backend.close()
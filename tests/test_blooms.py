@@ -32,7 +32,9 @@ async def test_bloom_simple(cache):
             call.assert_not_called()
 
 
-async def test_bloom_simple_big_size(backend):
+async def test_bloom_simple_big_size(backend, raw_backend):
+    if raw_backend[1] == "shared_memory":
+        pytest.skip("a filter doesn't fit a slot of the shared memory backend")
     n = 1_000_000
     call = Mock()
 
@@ -1,4 +1,6 @@
 import asyncio
+import importlib
+import time
 from unittest.mock import Mock
 
 import pytest
@@ -6,6 +8,7 @@ import pytest
 from cashews import Cache, decorators
 
 EXPIRE = 0.02
+early_module = importlib.import_module("cashews.decorators.cache.early")
 
 
 class CustomError(Exception):
@@ -194,6 +197,57 @@ async def test_early_cache_no_background(cache: Cache):
     assert mock.call_count == 2
 
 
+async def test_early_cache_xfetch(cache: Cache, monkeypatch):
+    mock = Mock()
+
+    @cache.early(ttl=EXPIRE * 10, key="key", xfetch=True, background=False)
+    async def func(resp=b"ok"):
+        await asyncio.sleep(0.001)
+        mock()
+        return resp
+
+    assert await func() == b"ok"
+    assert await func(b"notok") == b"ok"
+    assert mock.call_count == 1
+
+    monkeypatch.setattr(early_module, "_xfetch_expired", lambda *args: True)
+    assert await func(b"notok") == b"ok"
+    assert mock.call_count == 2
+    monkeypatch.undo()
+    assert await func() == b"notok"
+    assert mock.call_count == 2
+
+
+async def test_early_cache_xfetch_one_recalculation(cache: Cache, monkeypatch):
+    mock = Mock()
+
+    @cache.early(ttl=EXPIRE * 10, key="key", xfetch=True, protected=False)
+    async def func(resp=b"ok"):
+        await asyncio.sleep(0.01)
+        mock()
+        return resp
+
+    assert await func() == b"ok"
+    monkeypatch.setattr(early_module, "_xfetch_expired", lambda *args: True)
+    assert await asyncio.gather(*[func(b"new") for _ in range(10)]) == [b"ok"] * 10
+    await asyncio.sleep(0.05)
+    assert mock.call_count == 2
+    assert await func() == b"new"
+
+
+def test_xfetch_expired(monkeypatch):
+    now = time.time()
+    monkeypatch.setattr("random.random", lambda: 0.0)
+    assert not early_module._xfetch_expired(now + 10, 1, beta=1)
+    assert early_module._xfetch_expired(now - 1, 1, beta=1)
+
+    # ln(1 - 0.99) = -4.6: a call of 1s is recalculated ~4.6s before the expiration with beta 1
+    monkeypatch.setattr("random.random", lambda: 0.99)
+    assert early_module._xfetch_expired(now + 4, 1, beta=1)
+    assert not early_module._xfetch_expired(now + 5, 1, beta=1)
+    assert early_module._xfetch_expired(now + 9, 1, beta=2)
+
+
 async def test_soft_cache_simple(cache: Cache):
     mock = Mock()
 
@@ -0,0 +1,155 @@
+import pytest
+
+from cashews import Cache
+from cashews.backends.memory import Memory
+from cashews.compressors import Compressor, CompressorType, get_compressor
+from cashews.exceptions import AwaitRequiredError, UnsupportedCompressorError
+from cashews.picklers import PicklerType
+from cashews.serialize import get_serializer
+
+VALUE = {"items": [{"id": i, "name": "name", "description": "description"} for i in range(100)]}
+
+
+def _compressor(compress: CompressorType):
+    try:
+        return get_compressor(compress)
+    except UnsupportedCompressorError:
+        pytest.skip(f"{compress.value} is not installed")
+
+
+@pytest.mark.parametrize("compress", CompressorType)
+@pytest.mark.parametrize("secret", (None, b"test"))
+async def test_compress(compress, secret):
+    compressor = _compressor(compress)
+    cache = Memory(serializer=get_serializer(secret=secret, compress=compress))
+    await cache.set("key", VALUE)
+    await cache.set("bytes", b"b" * 2000)
+
+    raw = await cache.get_raw("key")
+    assert b"\x00" + bytes((compressor.id,)) in raw
+    assert len(raw) < 1000
+    assert await cache.get("key") == VALUE
+    assert await cache.get("bytes") == b"b" * 2000
+    assert await cache.get_many("key", "bytes") == (VALUE, b"b" * 2000)
+
+
+async def test_compress_min_size():
+    cache = Memory(serializer=get_serializer(compress=CompressorType.ZLIB, compress_min_size=100))
+    await cache.set("small", {"a": 1})
+    await cache.set("big", VALUE)
+
+    assert not (await cache.get_raw("small")).startswith(b"\x00")
+    assert (await cache.get_raw("big")).startswith(b"\x00\x01")
+    assert await cache.get("small") == {"a": 1}
+    assert await cache.get("big") == VALUE
+
+
+async def test_compressed_and_plain_values_coexist():
+    plain = get_serializer(secret=b"test", pickle_type=PicklerType.DEFAULT)
+    compressed = get_serializer(secret=b"test", compress=CompressorType.LZMA, compress_min_size=0)
+    cache = Memory(serializer=plain)
+    await cache.set("plain", VALUE)
+
+    cache._serializer = compressed
+    await cache.set("compressed", VALUE)
+    assert await cache.get_many("plain", "compressed") == (VALUE, VALUE)
+
+    cache._serializer = plain
+    assert await cache.get_many("plain", "compressed") == (VALUE, VALUE)
+
+
+@pytest.mark.parametrize("raw", (b"\x00", b"\x00\x63data", b"\x00\x01broken"))
+async def test_broken_compressed_value(raw):
+    cache = Memory(serializer=get_serializer(compress=CompressorType.ZLIB))
+    await cache.set_raw("key", raw)
+    assert await cache.get("key", default="default") == "default"
+
+
+async def test_compress_from_url():
+    cache = Cache()
+    cache.setup("mem://?compress=bz2&compress_min_size=10")
+    await cache.set("key", VALUE)
+    assert (await cache.get_raw("key")).startswith(b"\x00\x03")
+    assert await cache.get("key") == VALUE
+
+
+def _user(i):
+    return {"id": i, "name": f"user {i}", "email": f"user{i}@example.com", "is_active": True, "roles": ["admin"]}
+
+
+@pytest.mark.parametrize("compress", (CompressorType.ZLIB, CompressorType.ZSTD))
+async def test_compress_dict(compress):
+    _compressor(compress)
+    cache = Memory(
+        serializer=get_serializer(secret=b"test", compress=compress, compress_dict=True, compress_dict_samples=10)
+    )
+    for i in range(10):
+        await cache.set(f"sample:{i}", _user(i))
+    await cache.set("key", _user(100))
+
+    raw = await cache.get_raw("key")
+    plain = await cache.get_raw("sample:0")
+    assert len(raw) < len(plain)
+    assert [key async for key in cache.scan("_compress_dict:*")]
+    assert await cache.get("key") == _user(100)
+    assert await cache.get_many("key", "sample:1") == (_user(100), _user(1))
+
+    # other process: the dictionary is loaded from the cache
+    cache._serializer = get_serializer(secret=b"test")
+    with pytest.raises(AwaitRequiredError):
+        cache.get_nowait("key")
+    assert await cache.get("key") == _user(100)
+    assert cache.get_nowait("key") == _user(100)
+
+
+async def test_compress_dict_missing():
+    cache = Memory(
+        serializer=get_serializer(compress=CompressorType.ZLIB, compress_dict=True, compress_dict_samples=1)
+    )
+    await cache.set("key", _user(1))
+    await cache.set("key", _user(2))
+    assert (await cache.get_raw("key"))[:2] == b"\x00\x06"
+
+    cache._serializer = get_serializer(compress=CompressorType.ZLIB, compress_dict=True)
+    await cache.delete_match("_compress_dict:*")
+    assert await cache.get("key", default="default") == "default"
+
+
+async def test_compress_dict_stored_again_after_clear():
+    cache = Memory(
+        serializer=get_serializer(compress=CompressorType.ZLIB, compress_dict=True, compress_dict_samples=5)
+    )
+    for i in range(5):
+        await cache.set(f"sample:{i}", _user(i))
+    await cache.clear()
+    for i in range(5):
+        await cache.set(f"key:{i}", _user(i))
+    assert (await cache.get_raw("key:4")).startswith(b"\x00\x06")
+
+    # other process: the dictionary is loaded from the cache
+    cache._serializer = get_serializer(compress=CompressorType.ZLIB, compress_dict=True)
+    assert await cache.get("key:4") == _user(4)
+
+
+async def test_compress_dict_unsupported():
+    with pytest.raises(UnsupportedCompressorError):
+        get_serializer(compress=CompressorType.LZMA, compress_dict=True)
+
+
+async def test_compress_dict_from_url():
+    cache = Cache()
+    cache.setup("mem://?compress=zlib&compress_dict=true&compress_dict_samples=2")
+    for i in range(3):
+        await cache.set(f"key:{i}", _user(i))
+    assert (await cache.get_raw("key:2")).startswith(b"\x00\x06")
+    assert await cache.get("key:2") == _user(2)
+
+
+def test_compressor_abstract():
+    class NoDecompress(Compressor):
+        @staticmethod
+        def compress(value: bytes) -> bytes:
+            return value
+
+    with pytest.raises(TypeError):
+        NoDecompress()
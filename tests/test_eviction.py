@@ -0,0 +1,63 @@
+import pytest
+
+from cashews.backends.eviction import LFUPolicy, S3FIFOPolicy, TinyLFUPolicy, get_eviction_policy
+from cashews.backends.memory import Memory
+
+POLICIES = ("lru", "lfu", "tinylfu", "s3fifo")
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+async def test_size_limit(policy):
+    cache = Memory(size=10, policy=policy)
+    for i in range(100):
+        await cache.set(f"key:{i}", i)
+        assert len(cache.store) <= 10
+
+    assert await cache.get("key:99") == 99
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+async def test_delete_and_clear(policy):
+    cache = Memory(size=10, policy=policy)
+    for i in range(10):
+        await cache.set(f"key:{i}", i)
+    await cache.delete("key:0")
+    await cache.set("key:new", "new")
+    assert await cache.get("key:new") == "new"
+    assert len(cache.store) == 10
+
+    await cache.clear()
+    for i in range(10):
+        await cache.set(f"key:{i}", i)
+    assert len(cache.store) == 10
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+async def test_max_bytes(policy):
+    cache = Memory(size=1000, max_bytes=10_000, policy=policy)
+    for i in range(50):
+        await cache.set(f"key:{i}", b"x" * 1000)
+    assert await cache.get_bytes_used() <= 10_000
+
+
+@pytest.mark.parametrize("policy_class", (LFUPolicy, TinyLFUPolicy, S3FIFOPolicy))
+def test_frequent_key_survives_scan(policy_class):
+    policy = policy_class(100)
+    cached = set()
+    for key in ("hot", *(f"scan:{i}" for i in range(1000))):
+        if key in cached:
+            policy.access(key)
+        else:
+            cached.add(key)
+            cached.difference_update(policy.insert(key))
+        if "hot" in cached:
+            policy.access("hot")
+            policy.access("hot")
+
+    assert "hot" in cached
+    assert len(cached) <= 100
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        get_eviction_policy("random", 10)
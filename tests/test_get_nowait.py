@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from cashews import Cache
+from cashews.exceptions import AwaitRequiredError
+from cashews.helpers import add_prefix
+from cashews.validation import invalidate_further
+
+
+@pytest.fixture(
+    name="nowait_cache",
+    params=["mem://", "mem://?secret=test", "sharded-mem://"],
+)
+async def _nowait_cache(request):
+    cache = Cache()
+    await cache.init(request.param)
+    yield cache
+    await cache.close()
+
+
+@pytest.mark.parametrize("value", ("value", b"bytes", 10, {"key": [1, 2]}, None))
+async def test_get_nowait(nowait_cache: Cache, value):
+    await nowait_cache.set("key", value)
+    assert nowait_cache.get_nowait("key") == value
+    assert nowait_cache.get_nowait("no_key", default="default") == "default"
+
+
+async def test_get_nowait_expired(nowait_cache: Cache):
+    await nowait_cache.set("key", "value", expire=0.01)
+    await asyncio.sleep(0.02)
+    with pytest.raises(AwaitRequiredError):
+        nowait_cache.get_nowait("key")
+    assert await nowait_cache.get("key") is None
+
+
+async def test_get_nowait_disable(nowait_cache: Cache):
+    await nowait_cache.set("key", "value")
+    with nowait_cache.disabling():
+        assert nowait_cache.get_nowait("key", default="default") == "default"
+
+
+async def test_get_nowait_invalidate_further(nowait_cache: Cache):
+    await nowait_cache.set("key", "value")
+    with invalidate_further(), pytest.raises(AwaitRequiredError):
+        nowait_cache.get_nowait("key")
+
+
+async def test_get_nowait_not_init():
+    cache = Cache()
+    cache.setup("mem://")
+    with pytest.raises(AwaitRequiredError):
+        cache.get_nowait("key")
+
+
+async def test_get_nowait_middlewares():
+    async def _middleware(call, cmd, backend, *args, **kwargs):
+        return await call(*args, **kwargs)
+
+    cache = Cache()
+    await cache.init("mem://", middlewares=(add_prefix("prefix:"),))
+    await cache.set("key", "value")
+    assert cache.get_nowait("key") == "value"
+    assert "prefix:key" in cache._backends[""].store
+
+    cache.add_middleware(_middleware)
+    with pytest.raises(AwaitRequiredError):
+        cache.get_nowait("key")
+
+
+async def test_get_nowait_transaction(nowait_cache: Cache):
+    async with nowait_cache.transaction():
+        with pytest.raises(AwaitRequiredError):
+            nowait_cache.get_nowait("key")
+
+
+async def test_get_nowait_callback(nowait_cache: Cache):
+    with nowait_cache.callback(lambda key, result: None, cmd="get"), pytest.raises(AwaitRequiredError):
+        nowait_cache.get_nowait("key")
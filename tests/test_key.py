@@ -3,8 +3,8 @@ from datetime import timedelta
 import pytest
 
 from cashews.exceptions import WrongKeyError
-from cashews.formatter import default_formatter
-from cashews.key import get_cache_key, get_cache_key_template
+from cashews.formatter import default_format, default_formatter
+from cashews.key import _get_call_values, get_cache_key, get_cache_key_template
 from cashews.key_context import context as key_context
 from cashews.key_context import register as register_context
 from cashews.ttl import ttl_to_seconds
@@ -219,3 +219,57 @@ def test_get_key_template_error():
 )
 def test_ttl_to_seconds(ttl, expect):
     assert ttl_to_seconds(ttl) == expect
+
+
+def _generic_cache_key(func, template, args=(), kwargs=None):
+    kwargs = kwargs or {}
+    if not args:
+        key_values = kwargs
+    else:
+        key_values = _get_call_values(func, args, kwargs)
+    return default_format(template, **key_values)
+
+
+async def func4(a, b=None, /, c=1, *args, d, e="e", **kwargs): ...
+
+
+@pytest.mark.parametrize(
+    ("template", "args", "kwargs"),
+    (
+        ("key:{c}:{d}:{e}", ("a",), {"d": "D"}),
+        ("key:{c}:{d}:{e}", ("a", "b", "C"), {"d": 4, "e": True}),
+        ("key:{c}:{d}:{e}", ("a", "b", "C", "x", "y"), {"d": [1, "2"], "z": {"k": b"v"}}),
+        ("key:{c}:{d}:{e}", (), {"c": "C", "d": "D", "e": "E"}),
+        ("key:{c}:{d}:{e}", (), {"d": "D"}),
+        ("key:{c}:{d}:{e}", ("a",), {"d": None}),
+        ("key:{c}-{c}:{d:len}:{e:hash}", ("a",), {"d": None, "e": Klass()}),
+        ("key:{c:upper}:{d:hash(sha1)}", ("a", "b", "c"), {"d": "D"}),
+        ("key:{c:get(k)}:{d:call_method(x)}", ("a", "b", {"k": "v"}), {"d": Klass()}),
+        ("{{c}}:{c}}}", ("a", "b", "c"), {"d": "D"}),
+        ("key", ("a",), {"d": "D"}),
+        ("key:{a}:{d}", ("a",), {"d": "D"}),
+        ("key:{c!r}:{d}", ("a",), {"d": "D"}),
+        ("key:{c:>5}:{d}", ("a",), {"d": "D"}),
+    ),
+)
+def test_cache_key_compiled(template, args, kwargs):
+    with key_context(e="context"):
+        assert get_cache_key(func4, template, args=args, kwargs=kwargs) == _generic_cache_key(
+            func4, template, args, kwargs
+        )
+
+
+def test_cache_key_compiled_wrong_call():
+    with pytest.raises(TypeError):
+        get_cache_key(func4, "{c}:{d}", args=("a", "b", "c"))
+    with pytest.raises(TypeError):
+        get_cache_key(func4, "{c}:{d}", args=("a", "b", "c"), kwargs={"c": 1, "d": 1})
+    with pytest.raises(TypeError):
+        get_cache_key(func1, "{a}", args=("a", "b"))
+    with pytest.raises(TypeError):
+        get_cache_key(func1, "{a}", args=("a",), kwargs={"b": 1})
+
+
+def test_cache_key_compiled_rewrite_context():
+    with pytest.warns(DeprecationWarning), key_context(rewrite=True, a="context"):
+        assert get_cache_key(func1, "key:{a}", args=("a",)) == "key:context"
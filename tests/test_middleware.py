@@ -3,6 +3,7 @@ from unittest import mock
 import pytest
 
 from cashews import Cache
+from cashews.commands import Command
 from cashews.helpers import memory_limit
 
 
@@ -38,3 +39,29 @@ async def test_memory_limit_set_many(cache: Cache, target):
 
     await cache.set_many({"key": "v" * 35, "key2": "v", "key3": "v" * 15})
     target.set_many.assert_called_once_with(pairs={"key3": mock.ANY}, expire=None)
+
+
+async def test_middleware_chain_cached_and_rebuilt(cache: Cache, target):
+    calls = []
+
+    async def _middleware(call, cmd, backend, *args, **kwargs):
+        calls.append(cmd)
+        return await call(*args, **kwargs)
+
+    await cache.get("key")
+    chain = cache._with_middlewares(Command.GET, "key")
+    assert cache._with_middlewares(Command.GET, "key") is chain
+
+    cache.add_middleware(_middleware)
+    assert cache._with_middlewares(Command.GET, "key") is not chain
+    await cache.get("key")
+    assert calls == [Command.GET]
+
+
+async def test_middleware_chain_in_transaction(cache: Cache, target):
+    await cache.set("key", "value")
+    async with cache.transaction():
+        await cache.set("key", "new")
+        assert await cache.get("key") == "new"
+        target.get.assert_not_called()
+    assert await cache.get("key") == "new"
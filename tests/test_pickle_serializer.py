@@ -1,7 +1,8 @@
 import dataclasses
 from collections import namedtuple
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
+from uuid import UUID
 
 import pytest
 from hypothesis import example, given, settings
@@ -9,7 +10,7 @@ from hypothesis import strategies as st
 
 from cashews.backends.memory import Memory
 from cashews.picklers import PicklerType
-from cashews.serialize import UnSecureDataError, get_serializer
+from cashews.serialize import HashSigner, UnSecureDataError, get_serializer
 
 
 @dataclasses.dataclass()
@@ -27,6 +28,7 @@ NT = namedtuple("NT", ("test", "name"), defaults=[False, "test"])
         "default_md5",
         "default_sum",
         "default_sha256",
+        "default_blake2b",
         pytest.param("redis_md5", marks=pytest.mark.redis),
         pytest.param("redis_sum", marks=pytest.mark.redis),
         pytest.param("dill_sum", marks=pytest.mark.integration),
@@ -191,6 +193,10 @@ async def test_serialize_backward(value, encoded, cache):
         b"md5:_cos\nsystem\n(S'echo hello world'\ntR.",
         b"sha1:_cos\nsystem\n(S'echo hello world'\ntR.",
         b"__cos\nsystem\n(S'echo hello world'\ntR.",
+        b"\x01",
+        b"\x01\x09" + b"0" * 16 + b"cos\nsystem\n(S'echo hello world'\ntR.",
+        b"\x01\x01" + b"0" * 16 + b"cos\nsystem\n(S'echo hello world'\ntR.",
+        b"\x01\x03short",
     ),
 )
 async def test_unsecure_value(value, cache):
@@ -304,3 +310,167 @@ async def test_json_serialize(value):
     cache = Memory(serializer=get_serializer(secret=b"test", pickle_type=PicklerType.JSON))
     await cache.set("key", value)
     assert await cache.get("key") == value
+
+
+async def test_orjson_serialize():
+    pytest.importorskip("orjson")
+    cache = Memory(serializer=get_serializer(secret=b"test", pickle_type=PicklerType.ORJSON))
+    value = {
+        "id": UUID("a8098c1a-f86e-11da-bd1a-00112444be1e"),
+        "created": datetime(2024, 1, 2, 3, 4, 5),
+        "price": Decimal("1.001"),
+        "tags": {"a"},
+        "dc": TestDC(test="test", _=1),
+    }
+    await cache.set("key", value)
+    await cache.set("bytes", b"test")
+    assert await cache.get("key") == {
+        "id": "a8098c1a-f86e-11da-bd1a-00112444be1e",
+        "created": "2024-01-02T03:04:05",
+        "price": "1.001",
+        "tags": ["a"],
+        "dc": {"test": "test"},
+    }
+    assert await cache.get("bytes") == b"test"
+
+
+@pytest.mark.parametrize(
+    "value",
+    (
+        "str",
+        1.5,
+        None,
+        True,
+        [1, "2", None],
+        {"any": [1, 2]},
+        {1: "int key"},
+        datetime(2024, 1, 2, 3, 4, 5),
+        date(2024, 1, 2),
+        time(3, 4, 5),
+        timedelta(days=1, seconds=2),
+        Decimal("1.001"),
+        UUID("a8098c1a-f86e-11da-bd1a-00112444be1e"),
+        {"a", "b"},
+        frozenset({1, 2}),
+        {"nested": {"at": datetime(2024, 1, 2), "ids": {UUID(int=1)}}},
+    ),
+)
+async def test_msgpack_serialize(value):
+    pytest.importorskip("msgpack")
+    cache = Memory(serializer=get_serializer(secret=b"test", pickle_type=PicklerType.MSGPACK))
+    await cache.set("key", value)
+    await cache.set("bytes", b"test")
+    assert await cache.get("key") == value
+    assert await cache.get("bytes") == b"test"
+
+
+async def test_msgpack_serialize_dataclass():
+    pytest.importorskip("msgpack")
+    cache = Memory(serializer=get_serializer(secret=b"test", pickle_type=PicklerType.MSGPACK))
+    await cache.set("key", TestDC(test="test", _=1))
+    assert await cache.get("key") == {"test": "test", "_": 1}
+
+
+async def test_pickle_type_from_url():
+    pytest.importorskip("orjson")
+    from cashews import Cache
+    from cashews.picklers import OrjsonPickler
+
+    cache = Cache()
+    backend = cache.setup("mem://?secret=test&pickle_type=orjson")
+    assert backend._serializer._pickler is OrjsonPickler
+    await cache.set("key", {"created": datetime(2024, 1, 2)})
+    assert await cache.get("key") == {"created": "2024-01-02T00:00:00"}
+
+
+@pytest.mark.parametrize(
+    ("digestmod", "size"),
+    ((b"md5", 16), (b"sha1", 20), (b"sha256", 32), (b"sum", 8), (b"blake2b", 16), ("blake2b", 16)),
+)
+def test_binary_sign(digestmod, size):
+    signer = HashSigner(b"secret", digestmod)
+    signed = signer.sign("key", b"value")
+    assert signed[:1] == b"\x01"
+    assert len(signed) == 2 + size + len(b"value")
+    assert signer.check_sign("key", signed) == b"value"
+    # a value signed with other digestmod is checked
+    assert HashSigner(b"secret", b"md5").check_sign("key", signed) == b"value"
+
+    with pytest.raises(UnSecureDataError):
+        signer.check_sign("other", signed)
+    with pytest.raises(UnSecureDataError):
+        signer.check_sign("key", signed[:-1] + b"!")
+    with pytest.raises(UnSecureDataError):
+        HashSigner(b"other", digestmod).check_sign("key", signed)
+
+
+def test_binary_sign_long_secret():
+    signer = HashSigner(b"s" * 100, b"blake2b")
+    assert signer.check_sign("key", signer.sign("key", b"value")) == b"value"
+
+
+def test_unsupported_digestmod():
+    with pytest.raises(ValueError):
+        HashSigner(b"secret", b"crc")
+
+
+@pytest.mark.parametrize(
+    ("value", "encoded"),
+    (
+        ("test", b"\x02test"),
+        ("", b"\x02"),
+        ("тест", b"\x02" + "тест".encode()),
+        (b"test", b"\x03test"),
+        (1.5, b"\x041.5"),
+        (True, b"\x05"),
+        (False, b"\x06"),
+        (None, b"\x07"),
+    ),
+)
+async def test_primitive_values(value, encoded):
+    cache = Memory(serializer=get_serializer(pickle_type=PicklerType.DEFAULT))
+    await cache.set("key", value)
+    assert await cache.get_raw("key") == encoded
+    assert await cache.get("key") == value
+    assert type(await cache.get("key")) is type(value)
+
+
+class _Str(str):
+    pass
+
+
+async def test_primitive_subclass_pickled():
+    cache = Memory(serializer=get_serializer(pickle_type=PicklerType.DEFAULT))
+    await cache.set("key", _Str("test"))
+    assert (await cache.get_raw("key")).startswith(b"\x80")
+    assert type(await cache.get("key")) is _Str
+
+
+async def test_primitive_values_json_not_tagged():
+    cache = Memory(serializer=get_serializer(pickle_type=PicklerType.JSON))
+    await cache.set("key", "test")
+    assert await cache.get_raw("key") == b'"test"'
+    assert await cache.get("key") == "test"
+
+
+class _NoDigitBytes(bytes):
+    def isdigit(self):
+        raise AssertionError("isdigit is called")
+
+
+@pytest.mark.parametrize("secret", (None, b"test"))
+async def test_primitive_values_decoded_by_tag(secret):
+    serializer = get_serializer(pickle_type=PicklerType.DEFAULT, secret=secret)
+    backend = Memory()
+    for value in ("123", b"123", 1.5, None):
+        encoded = await serializer.encode(backend, "key", value, expire=None)
+        assert await serializer.decode(backend, "key", _NoDigitBytes(encoded), default="default") == value
+    assert await serializer.decode(backend, "key", b"123", default="default") == 123
+
+
+@given(value=st.one_of(st.text(), st.binary(), st.floats(allow_nan=False), st.booleans(), st.none()))
+@settings(max_examples=300)
+async def test_primitive_values_signed(value):
+    cache = Memory(serializer=get_serializer(secret=b"test"))
+    await cache.set("key", value)
+    assert await cache.get("key", default="default") == value
@@ -0,0 +1,128 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from cashews import Cache
+from cashews.refresh import RefreshScheduler
+
+
+async def test_refresh_deduplicated():
+    scheduler = RefreshScheduler()
+    mock = Mock()
+
+    async def refresh(value):
+        await asyncio.sleep(0.01)
+        mock(value)
+
+    assert scheduler.schedule("key", refresh, 1)
+    assert not scheduler.schedule("key", refresh, 2)
+    assert "key" in scheduler
+    await asyncio.sleep(0)
+    assert not scheduler.schedule("key", refresh, 3)  # running
+
+    await scheduler.join()
+    mock.assert_called_once_with(1)
+    assert (scheduler.scheduled, scheduler.deduplicated, scheduler.pending, scheduler.running) == (1, 2, 0, 0)
+    assert "key" not in scheduler
+
+
+async def test_refresh_pending_worker_cancelled():
+    scheduler = RefreshScheduler()
+    mock = Mock()
+
+    async def refresh(value):
+        mock(value)
+
+    assert scheduler.schedule("key", refresh, 1)
+    scheduler._workers[0].cancel()
+    await asyncio.sleep(0)
+    assert scheduler.pending == 1
+
+    assert not scheduler.schedule("key", refresh, 2)
+    await scheduler.join()
+    mock.assert_called_once_with(1)
+    assert "key" not in scheduler
+
+
+async def test_refresh_workers_limit():
+    scheduler = RefreshScheduler(workers=2)
+    running = []
+    max_running = 0
+
+    async def refresh():
+        nonlocal max_running
+        running.append(1)
+        max_running = max(max_running, len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    for i in range(10):
+        scheduler.schedule(f"key{i}", refresh)
+    await scheduler.join()
+
+    assert max_running == 2
+    assert scheduler.scheduled == 10
+
+
+async def test_refresh_hot_keys_first():
+    scheduler = RefreshScheduler(workers=1)
+    order = []
+
+    async def refresh(key):
+        order.append(key)
+        await asyncio.sleep(0.01)
+
+    scheduler.schedule("first", refresh, "first")
+    await asyncio.sleep(0)  # taken by the worker
+    for key, hits in (("cold", 1), ("warm", 2), ("hot", 4)):
+        for _ in range(hits):
+            scheduler.schedule(key, refresh, key)
+    await scheduler.join()
+
+    assert order == ["first", "hot", "warm", "cold"]
+
+
+async def test_refresh_max_pending():
+    scheduler = RefreshScheduler(workers=1, max_pending=2)
+
+    async def refresh():
+        await asyncio.sleep(0)
+
+    assert [scheduler.schedule(f"key{i}", refresh) for i in range(3)] == [True, True, False]
+    assert scheduler.dropped == 1
+    await scheduler.join()
+
+
+async def test_refresh_error_logged(caplog):
+    scheduler = RefreshScheduler()
+
+    async def refresh():
+        raise ValueError("error")
+
+    scheduler.schedule("key", refresh)
+    await scheduler.join()
+    assert "Refresh of key failed" in caplog.text
+
+
+def test_refresh_wrong_workers():
+    with pytest.raises(ValueError):
+        RefreshScheduler(workers=0)
+
+
+async def test_early_refresh_scheduled(cache: Cache):
+    mock = Mock()
+
+    @cache.early(ttl=1, early_ttl=0.01, key="key", protected=False)
+    async def func(resp=b"ok"):
+        await asyncio.sleep(0.01)
+        mock()
+        return resp
+
+    await func()
+    await asyncio.sleep(0.02)
+    assert await asyncio.gather(*[func(b"new") for _ in range(10)]) == [b"ok"] * 10
+    await cache.refresher.join()
+
+    assert mock.call_count == 2
+    assert await func() == b"new"
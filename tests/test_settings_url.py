@@ -1,6 +1,7 @@
 import pytest
 
 from cashews.backends.memory import Memory
+from cashews.backends.sharded_memory import ShardedMemory
 from cashews.wrapper.backend_settings import BackendNotAvailableError, settings_url_parse
 
 
@@ -13,6 +14,10 @@ from cashews.wrapper.backend_settings import BackendNotAvailableError, settings_
             "mem://?size=10&check_interval=0.01",
             {"size": 10, "check_interval": 0.01},
         ),
+        (
+            "mem://?max_bytes=1048576",
+            {"max_bytes": 1048576},
+        ),
     ),
 )
 def test_url(url, params):
@@ -21,6 +26,12 @@ def test_url(url, params):
     assert params == _params
 
 
+def test_url_sharded_memory():
+    backend_class, params, _ = settings_url_parse("sharded-mem://?size=1000&shards=8&policy=tinylfu")
+    assert backend_class is ShardedMemory
+    assert params == {"size": 1000, "shards": 8, "policy": "tinylfu"}
+
+
 @pytest.mark.parametrize(
     ("url", "error"),
     (
@@ -80,6 +91,23 @@ def test_url_but_backend_dependency_is_not_installed(url, error):
                 "client_side_listen_timeout": 0.1,
             },
         ),
+        (
+            "redis://localhost:9000/0?auto_batch=1&auto_batch_size=50&auto_batch_delay=0.001",
+            {
+                "address": "redis://localhost:9000/0",
+                "auto_batch": True,
+                "auto_batch_size": 50,
+                "auto_batch_delay": 0.001,
+            },
+        ),
+        (
+            "redis://localhost:9000/0?auto_pipeline=true&auto_pipeline_size=50",
+            {
+                "address": "redis://localhost:9000/0",
+                "auto_pipeline": True,
+                "auto_pipeline_size": 50,
+            },
+        ),
     ),
 )
 def test_url_with_redis_as_backend(url, params):
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from cashews.backends.sharded_memory import ShardedMemory
+
+
+def _run_in_threads(target, count: int = 8):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_incr_from_many_loops():
+    backend = ShardedMemory(size=1000, shards=4)
+
+    def worker(_):
+        async def _incr():
+            for _ in range(1000):
+                await backend.incr("counter")
+                await backend.set_add("set", f"value:{_}")
+
+        asyncio.run(_incr())
+
+    _run_in_threads(worker)
+    assert asyncio.run(backend.get("counter")) == 8000
+
+
+def test_set_get_from_many_loops():
+    backend = ShardedMemory(size=100_000, shards=8)
+    errors = []
+
+    def worker(num):
+        async def _set_get():
+            for i in range(1000):
+                await backend.set(f"key:{num}:{i}", i)
+                if await backend.get(f"key:{num}:{i}") != i:
+                    errors.append((num, i))
+
+        asyncio.run(_set_get())
+
+    _run_in_threads(worker)
+    assert not errors
+    assert asyncio.run(backend.get_keys_count()) == 8000
+
+
+async def test_size():
+    backend = ShardedMemory(size=100, shards=4)
+    for i in range(1000):
+        await backend.set(f"key:{i}", i)
+    assert await backend.get_keys_count() <= 100
+    assert await backend.get("key:999") == 999
+
+
+async def test_set_lock_expired():
+    backend = ShardedMemory(check_interval=0)
+    assert await backend.set_lock("lock", "1", expire=0.01)
+    assert not await backend.set_lock("lock", "1", expire=0.01)
+    await asyncio.sleep(0.02)
+    assert await backend.set_lock("lock", "1", expire=0.01)
+
+
+async def test_sweep_on_write():
+    backend = ShardedMemory(shards=1, check_interval=0.01)
+    await backend.set("key", "value", expire=0.01)
+    await asyncio.sleep(0.02)
+    await backend.set("other", "value")
+    assert await backend.get_keys_count() == 1
+
+
+async def test_set_add_big_set_not_copied():
+    backend = ShardedMemory(shards=2)
+    await backend.set_add("tag", *(str(i) for i in range(200_000)))
+    index = backend._index("tag")
+    stored = backend._shards[index].store["tag"][1]
+
+    start = time.perf_counter()
+    for i in range(200):
+        await backend.set_add("tag", f"new{i}")
+    await backend.set_remove("tag", "new0")
+    await backend.set_pop("tag", count=1)
+    assert time.perf_counter() - start < 0.5
+
+    assert backend._shards[index].store["tag"][1] is stored
+    assert len(stored) == 200_000 + 198
+
+
+def test_wrong_shards():
+    with pytest.raises(ValueError):
+        ShardedMemory(shards=0)
@@ -0,0 +1,170 @@
+import asyncio
+import multiprocessing
+import os
+
+import pytest
+
+from cashews.backends.shared_memory import SharedMemory
+from cashews.exceptions import ValueTooBigError
+
+
+@pytest.fixture
+def name():
+    _name = f"cashews-test-shm-{os.getpid()}"
+    yield _name
+    backend = SharedMemory(name=_name)
+    try:
+        backend.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _worker(name: str, num: int, count: int):
+    async def _run():
+        backend = SharedMemory(name=name, size=4096)
+        await backend.init()
+        try:
+            for i in range(count):
+                await backend.set(f"key:{num}:{i}", {"num": num, "i": i})
+                await backend.incr("counter")
+        finally:
+            await backend.close()
+
+    asyncio.run(_run())
+
+
+def test_share_between_processes(name):
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_worker, args=(name, num, 100)) for num in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    async def _check():
+        backend = SharedMemory(name=name, size=4096)
+        await backend.init()
+        try:
+            assert await backend.get("counter") == 400
+            assert await backend.get("key:3:99") == {"num": 3, "i": 99}
+            assert await backend.get_keys_count() == 401
+        finally:
+            await backend.close()
+
+    asyncio.run(_check())
+
+
+def _modify_worker(name: str, num: int, count: int):
+    async def _run():
+        backend = SharedMemory(name=name, size=64, slot_size=8192)
+        await backend.init()
+        try:
+            for i in range(count):
+                await backend.set_add("set", f"{num}:{i}")
+                await backend.incr_bits("bits", 0, size=16)
+        finally:
+            await backend.close()
+
+    asyncio.run(_run())
+
+
+def test_modify_between_processes(name):
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_modify_worker, args=(name, num, 100)) for num in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    async def _check():
+        backend = SharedMemory(name=name, size=64, slot_size=8192)
+        await backend.init()
+        try:
+            assert await backend.get("set") == {f"{num}:{i}" for num in range(4) for i in range(100)}
+            assert await backend.get_bits("bits", 0, size=16) == (400,)
+        finally:
+            await backend.close()
+
+    asyncio.run(_check())
+
+
+async def test_unlock_other_value(name):
+    backend = SharedMemory(name=name)
+    await backend.init()
+    try:
+        await backend.set_lock("lock", "mine", expire=10)
+        assert not await backend.unlock("lock", "other")
+        assert await backend.is_locked("lock")
+        assert await backend.unlock("lock", "mine")
+        assert not await backend.is_locked("lock")
+    finally:
+        await backend.close()
+
+
+async def test_lru_in_bucket(name):
+    backend = SharedMemory(name=name, size=4, ways=4)
+    await backend.init()
+    try:
+        for i in range(4):
+            await backend.set(f"key:{i}", i)
+        await backend.get("key:0")
+        await backend.set("key:4", 4)
+
+        assert await backend.get("key:0") == 0
+        assert await backend.get("key:1") is None
+        assert await backend.get_keys_count() == 4
+    finally:
+        await backend.close()
+
+
+async def test_value_bigger_than_slot(name):
+    backend = SharedMemory(name=name, slot_size=128)
+    await backend.init()
+    try:
+        assert await backend.set("key", b"small")
+        assert not await backend.set("key", b"x" * 1000)
+        assert await backend.get("key") is None
+    finally:
+        await backend.close()
+
+
+async def test_modified_value_bigger_than_slot(name):
+    backend = SharedMemory(name=name, slot_size=256)
+    await backend.init()
+    try:
+        members = [f"member:{i}" for i in range(100)]
+        added = 0
+        with pytest.raises(ValueTooBigError):
+            for member in members:
+                await backend.set_add("set", member)
+                added += 1
+        assert 0 < added < len(members)
+        # the set is not dropped: it keeps members added before the error
+        assert sorted(await backend.set_pop("set", count=len(members))) == sorted(members[:added])
+    finally:
+        await backend.close()
+
+
+async def test_expire(name):
+    backend = SharedMemory(name=name)
+    await backend.init()
+    try:
+        await backend.set("key", "value", expire=0.01)
+        assert await backend.get("key") == "value"
+        await asyncio.sleep(0.02)
+        assert await backend.get("key") is None
+        assert not await backend.exists("key")
+    finally:
+        await backend.close()
+
+
+async def test_different_layout(name):
+    backend = SharedMemory(name=name, size=64)
+    await backend.init()
+    try:
+        with pytest.raises(ValueError):
+            await SharedMemory(name=name, size=128).init()
+    finally:
+        await backend.close()
@@ -0,0 +1,156 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from cashews import Cache, Command
+from cashews.singleflight import SingleFlight
+
+
+@pytest.fixture(name="cache")
+async def _cache():
+    cache = Cache()
+    cache.setup("mem://")
+    await cache.init()
+    yield cache
+    await cache.close()
+
+
+def _count_commands(cache: Cache) -> Mock:
+    counter = Mock()
+
+    async def _middleware(call, cmd: Command, backend, *args, **kwargs):
+        counter(cmd)
+        return await call(*args, **kwargs)
+
+    cache.add_middleware(_middleware)
+    return counter
+
+
+async def test_singleflight_shares_result():
+    singleflight = SingleFlight()
+    mock = Mock()
+
+    async def func(value):
+        mock()
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(*[singleflight.do("key", func, i) for i in range(10)])
+
+    assert results == [0] * 10
+    assert mock.call_count == 1
+    assert singleflight.calls == 1
+    assert singleflight.coalesced == 9
+    assert singleflight.in_flight == 0
+
+
+async def test_singleflight_shares_exception():
+    singleflight = SingleFlight()
+
+    async def func():
+        await asyncio.sleep(0.01)
+        raise ValueError("error")
+
+    results = await asyncio.gather(*[singleflight.do("key", func) for _ in range(3)], return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert singleflight.calls == 1
+
+
+async def test_singleflight_leader_cancelled():
+    singleflight = SingleFlight()
+    mock = Mock()
+
+    async def func():
+        mock()
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    leader = asyncio.create_task(singleflight.do("key", func))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(singleflight.do("key", func))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "ok"
+    assert leader.cancelled()
+    assert mock.call_count == 2
+
+
+async def test_cache_cold_key_coalesced(cache: Cache):
+    mock = Mock()
+    commands = _count_commands(cache)
+
+    @cache(ttl=10, key="key")
+    async def func():
+        mock()
+        await asyncio.sleep(0.01)
+        return "value"
+
+    assert await asyncio.gather(*[func() for _ in range(100)]) == ["value"] * 100
+    assert mock.call_count == 1
+    assert [call.args[0] for call in commands.call_args_list] == [Command.GET, Command.SET]
+    assert cache.singleflight.coalesced == 99
+
+
+@pytest.mark.parametrize("decorator_name", ("failover", "upper"))
+async def test_cache_coalesced_decorators(cache: Cache, decorator_name):
+    mock = Mock()
+    decorator = cache.failover(ttl=10) if decorator_name == "failover" else cache(ttl=10, upper=True)
+
+    @decorator
+    async def func(arg):
+        mock(arg)
+        await asyncio.sleep(0.01)
+        return arg
+
+    assert await asyncio.gather(*[func(i % 2) for i in range(10)]) == [0, 1] * 5
+    assert mock.call_count == 2
+
+
+async def test_cache_not_protected(cache: Cache):
+    mock = Mock()
+
+    @cache(ttl=10, key="key", protected=False)
+    async def func():
+        mock()
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[func() for _ in range(10)])
+    assert mock.call_count == 10
+
+
+async def test_iterator_coalesced(cache: Cache):
+    mock = Mock()
+
+    @cache.iterator(ttl=10, key="key")
+    async def func():
+        mock()
+        for chunk in "abc":
+            await asyncio.sleep(0.01)
+            yield chunk
+
+    async def consume():
+        return [chunk async for chunk in func()]
+
+    assert await asyncio.gather(*[consume() for _ in range(5)]) == [["a", "b", "c"]] * 5
+    assert mock.call_count == 1
+
+
+async def test_get_or_set_coalesced(cache: Cache):
+    mock = Mock()
+
+    async def get_value():
+        mock()
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(
+        *[cache.get_or_set("key", get_value) for _ in range(5)],
+        *[cache.get_or_set("key", get_value()) for _ in range(5)],
+    )
+
+    assert results == ["value"] * 10
+    assert mock.call_count == 1
+    assert await cache.get("key") == "value"
@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import asyncio
 from random import random
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock, call
 
 import pytest
 
-from cashews import Cache, key_context
+from cashews import Cache, Command, TagsMode, add_prefix, all_keys_lower, key_context
+from cashews.exceptions import AwaitRequiredError, UnsupportedPicklerError
 
 
 def test_register_tags(cache: Cache):
@@ -224,11 +225,23 @@ async def test_delete_tags_separate_backend(cache: Cache, redis_dsn: str):
 
     await cache.delete_tags("tag")
 
-    tag_backend.set_pop.assert_awaited_with(key="_tag:tag", count=100)
+    tag_backend.set_pop.assert_awaited_with(key="_tag:tag", count=1000)
 
     await tag_backend.close()
 
 
+@pytest.mark.parametrize("cmds", ((), (Command.SET_POP_DELETE,)))
+async def test_delete_tags_disabled(cache: Cache, cmds):
+    cache.register_tag("tag", "key")
+    await cache.set("key", "value", tags=["tag"])
+    cache.disable(*cmds)
+
+    await cache.delete_tags("tag")  # disabled commands return None
+
+    cache.enable()
+    assert await cache.get("key") == "value"
+
+
 async def test_templated_tag_with_none_value(cache: Cache):
     @cache(
         ttl=None,
@@ -257,3 +270,247 @@ async def test_template_tag_function(cache: Cache):
 
     await func(User("test"))
     await cache.delete_tags("tag:test")
+
+
+async def test_tags_set_one_command(cache: Cache):
+    commands = Mock()
+
+    async def _middleware(call, cmd: Command, backend, *args, **kwargs):
+        commands(cmd, kwargs.get("tags"))
+        return await call(*args, **kwargs)
+
+    cache.add_middleware(_middleware)
+    cache.register_tag("tag:{i}", "key{i}")
+    cache.register_tag("all", "key{i}")
+
+    assert await cache.set("key1", "value", expire=10, tags=["tag:1", "all"])
+    assert not await cache.set("key1", "value2", exist=False, tags=["tag:1", "all"])
+    commands.assert_has_calls([call(Command.SET, ["_tag:tag:1", "_tag:all"])] * 2)
+    assert commands.call_count == 2
+
+    assert await cache.get("key1") == "value"
+    await cache.delete_tags("all")
+    assert await cache.get("key1") is None
+
+
+async def test_tags_set_with_prefix_middleware():
+    cache = Cache()
+    cache.setup("mem://", middlewares=(add_prefix("pre:"),))
+    cache.register_tag("tag", "key")
+
+    await cache.set("key", "value", tags=["tag"])
+    assert await cache.get("key") == "value"
+    assert await cache.set_pop("_tag:tag") == ["key"]
+
+
+async def test_tags_set_separate_backend():
+    cache = Cache()
+    cache.setup("mem://")
+    tags_backend = cache.setup_tags_backend("mem://")
+    cache.register_tag("tag", "key")
+
+    await cache.set("key", "value", tags=["tag"])
+
+    assert await tags_backend.set_pop("_tag:tag") == ["key"]
+
+
+async def test_delete_tags_batches(cache: Cache):
+    commands = Mock()
+
+    async def _middleware(call, cmd: Command, backend, *args, **kwargs):
+        commands(cmd)
+        return await call(*args, **kwargs)
+
+    cache.register_tag("tag", "key{i}")
+    cache.register_tag("other", "key{i}")
+    for i in range(25):
+        await cache.set(f"key{i}", "value", tags=["tag", "other"])
+    await cache.set("other", "value")
+    cache.add_middleware(_middleware)
+
+    await cache.delete_tags("tag", batch_size=10)
+
+    assert [c.args[0] for c in commands.call_args_list].count(Command.SET_POP_DELETE) == 3
+    assert await cache.get_many(*[f"key{i}" for i in range(25)]) == (None,) * 25
+    assert await cache.get("other") == "value"
+    assert not await cache.set_pop("_tag:other")
+
+
+@pytest.mark.parametrize("middleware", (add_prefix("pre:"), all_keys_lower()))
+async def test_delete_tags_key_middleware(middleware):
+    cache = Cache()
+    cache.setup("mem://", middlewares=(middleware,))
+    cache.register_tag("tag", "Key{i}")
+
+    await cache.set("Key1", "value", tags=["tag"])
+    await cache.set("Key2", "value", tags=["tag"])
+    await cache.delete_tags("tag")
+
+    assert await cache.get_many("Key1", "Key2") == (None, None)
+    assert [key async for key in cache.scan("*Key*")] == []
+
+
+async def test_delete_tags_separate_backend_batches():
+    cache = Cache()
+    cache.setup("mem://")
+    cache.setup_tags_backend("mem://")
+    cache.register_tag("tag", "key{i}")
+    for i in range(25):
+        await cache.set(f"key{i}", "value", tags=["tag"])
+
+    await cache.delete_tags("tag", batch_size=10)
+
+    assert await cache.get_many(*[f"key{i}" for i in range(25)]) == (None,) * 25
+
+
+def test_get_key_tags_matches_all_patterns(cache: Cache):
+    templates = ["key{i}", "key:{i}:{j}", "user.{id}", "user:{id}", "{any}:end", "ke", "key:1:{j}", "k{{v}}{i}"]
+    for i, template in enumerate(templates):
+        cache.register_tag(f"tag{i}:{{i}}", template)
+    cache.register_tag("tag0:{i}", "other{i}")
+
+    for key in ("key1", "key:1:2", "user1", "user:1", "user:end", "ke", "other1", "k{v}1", "nothing"):
+        expected = [
+            tag
+            for tag, patterns in cache._tags_registry._registry_template.items()
+            if any(pattern.fullmatch(key) for pattern in patterns)
+        ]
+        assert [tag.split(":")[0] for tag in cache.get_key_tags(key)] == [tag.split(":")[0] for tag in expected]
+
+    assert cache.get_key_tags("key:1:2") == ["tag0::1:2", "tag1:1", "tag6:"]
+    assert cache.get_key_tags("other5") == ["tag0:5"]
+
+
+def test_get_key_tags_after_register(cache: Cache):
+    cache.register_tag("first", "key")
+    assert cache.get_key_tags("key") == ["first"]
+
+    cache.register_tag("second", "k{i}")
+    assert cache.get_key_tags("key") == ["first", "second"]
+
+
+async def test_versions_mode(cache: Cache):
+    cache.set_tags_mode(TagsMode.VERSIONS)
+    cache.register_tag("tag:{i}", "key{i}")
+    cache.register_tag("all", "key{i}")
+
+    await cache.set("key1", "value1", tags=["tag:1", "all"])
+    await cache.set("key2", "value2", tags=["tag:2", "all"])
+    await cache.set("key3", "value3")
+    assert not await cache.exists("_tag:all")
+
+    assert await cache.get("key1") == "value1"
+    assert await cache.get_many("key1", "key2", "key3") == ("value1", "value2", "value3")
+
+    await cache.delete_tags("tag:1")
+    assert await cache.get("key1") is None
+    assert await cache.get("key1", default="default") == "default"
+    assert await cache.get_many("key1", "key2", "key3") == (None, "value2", "value3")
+
+    await cache.set("key1", "value1", tags=["tag:1", "all"])
+    assert await cache.get("key1") == "value1"
+
+    await cache.delete_tags("all")
+    assert await cache.get_many("key1", "key2", "key3") == (None, None, "value3")
+
+
+def test_versions_mode_json():
+    cache = Cache()
+    cache.setup("mem://?pickle_type=json")
+    with pytest.raises(UnsupportedPicklerError):
+        cache.set_tags_mode(TagsMode.VERSIONS)
+    assert cache.tags_mode is TagsMode.SETS
+
+    cache = Cache()
+    cache.set_tags_mode(TagsMode.VERSIONS)
+    with pytest.raises(UnsupportedPicklerError):
+        cache.setup("mem://?pickle_type=json")
+    cache.setup("mem://")
+
+
+async def test_versions_mode_decorator(cache: Cache):
+    cache.set_tags_mode(TagsMode.VERSIONS)
+    mock = Mock(side_effect=lambda arg: arg)
+
+    @cache(ttl="1m", key="func:{arg}", tags=["func:{arg}"])
+    async def func(arg):
+        return mock(arg)
+
+    assert await func(1) == 1
+    assert await func(1) == 1
+    assert mock.call_count == 1
+
+    await cache.delete_tags("func:1")
+    assert await func(1) == 1
+    assert mock.call_count == 2
+
+
+async def test_versions_mode_one_get_many(cache: Cache):
+    commands = Mock()
+
+    async def _middleware(call, cmd: Command, backend, *args, **kwargs):
+        commands(cmd)
+        return await call(*args, **kwargs)
+
+    cache.set_tags_mode(TagsMode.VERSIONS)
+    cache.register_tag("tag{i}", "key{i}")
+    for i in range(3):
+        await cache.set(f"key{i}", i, tags=[f"tag{i}"])
+    cache.add_middleware(_middleware)
+
+    assert await cache.get_many("key0", "key1", "key2") == (0, 1, 2)
+    assert [c.args[0] for c in commands.call_args_list] == [Command.GET_MANY]
+
+    commands.reset_mock()
+    assert await cache.get("key1") == 1
+    assert [c.args[0] for c in commands.call_args_list] == [Command.GET_MANY]
+
+    commands.reset_mock()
+    await cache.delete_tags("tag1")
+    assert Command.SET_POP_DELETE in [c.args[0] for c in commands.call_args_list]
+    assert await cache.get("key1") is None
+
+
+async def test_versions_mode_get_nowait():
+    cache = Cache()
+    cache.setup("mem://")
+    cache.set_tags_mode(TagsMode.VERSIONS)
+    await cache.set("key", "value", tags=["tag"])
+
+    with pytest.raises(AwaitRequiredError):
+        cache.get_nowait("key")
+
+
+async def test_versions_mode_not_derived_tag(cache: Cache):
+    cache.set_tags_mode(TagsMode.VERSIONS)
+    cache.register_tag("tag", "key")
+    cache.register_tag("other", "other")
+
+    await cache.set("key", "value", tags=["tag", "other"])
+    assert await cache.get("key") == "value"
+    await cache.delete_tags("other")
+    assert await cache.get("key") is None
+
+
+async def test_versions_mode_get_match_get_raw():
+    cache = Cache()
+    cache.setup("mem://")
+    cache.set_tags_mode(TagsMode.VERSIONS)
+    cache.register_tag("tag{i}", "key{i}")
+    await cache.set("key1", "value1", tags=["tag1"])
+    await cache.set("key2", "value2", tags=["tag2"])
+
+    assert await cache.get_raw("key1") == "value1"
+    assert sorted([item async for item in cache.get_match("key*")]) == [("key1", "value1"), ("key2", "value2")]
+
+    await cache.delete_tags("tag1")
+    assert await cache.get_raw("key1") is None
+    assert [item async for item in cache.get_match("key*")] == [("key2", "value2")]
+
+
+async def test_versions_mode_incr_no_sets(cache: Cache):
+    cache.set_tags_mode(TagsMode.VERSIONS)
+    cache.register_tag("tag", "counter")
+
+    assert await cache.incr("counter", tags=["tag"]) == 1
+    assert not await cache.exists("_tag:tag")
@@ -1,10 +1,13 @@
 import asyncio
+import gc
 import random
+import weakref
 
 import pytest
 
 from cashews import LockedError
 from cashews.backends.interface import NOT_EXIST, UNLIMITED
+from cashews.backends.transaction import TransactionBackend
 from cashews.wrapper import Cache
 from cashews.wrapper.transaction import TransactionMode
 
@@ -38,6 +41,27 @@ async def test_transaction_set(cache: Cache, tx_mode):
     assert await cache.get("key2") == "value2"
 
 
+async def test_transaction_backends_not_kept(tx_mode):
+    cache = Cache()
+    await cache.init("mem://")  # background tasks of the backend are not started within a transaction context
+    tx_backends = weakref.WeakSet()
+
+    async def run(key):
+        async with cache.transaction(tx_mode):
+            await cache.set(key, "value")
+            assert await cache.get(key) == "value"
+            tx_backends.add(cache._get_backend(key))
+
+    for i in range(10):
+        # a context of a finished task with its transaction is dropped
+        await asyncio.create_task(run(f"key{i}"))
+
+    gc.collect()
+    assert not tx_backends
+    assert not any(isinstance(backend, TransactionBackend) for backend, _ in cache._chains.values())
+    assert await cache.get("key0") == "value"
+
+
 async def test_transaction_set_rollback(cache: Cache, tx_mode):
     await cache.set("key1", "value1", expire=1)
     await cache.set("key2", "value2", expire=2)
@@ -1,4 +1,5 @@
 from cashews.utils import Bitarray, get_indexes
+from cashews.utils.radix_tree import RadixTree
 
 
 def test_bitarray_get_size_1():
@@ -84,3 +85,27 @@ def test_get_hashes():
 
     assert get_indexes("test", 3, 3) == get_indexes("a", 3, 3)  # it is ok to have collisions in this case
     assert len(get_indexes("test", 20, 100)) == len(set(get_indexes("test", 20, 100)))
+
+
+def test_radix_tree_longest_prefix():
+    tree = RadixTree()
+    for prefix in ("", "user", "users:", "us", "item:"):
+        tree.insert(prefix, prefix)
+
+    assert tree.longest_prefix("users:1") == "users:"
+    assert tree.longest_prefix("user:1") == "user"
+    assert tree.longest_prefix("usa") == "us"
+    assert tree.longest_prefix("item") == ""
+    assert tree.longest_prefix("") == ""
+    assert list(tree.iter_prefixes("users:1")) == ["", "us", "user", "users:"]
+
+
+def test_radix_tree_no_match():
+    tree = RadixTree()
+    tree.insert("abc", 1)
+    tree.insert("abd", 2)
+
+    assert tree.longest_prefix("ab") is None
+    assert tree.longest_prefix("abx", default=0) == 0
+    assert tree.longest_prefix("abdc") == 2
+    assert list(tree.iter_prefixes("zzz")) == []
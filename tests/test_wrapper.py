@@ -23,6 +23,28 @@ async def test_prefix_many(cache):
     assert await cache.get_many("key", "-:key") == ("value", "-value")
 
 
+async def test_prefix_longest_match():
+    cache = Cache()
+    cache.setup("mem://")
+    cache.setup("mem://", prefix="user")
+    cache.setup("mem://", prefix="user:admin")
+
+    assert cache._get_backend("item:1") is cache._backends[""]
+    assert cache._get_backend("user:1") is cache._backends["user"]
+    assert cache._get_backend("user:admin:1") is cache._backends["user:admin"]
+
+    cache.setup("mem://", prefix="user:")
+    assert cache._get_backend("user:1") is cache._backends["user:"]
+
+
+async def test_prefix_not_configured():
+    cache = Cache()
+    cache.setup("mem://", prefix="user")
+
+    with pytest.raises(NotConfiguredError):
+        await cache.get("item:1")
+
+
 async def test_init():
     cache = Cache()
     assert cache.is_init